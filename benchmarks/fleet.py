@@ -0,0 +1,245 @@
+"""Load a Home Assistant instance with a fleet of simulated Meteobridges.
+
+Usage: python -m benchmarks.fleet [--loggers N [N ...]] [--duration SECONDS]
+                                  [--scan-interval SECONDS]
+                                  [--extra-sensors N [N ...]]
+                                  [--latency SECONDS] [--jitter SECONDS]
+                                  [--error-rate RATE] [--noise VALUE]
+                                  [--output FILE]
+
+For each fleet size, N stub loggers are started in a separate process, so
+they do not load the event loop that is measured, and one config entry is
+added for each of them. The entries then poll for the given duration while
+the event loop lag, the state writes, the CPU time and the resident memory
+of Home Assistant are recorded. Each fleet size runs in a fresh process, so
+the memory of one size does not carry over to the next.
+
+With several --extra-sensors values, they are given to the loggers in turn,
+to mix small and large responses.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Any
+
+from homeassistant.const import CONF_SCAN_INTERVAL, EVENT_STATE_CHANGED
+
+from custom_components.meteobridge.const import DOMAIN
+
+from .harness import async_test_home_assistant, mock_config_entry
+from .run import summarize
+from .stub_server import MeteobridgeStubServer, logger_mac
+
+# Seconds between the event loop lag samples.
+LAG_INTERVAL = 0.1
+
+
+def _serve_loggers(connection, count: int, options: dict[str, Any]) -> None:
+    """Run count stub loggers until the parent asks them to stop."""
+    asyncio.run(_async_serve_loggers(connection, count, options))
+
+
+async def _async_serve_loggers(connection, count: int, options: dict[str, Any]) -> None:
+    extra_sensors = options.pop("extra_sensors")
+    servers = [
+        MeteobridgeStubServer(
+            mac=logger_mac(index),
+            extra_sensors=extra_sensors[index % len(extra_sensors)],
+            seed=index,
+            **options,
+        )
+        for index in range(count)
+    ]
+    for server in servers:
+        await server.start()
+    connection.send([(server.host, server.extra_sensors) for server in servers])
+
+    await asyncio.get_running_loop().run_in_executor(None, connection.recv)
+    connection.send(
+        {
+            "requests": sum(server.requests for server in servers),
+            "errors": sum(server.errors for server in servers),
+            "bytes_sent": sum(server.bytes_sent for server in servers),
+        }
+    )
+    for server in servers:
+        await server.stop()
+
+
+def rss_bytes() -> int:
+    """Return the resident memory of this process."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Only the peak is available, in kilobytes on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _polls(hass) -> int:
+    """Return the observation requests made by all loaded entries."""
+    return sum(
+        entry_data.meteobridgeapi.observation_requests
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+    )
+
+
+async def _async_sample_lag(samples: list[float]) -> None:
+    """Record how late the event loop wakes up from a sleep, in seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - start - LAG_INTERVAL))
+
+
+async def bench_fleet(
+    loggers: int, duration: float, scan_interval: int, logger_options: dict[str, Any]
+) -> dict[str, Any]:
+    """Poll a fleet of stub loggers, and measure the load on Home Assistant."""
+    connection, child_connection = multiprocessing.Pipe()
+    process = multiprocessing.get_context("spawn").Process(
+        target=_serve_loggers, args=(child_connection, loggers, logger_options)
+    )
+    process.start()
+    loop = asyncio.get_running_loop()
+    try:
+        hosts = await loop.run_in_executor(None, connection.recv)
+        async with async_test_home_assistant() as hass:
+            rss_before = rss_bytes()
+            start = time.perf_counter()
+            for index, (host, extra_sensors) in enumerate(hosts):
+                entry = mock_config_entry(
+                    host=host,
+                    unique_id=logger_mac(index),
+                    extra_sensors=extra_sensors,
+                    **{CONF_SCAN_INTERVAL: scan_interval},
+                )
+                await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            setup_time = time.perf_counter() - start
+            # Entries whose first poll failed are retried by Home Assistant.
+            loaded = len(hass.data.get(DOMAIN, {}))
+
+            writes = 0
+
+            def _count_write(event) -> None:
+                nonlocal writes
+                writes += 1
+
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+            polls_before = _polls(hass)
+            lag: list[float] = []
+            sampler = asyncio.create_task(_async_sample_lag(lag))
+            cpu_before = time.process_time()
+            start = time.perf_counter()
+            await asyncio.sleep(duration)
+            elapsed = time.perf_counter() - start
+            cpu = time.process_time() - cpu_before
+            sampler.cancel()
+            polls = _polls(hass) - polls_before
+            entities = len(hass.states.async_all())
+            rss = rss_bytes()
+        connection.send("stop")
+        served = await loop.run_in_executor(None, connection.recv)
+    finally:
+        process.join(timeout=10)
+        if process.is_alive():
+            process.kill()
+
+    return {
+        "loggers": loggers,
+        "entries_loaded": loaded,
+        "entities": entities,
+        "setup_s": round(setup_time, 3),
+        "polls": polls,
+        "polls_per_s": round(polls / elapsed, 2),
+        "state_writes_per_s": round(writes / elapsed, 2),
+        "loop_lag": summarize(lag) if lag else None,
+        "cpu_percent": round(cpu / elapsed * 100, 1),
+        "cpu_ms_per_poll": round(cpu / polls * 1000, 3) if polls else None,
+        "rss_mb": round(rss / 2**20, 1),
+        "rss_kb_per_logger": round((rss - rss_before) / loggers / 1024, 1),
+        "logger_requests": served["requests"],
+        "logger_errors": served["errors"],
+    }
+
+
+def _logger_options(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "extra_sensors": args.extra_sensors,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "noise": args.noise,
+    }
+
+
+def _run_size(args: argparse.Namespace, loggers: int) -> dict[str, Any]:
+    """Run one fleet size in a fresh interpreter."""
+    command = [sys.executable, "-m", "benchmarks.fleet", "--loggers", str(loggers)]
+    for name in ("duration", "scan_interval", "latency", "jitter", "error_rate"):
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    command += ["--noise", str(args.noise), "--extra-sensors"]
+    command += [str(extra_sensors) for extra_sensors in args.extra_sensors]
+    result = subprocess.run(command, capture_output=True, check=True, text=True)
+    return json.loads(result.stdout)["sizes"][0]
+
+
+def main() -> None:
+    """Parse arguments, run each fleet size and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loggers", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--scan-interval", type=int, default=10)
+    parser.add_argument("--extra-sensors", type=int, nargs="+", default=[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--noise", type=float, default=0.5)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    if len(args.loggers) == 1:
+        sizes = [
+            asyncio.run(
+                bench_fleet(
+                    args.loggers[0],
+                    args.duration,
+                    args.scan_interval,
+                    _logger_options(args),
+                )
+            )
+        ]
+    else:
+        sizes = [_run_size(args, loggers) for loggers in args.loggers]
+    results = {
+        "meta": {
+            "duration": args.duration,
+            "scan_interval": args.scan_interval,
+            "logger_options": _logger_options(args),
+            "timestamp": time.time(),
+        },
+        "sizes": sizes,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
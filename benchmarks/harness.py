@@ -0,0 +1,93 @@
+"""A minimal Home Assistant instance, shared by the tests and benchmarks."""
+from __future__ import annotations
+
+import os
+import tempfile
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from homeassistant import auth, config_entries, loader
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    issue_registry as ir,
+    restore_state,
+)
+from homeassistant.util.unit_system import METRIC_SYSTEM
+
+from custom_components.meteobridge.const import (
+    CONF_CACHE_TTL,
+    CONF_EXTRA_SENSORS,
+    DOMAIN,
+)
+
+from .payloads import STATION_VALUES
+
+CUSTOM_COMPONENTS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "custom_components"
+)
+
+
+@asynccontextmanager
+async def async_test_home_assistant() -> AsyncGenerator[HomeAssistant, None]:
+    """Run a minimal, running Home Assistant instance that can load the integration.
+
+    http can be set up, but its web server is never started. Tests reach it
+    through an aiohttp test server instead.
+    """
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(CUSTOM_COMPONENTS, os.path.join(config_dir, "custom_components"))
+        hass = HomeAssistant(config_dir)
+        hass.config.units = METRIC_SYSTEM
+        hass.config.skip_pip = True
+        loader.async_setup(hass)
+        entity.async_setup(hass)
+        await ar.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        await ir.async_load(hass)
+        await restore_state.async_load(hass)
+        hass.auth = await auth.auth_manager_from_config(hass, [], [])
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        hass.state = CoreState.running
+        try:
+            yield hass
+        finally:
+            await hass.async_stop(force=True)
+
+
+def mock_config_entry(
+    host: str = STATION_VALUES["ip"],
+    unique_id: str = STATION_VALUES["mac"],
+    **options: Any,
+) -> config_entries.ConfigEntry:
+    """Return a Meteobridge config entry."""
+    return config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title=f"Meteobridge Pro ({host})",
+        data={CONF_HOST: host},
+        source=config_entries.SOURCE_USER,
+        options={
+            CONF_USERNAME: "meteobridge",
+            CONF_PASSWORD: "secret",
+            CONF_SCAN_INTERVAL: 60,
+            CONF_EXTRA_SENSORS: 0,
+            # Tests refresh right after setup and expect a new request.
+            CONF_CACHE_TTL: 0,
+            **options,
+        },
+        unique_id=unique_id,
+    )
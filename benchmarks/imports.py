@@ -0,0 +1,87 @@
+"""Measure the import time of the integration with python -X importtime.
+
+Each case is imported in a fresh interpreter, after the Home Assistant
+modules that are already loaded when Home Assistant imports an integration.
+Only the modules imported by the case itself are counted.
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded by Home Assistant before it imports a custom integration.
+PRELOAD = (
+    "homeassistant.config_entries",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+    "homeassistant.components.binary_sensor",
+)
+
+PACKAGE = "custom_components.meteobridge"
+
+# What Home Assistant imports to show the config flow, and to set up a
+# polled entry with the default options.
+CASES = {
+    "package": (PACKAGE,),
+    "config_flow": (f"{PACKAGE}.config_flow",),
+    "setup": (
+        f"{PACKAGE}.entry_setup",
+        f"{PACKAGE}.sensor",
+        f"{PACKAGE}.binary_sensor",
+    ),
+}
+
+MARKER = "-- meteobridge imports --"
+
+
+def imported_modules(
+    modules: tuple[str, ...], preload: tuple[str, ...] = PRELOAD
+) -> dict[str, int]:
+    """Import modules in a fresh interpreter, return the microseconds per module.
+
+    The times are the self times reported by -X importtime, of every module
+    loaded by the import of modules, but not by the preload.
+    """
+    code = "\n".join(
+        [
+            *(f"import {name}" for name in preload),
+            f"import sys; sys.stderr.write({MARKER!r} + '\\n'); sys.stderr.flush()",
+            *(f"import {name}" for name in modules),
+        ]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        text=True,
+    )
+    times = {}
+    for line in result.stderr.split(MARKER, 1)[1].splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def bench_imports(repeats: int) -> dict[str, Any]:
+    """Measure the import time of each case, median of repeats."""
+    results = {}
+    for case, modules in CASES.items():
+        samples = [imported_modules(modules) for _ in range(repeats)]
+        results[case] = {
+            "median_ms": statistics.median(sum(s.values()) for s in samples) / 1000,
+            "modules": len(samples[0]),
+            "integration_modules": sorted(
+                name for name in samples[0] if name.startswith(PACKAGE)
+            ),
+        }
+    return results
@@ -0,0 +1,118 @@
+"""Raw template responses of a Meteobridge, shared by the tests and benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import re
+
+from pymeteobridgedata.const import FIELDS_OBSERVATION, FIELDS_STATION
+
+from custom_components.meteobridge.codec import extra_sensor_fields
+
+TEMPLATE_TAG = re.compile(r"\[([^\]]+)\]")
+
+STATION_VALUES = {
+    "mac": "00:11:22:33:44:55",
+    "swversion": "5.7",
+    "platform": "CARAMBOLA2",
+    "station": "Vantage Pro2",
+    "timezone": "Europe/Copenhagen",
+    "uptime": "86400",
+    "ip": "192.168.1.10",
+    "elevation": "40",
+}
+
+OBSERVATION_VALUES = {
+    "utc_time": "1700000000",
+    "air_temperature": "12.3",
+    "sea_level_pressure": "1013.2",
+    "station_pressure": "1008.4",
+    "relative_humidity": "81",
+    "precip_rate": "0.0",
+    "precip_accum_local_day": "1.2",
+    "precip_accum_last24h": "3.4",
+    "precip_accum_month": "45.6",
+    "precip_accum_year": "678.9",
+    "wind_avg": "3.2",
+    "wind_gust": "5.8",
+    "wind_direction": "225",
+    "uv": "1.0",
+    "solar_radiation": "120.0",
+    "lightning_strike_last_epoch": "None",
+    "lightning_strike_count": "0",
+    "lightning_strike_last_distance": "None",
+    "heat_index": "12.3",
+    "dew_point": "9.1",
+    "wind_chill": "11.0",
+    "trend_temperature": "0.2",
+    "trend_pressure": "-0.4",
+    "air_pm_10": "None",
+    "air_pm_25": "None",
+    "air_pm_25_havg": "None",
+    "air_pm_1": "None",
+    "forecast": "Mostly cloudy",
+    "indoor_temperature": "21.5",
+    "indoor_humidity": "45",
+    "air_temperature_dmin": "8.1",
+    "air_temperature_dmintime": "20231114053000",
+    "air_temperature_dmax": "13.0",
+    "air_temperature_dmaxtime": "20231114123000",
+    "air_temperature_mmin": "2.0",
+    "air_temperature_mmintime": "20231102061500",
+    "air_temperature_mmax": "16.4",
+    "air_temperature_mmaxtime": "20231101141500",
+    "air_temperature_ymin": "-8.3",
+    "air_temperature_ymintime": "20230118070000",
+    "air_temperature_ymax": "31.2",
+    "air_temperature_ymaxtime": "20230720150000",
+    "rain_sensor_lowbat": "0",
+    "th_sensor_lowbat": "0",
+    "wind_sensor_lowbat": "0",
+}
+
+
+def station_payload(**overrides: str) -> str:
+    """Return a raw station template response."""
+    values = {**STATION_VALUES, **overrides}
+    return ";".join(values[field[0]] for field in FIELDS_STATION)
+
+
+def observation_payload(extra_sensors: int = 0, **overrides: str) -> str:
+    """Return a raw observation template response."""
+    values = {**OBSERVATION_VALUES, **overrides}
+    items = [values.get(field[0], "None") for field in FIELDS_OBSERVATION]
+    for channel in range(1, extra_sensors + 1):
+        items.extend(
+            [
+                values.get(f"temperature_extra_{channel}", f"1{channel}.5"),
+                values.get(f"relative_humidity_extra_{channel}", f"5{channel}"),
+                values.get(f"heat_index_extra_{channel}", f"1{channel}.5"),
+            ]
+        )
+    return ";".join(items)
+
+
+class MockMeteobridge:
+    """Stand-in for the logger, answering template requests by content."""
+
+    def __init__(self, extra_sensors: int = 0) -> None:
+        """Initialize the mock logger."""
+        self.extra_sensors = extra_sensors
+        self.station: dict[str, str] = {}
+        self.observation: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.error: Exception | None = None
+        self.delay = 0.0
+
+    async def async_request(self, method: str, endpoint: str) -> str:
+        """Answer a template request."""
+        self.requests.append(endpoint)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if "mbsystem-mac" in endpoint:
+            return station_payload(**self.station)
+        fields = FIELDS_OBSERVATION + extra_sensor_fields(self.extra_sensors)
+        items = observation_payload(self.extra_sensors, **self.observation).split(";")
+        values = {field[1]: item for field, item in zip(fields, items)}
+        return ";".join(values.get(tag, "None") for tag in TEMPLATE_TAG.findall(endpoint))
@@ -0,0 +1,392 @@
+"""Benchmark the Meteobridge integration against local stub loggers.
+
+Usage: python -m benchmarks.run [--entries N] [--ticks N] [--polls N]
+                                [--decodes N] [--import-repeats N]
+                                [--output FILE]
+                                [--replay RECORDING [--speed N]]
+
+Results are written as JSON, so they can be compared between releases.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import ExitStack
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from pymeteobridgedata import MeteobridgeApiClient
+from pymeteobridgedata.const import FIELDS_OBSERVATION
+
+from custom_components.meteobridge import entry_setup
+from custom_components.meteobridge.codec import ObservationCodec
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.replay import (
+    MeteobridgeReplayClient,
+    async_replay,
+    load_recording,
+)
+
+from .harness import async_test_home_assistant, mock_config_entry
+from .imports import bench_imports
+from .payloads import MockMeteobridge, observation_payload
+from .stub_server import MeteobridgeStubServer, logger_mac
+
+MANIFEST = "custom_components/meteobridge/manifest.json"
+
+# Phases of async_setup_entry that are timed separately.
+SETUP_PHASES = (
+    (MeteobridgeApiClient, "initialize"),
+    (MeteobridgeApiClient, "load_unit_system"),
+    (DataUpdateCoordinator, "async_config_entry_first_refresh"),
+    (ConfigEntries, "async_forward_entry_setups"),
+)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return summary statistics in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _timed(owner: type, name: str, samples: dict[str, list[float]]):
+    """Patch an async method so each call is timed."""
+    original = getattr(owner, name)
+
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            samples[name].append(time.perf_counter() - start)
+
+    return patch.object(owner, name, wrapper)
+
+
+async def _start_loggers(count: int, extra_sensors: int) -> list[MeteobridgeStubServer]:
+    servers = []
+    for index in range(count):
+        server = MeteobridgeStubServer(
+            mac=logger_mac(index), extra_sensors=extra_sensors
+        )
+        await server.start()
+        servers.append(server)
+    return servers
+
+
+async def _add_entries(hass, servers, extra_sensors: int) -> list:
+    entries = []
+    for server in servers:
+        entry = mock_config_entry(
+            host=server.host,
+            unique_id=server.values["mbsystem-mac:None"],
+            extra_sensors=extra_sensors,
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        entries.append(entry)
+    return entries
+
+
+async def bench_setup(entries: int, extra_sensors: int) -> dict[str, Any]:
+    """Time async_setup_entry and its phases."""
+    samples: dict[str, list[float]] = defaultdict(list)
+    servers = await _start_loggers(entries, extra_sensors)
+    try:
+        async with async_test_home_assistant() as hass:
+            with ExitStack() as stack:
+                for owner, name in SETUP_PHASES:
+                    stack.enter_context(_timed(owner, name, samples))
+                for server in servers:
+                    start = time.perf_counter()
+                    await _add_entries(hass, [server], extra_sensors)
+                    samples["total"].append(time.perf_counter() - start)
+            states = len(hass.states.async_all())
+    finally:
+        for server in servers:
+            await server.stop()
+
+    result = {name: summarize(values) for name, values in samples.items()}
+    result["entities_per_entry"] = states / entries
+    return result
+
+
+def _variant(data, delta: float):
+    """Return a copy of the observation with all numeric values shifted."""
+    changes = {
+        field.name: getattr(data, field.name) + delta
+        for field in dataclasses.fields(data)
+        if isinstance(getattr(data, field.name), float)
+    }
+    return dataclasses.replace(data, **changes)
+
+
+async def bench_tick(ticks: int, extra_sensors: int) -> dict[str, Any]:
+    """Time fanning one coordinator update out to all entities of an entry."""
+    servers = await _start_loggers(1, extra_sensors)
+    try:
+        async with async_test_home_assistant() as hass:
+            (entry,) = await _add_entries(hass, servers, extra_sensors)
+            coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+            variants = [_variant(coordinator.data, 0.1), _variant(coordinator.data, 0.2)]
+            listeners = len(coordinator._listeners)
+
+            changed: list[float] = []
+            unchanged: list[float] = []
+            for tick in range(ticks):
+                for data, samples in (
+                    (variants[tick % 2], changed),
+                    (variants[tick % 2], unchanged),
+                ):
+                    start = time.perf_counter()
+                    coordinator.async_set_updated_data(data)
+                    await hass.async_block_till_done()
+                    samples.append(time.perf_counter() - start)
+    finally:
+        await servers[0].stop()
+
+    return {
+        "listeners": listeners,
+        "changed": summarize(changed),
+        "unchanged": summarize(unchanged),
+        "changed_per_listener_us": statistics.fmean(changed) / listeners * 1e6,
+    }
+
+
+async def bench_poll(polls: int, extra_sensors: int) -> dict[str, Any]:
+    """Time polls over HTTP and count the connections they used."""
+    servers = await _start_loggers(1, extra_sensors)
+    try:
+        async with async_test_home_assistant() as hass:
+            (entry,) = await _add_entries(hass, servers, extra_sensors)
+            coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+            requests_before = servers[0].requests
+            bytes_before = servers[0].bytes_sent
+            samples: list[float] = []
+            for _ in range(polls):
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                samples.append(time.perf_counter() - start)
+            bytes_per_poll = (servers[0].bytes_sent - bytes_before) / polls
+            await hass.config_entries.async_reload(entry.entry_id)
+            await coordinator.async_refresh()
+    finally:
+        await servers[0].stop()
+
+    return {
+        **summarize(samples),
+        "requests": servers[0].requests - requests_before,
+        "connections": servers[0].connections,
+        "bytes_per_poll": bytes_per_poll,
+    }
+
+
+async def bench_memory(entries: int, extra_sensors: int) -> dict[str, Any]:
+    """Measure the memory allocated per config entry."""
+    servers = await _start_loggers(entries, extra_sensors)
+    try:
+        async with async_test_home_assistant() as hass:
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            added = await _add_entries(hass, servers, extra_sensors)
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            history = [
+                hass.data[DOMAIN][entry.entry_id].history.nbytes for entry in added
+            ]
+    finally:
+        for server in servers:
+            await server.stop()
+
+    return {
+        "entries": entries,
+        "bytes_total": after - before,
+        "bytes_per_entry": (after - before) / entries,
+        "history_bytes_per_entry": statistics.fmean(history),
+    }
+
+
+# Observations as recorded from a logger: calm, raining and with gaps.
+RECORDED_OBSERVATIONS = (
+    {},
+    {"air_temperature": "-4.2", "precip_rate": "2.4", "wind_gust": "18.1"},
+    {"relative_humidity": "None", "dew_point": "None", "forecast": "None"},
+)
+
+
+async def bench_decode(decodes: int, extra_sensors: int) -> dict[str, Any]:
+    """Time decoding observations with the library parser and with the codec."""
+    split = len(FIELDS_OBSERVATION)
+    recorded = [
+        observation_payload(extra_sensors, **values).split(";")
+        for values in RECORDED_OBSERVATIONS
+    ]
+    response: list[str] = []
+
+    async def _async_replay(method: str, endpoint: str) -> str:
+        """Answer with the recorded observation, without any parsing."""
+        return ";".join(response[:split] if "[epoch]" in endpoint else response[split:])
+
+    client = MeteobridgeApiClient(
+        "meteobridge", "secret", "127.0.0.1", extra_sensors=extra_sensors
+    )
+    with patch.object(
+        MeteobridgeApiClient, "_async_request", MockMeteobridge().async_request
+    ):
+        await client.initialize()
+    codec = ObservationCodec(client.cnv)
+    library: list[float] = []
+    compiled: list[float] = []
+    with patch.object(client, "_async_request", _async_replay):
+        for index in range(decodes):
+            response = recorded[index % len(recorded)]
+            start = time.perf_counter()
+            await client.update_observations()
+            library.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            codec.decode(response[:split], response[split:], client.device_data)
+            compiled.append(time.perf_counter() - start)
+    await client.req.close()
+
+    return {
+        "library": summarize(library),
+        "codec": summarize(compiled),
+        "speedup": statistics.fmean(library) / statistics.fmean(compiled),
+    }
+
+
+async def bench_replay(path: str, speed: float | None) -> dict[str, Any]:
+    """Feed a recording to an entry with derived sensors, without a logger."""
+    recording = load_recording(path)
+    client: MeteobridgeReplayClient | None = None
+
+    def _create_client(entry, push_mode, unit_system, session, device_data=None):
+        nonlocal client
+        client = MeteobridgeReplayClient(recording, speed, units=unit_system)
+        return client
+
+    async with async_test_home_assistant() as hass:
+        entry = mock_config_entry(
+            unique_id=recording.device_data.key,
+            extra_sensors=recording.extra_sensors,
+            derived_sensors=True,
+        )
+        with patch.object(entry_setup, "_create_client", _create_client):
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+        entry_data = hass.data[DOMAIN][entry.entry_id]
+        writes = 0
+
+        def _count_write(event) -> None:
+            nonlocal writes
+            writes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+        start = time.perf_counter()
+        updates = await async_replay(entry_data.coordinator, client)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+        await client.req.close()
+
+    return {
+        "records": len(recording.records),
+        "updates": updates,
+        "seconds": elapsed,
+        "updates_per_second": updates / elapsed,
+        "state_writes": writes,
+        "state_writes_per_update": writes / updates if updates else 0,
+        "dispatch": entry_data.coordinator.dispatch_time.as_dict(),
+        "parse": client.parse_time.as_dict(),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run all benchmarks."""
+    if args.replay:
+        return {
+            "meta": {
+                "homeassistant_version": HA_VERSION,
+                "python_version": platform.python_version(),
+                "timestamp": time.time(),
+                "recording": args.replay,
+                "speed": args.speed,
+            },
+            "replay": await bench_replay(args.replay, args.speed),
+        }
+    with open(MANIFEST, encoding="utf-8") as manifest:
+        version = json.load(manifest)["version"]
+    return {
+        "meta": {
+            "integration_version": version,
+            "homeassistant_version": HA_VERSION,
+            "python_version": platform.python_version(),
+            "timestamp": time.time(),
+            "entries": args.entries,
+            "ticks": args.ticks,
+            "polls": args.polls,
+            "decodes": args.decodes,
+            "extra_sensors": args.extra_sensors,
+            "import_repeats": args.import_repeats,
+        },
+        "imports": bench_imports(args.import_repeats),
+        "setup": await bench_setup(args.entries, args.extra_sensors),
+        "tick": await bench_tick(args.ticks, args.extra_sensors),
+        "poll": await bench_poll(args.polls, args.extra_sensors),
+        "memory": await bench_memory(args.entries, args.extra_sensors),
+        "decode": await bench_decode(args.decodes, args.extra_sensors),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--decodes", type=int, default=2000)
+    parser.add_argument("--extra-sensors", type=int, default=0)
+    parser.add_argument("--import-repeats", type=int, default=7)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument(
+        "--replay", help="Only replay this recording of logger responses"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        help="Replay this many times faster than recorded (default: no pauses)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Local HTTP server standing in for a Meteobridge logger.
+
+A stub can answer after a latency with random jitter, fail a share of the
+requests with an HTTP error, and add random noise to the decimal
+observation values, so the values change from one poll to the next.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+
+from aiohttp import web
+from pymeteobridgedata.const import FIELDS_OBSERVATION, FIELDS_STATION
+
+from .payloads import OBSERVATION_VALUES, STATION_VALUES
+
+TEMPLATE_PATH = "/cgi-bin/template.cgi"
+TAG = re.compile(r"\[([^\]]*)\]")
+EXTRA_SENSOR_TAG = re.compile(r"th(\d)(temp|hum|heatindex)-act")
+
+
+def logger_mac(index: int) -> str:
+    """Return the MAC address of the stub logger with this number."""
+    return f"02:00:00:00:{index // 256:02x}:{index % 256:02x}"
+
+
+class MeteobridgeStubServer:
+    """Answer template requests the way a Meteobridge does."""
+
+    def __init__(
+        self,
+        mac: str = STATION_VALUES["mac"],
+        extra_sensors: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        noise: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the stub server.
+
+        Each request is answered after latency plus up to jitter seconds.
+        error_rate is the share of requests answered with HTTP 500, and noise
+        the largest random change of a decimal observation value.
+        """
+        self.extra_sensors = extra_sensors
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.noise = noise
+        self.random = random.Random(seed)
+        self.values: dict[str, str] = {}
+        for name, tag, _ in FIELDS_STATION:
+            self.values[tag] = STATION_VALUES[name]
+        for name, tag, _ in FIELDS_OBSERVATION:
+            self.values[tag] = OBSERVATION_VALUES.get(name, "None")
+        self.values["mbsystem-mac:None"] = mac
+        self._noisy_tags = frozenset(
+            tag for _, tag, _ in FIELDS_OBSERVATION if "." in self.values[tag]
+        )
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.peers: set[tuple[str, int]] = set()
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    @property
+    def host(self) -> str:
+        """Return the host to configure in the integration."""
+        return f"127.0.0.1:{self.port}"
+
+    @property
+    def connections(self) -> int:
+        """Return the number of TCP connections that made requests."""
+        return len(self.peers)
+
+    def set_observation(self, name: str, value: str) -> None:
+        """Change the raw value returned for an observation field."""
+        for field_name, tag, _ in FIELDS_OBSERVATION:
+            if field_name == name:
+                self.values[tag] = value
+
+    def render(self, template: str) -> str:
+        """Fill in a template."""
+        return TAG.sub(lambda match: self._value(match.group(1)), template)
+
+    def _value(self, tag: str) -> str:
+        if self.noise and tag in self._noisy_tags:
+            value = float(self.values[tag])
+            return f"{value + self.random.uniform(-self.noise, self.noise):.1f}"
+        if tag in self.values:
+            return self.values[tag]
+        extra = EXTRA_SENSOR_TAG.match(tag)
+        if extra is not None and int(extra.group(1)) <= self.extra_sensors:
+            channel = extra.group(1)
+            return {"temp": f"1{channel}.5", "hum": f"5{channel}", "heatindex": "15.0"}[
+                extra.group(2)
+            ]
+        # Meteobridge answers with the default after the colon for missing sensors.
+        return tag.rpartition(":")[2] if ":" in tag else "--"
+
+    async def _handle_template(self, request: web.Request) -> web.Response:
+        if delay := self.latency + self.random.uniform(0, self.jitter):
+            await asyncio.sleep(delay)
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+        body = self.render(request.query.get("template", ""))
+        self.bytes_sent += len(body)
+        return web.Response(text=body)
+
+    async def start(self) -> None:
+        """Start listening on a free local port."""
+        app = web.Application()
+        app.router.add_get(TEMPLATE_PATH, self._handle_template)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -9,41 +10,70 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import DOMAIN
-from .entity import MeteobridgeEntity
+from .const import DOMAIN, POLL_TIER_SLOW, SIGNAL_NEW_CAPABILITIES
+from .entity import (
+    MeteobridgeEntity,
+    MeteobridgePollTierMixin,
+    MeteobridgeWriteThrottleMixin,
+)
 from .models import MeteobridgeEntryData
 
 _LOGGER = logging.getLogger(__name__)
 
-BINARY_SENSOR_TYPES: tuple[BinarySensorEntityDescription, ...] = (
-    BinarySensorEntityDescription(
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class MeteobridgeBinarySensorEntityDescription(
+    BinarySensorEntityDescription,
+    MeteobridgeWriteThrottleMixin,
+    MeteobridgePollTierMixin,
+):
+    """Describes Meteobridge Binary Sensor entity."""
+
+
+# A low battery is reported at once, a flapping battery state settles first.
+_LOW_BATTERY = frozenset({True})
+
+BINARY_SENSOR_TYPES: tuple[MeteobridgeBinarySensorEntityDescription, ...] = (
+    MeteobridgeBinarySensorEntityDescription(
         key="is_freezing",
         name="Is Freezing",
         icon="mdi:snowflake-alert",
         device_class=BinarySensorDeviceClass.COLD,
     ),
-    BinarySensorEntityDescription(
+    MeteobridgeBinarySensorEntityDescription(
         key="is_raining",
         name="Is Raining",
         icon="mdi:water-alert",
     ),
-    BinarySensorEntityDescription(
+    MeteobridgeBinarySensorEntityDescription(
         key="rain_sensor_lowbat",
         name="Rain sensor battery status",
         device_class=BinarySensorDeviceClass.BATTERY,
+        min_write_interval=300,
+        urgent_values=_LOW_BATTERY,
+        poll_tier=POLL_TIER_SLOW,
     ),
-    BinarySensorEntityDescription(
+    MeteobridgeBinarySensorEntityDescription(
         key="th_sensor_lowbat",
         name="TH sensor battery status",
         device_class=BinarySensorDeviceClass.BATTERY,
+        min_write_interval=300,
+        urgent_values=_LOW_BATTERY,
+        poll_tier=POLL_TIER_SLOW,
     ),
-    BinarySensorEntityDescription(
+    MeteobridgeBinarySensorEntityDescription(
         key="wind_sensor_lowbat",
         name="Wind sensor battery status",
         device_class=BinarySensorDeviceClass.BATTERY,
-    ),            
+        min_write_interval=300,
+        urgent_values=_LOW_BATTERY,
+        poll_tier=POLL_TIER_SLOW,
+    ),
 )
 
 
@@ -56,27 +86,40 @@ async def async_setup_entry(
     coordinator = entry_data.coordinator
     device_data = entry_data.device_data
 
-    entities = []
-    for description in BINARY_SENSOR_TYPES:
-        entities.append(
-            MeteobridgeBinarySensor(
-                meteobridgeapi,
-                coordinator,
-                device_data,
-                description,
-                entry,
+    @callback
+    def _async_add_binary_sensors(keys: set[str]) -> None:
+        """Add binary sensors for observation fields the logger reports."""
+        entities = []
+        for description in BINARY_SENSOR_TYPES:
+            if description.key not in keys:
+                continue
+            entities.append(
+                MeteobridgeBinarySensor(
+                    meteobridgeapi,
+                    coordinator,
+                    device_data,
+                    description,
+                    entry,
+                )
             )
-        )
 
-        _LOGGER.debug(
-            "Adding binary sensor entity %s",
-            description.name,
-        )
+            _LOGGER.debug(
+                "Adding binary sensor entity %s",
+                description.name,
+            )
+        async_add_entities(entities)
 
-    async_add_entities(entities)
+    _async_add_binary_sensors(entry_data.capabilities)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_NEW_CAPABILITIES.format(entry.entry_id),
+            _async_add_binary_sensors,
+        )
+    )
 
 
-class MeteobridgeBinarySensor(MeteobridgeEntity, BinarySensorEntity):
+class MeteobridgeBinarySensor(MeteobridgeEntity, BinarySensorEntity, RestoreEntity):
     """Implementation of a Meteobridge Binary Sensor."""
 
     def __init__(
@@ -84,7 +127,7 @@ class MeteobridgeBinarySensor(MeteobridgeEntity, BinarySensorEntity):
         meteobridgeapi,
         coordinator,
         device_data,
-        description: BinarySensorEntityDescription,
+        description: MeteobridgeBinarySensorEntityDescription,
         entries: ConfigEntry,
     ):
         """Initialize an Meteobridge binary sensor."""
@@ -97,11 +140,15 @@ class MeteobridgeBinarySensor(MeteobridgeEntity, BinarySensorEntity):
         )
         self._attr_name = f"{DOMAIN.capitalize()} {self.entity_description.name}"
 
-    @property
-    def is_on(self):
-        """Returns state of the sensor."""
-        return (
-            getattr(self.coordinator.data, self.entity_description.key)
-            if self.coordinator.data
-            else None
-        )
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the cached state from the latest coordinator data."""
+        self._attr_is_on = self._current_value()
+
+    async def _async_restore_state(self) -> bool:
+        """Restore the last state of the previous run."""
+        last_state = await self.async_get_last_state()
+        if last_state is None or last_state.state not in (STATE_ON, STATE_OFF):
+            return False
+        self._attr_is_on = last_state.state == STATE_ON
+        return True
@@ -0,0 +1,136 @@
+"""Circuit breaker for an unreachable Meteobridge.
+
+After a few failed polls in a row the circuit opens, and the logger is left
+alone for a backoff period that doubles with every failed retry, up to a
+maximum, with some jitter so loggers that dropped off together do not come
+back in lockstep. When the backoff has passed, the circuit is half open:
+one cheap request probes the logger, and only if it answers is it polled
+again as usual.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections import Counter
+from typing import Any
+
+from .const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER,
+    BREAKER_MAX_BACKOFF,
+    BREAKER_MIN_DEADLINE,
+    SESSION_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def request_deadline(scan_interval: float) -> float:
+    """Return the time a poll may take, so it ends before the next one."""
+    return max(BREAKER_MIN_DEADLINE, min(SESSION_TIMEOUT, scan_interval / 2))
+
+
+class CircuitBreaker:
+    """Track failed polls of a logger and decide when to try again."""
+
+    def __init__(
+        self,
+        name: str,
+        deadline: float,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = BREAKER_BASE_BACKOFF,
+        max_backoff: float = BREAKER_MAX_BACKOFF,
+        jitter: float = BREAKER_JITTER,
+    ) -> None:
+        """Initialize the breaker, closed."""
+        self.name = name
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self._retry_at = 0.0
+        self.failures = 0
+        self.rejected = 0
+        self.probes = 0
+        self.last_error: str | None = None
+        self.errors: Counter[str] = Counter()
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the logger may be requested again."""
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if the logger may be requested now."""
+        if self.state != STATE_OPEN:
+            return True
+        if time.monotonic() < self._retry_at:
+            self.rejected += 1
+            return False
+        self.state = STATE_HALF_OPEN
+        self.probes += 1
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful poll."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Meteobridge %s is reachable again", self.name)
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+
+    def record_failure(self, err: Exception) -> None:
+        """Count a failed poll, opening the circuit if there were too many."""
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(err).__name__}: {err}"
+        self.errors[type(err).__name__] += 1
+        if (
+            self.state == STATE_HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._trip()
+
+    def _trip(self) -> None:
+        """Open the circuit for the next, longer, backoff period."""
+        self.trips += 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.trips - 1))
+        self.backoff = backoff * random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._retry_at = time.monotonic() + self.backoff
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(
+                "Meteobridge %s failed %s polls in a row, retrying in %.0f seconds: %s",
+                self.name,
+                self.consecutive_failures,
+                self.backoff,
+                self.last_error,
+            )
+        self.state = STATE_OPEN
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state."""
+        return {
+            "state": self.state,
+            "deadline": self.deadline,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips,
+            "backoff": round(self.backoff, 1),
+            "retry_in": round(self.retry_in, 1),
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "probes": self.probes,
+            "last_error": self.last_error,
+            "errors": dict(self.errors),
+        }
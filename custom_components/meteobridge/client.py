@@ -0,0 +1,308 @@
+"""Observation requests for a polled Meteobridge.
+
+Observation fields are split in rate tiers. Fields in the fast tier are
+requested on every poll, fields only slow tier entities read (monthly and
+yearly values, the forecast, battery states) are requested every few
+minutes. In between, their last raw values are reused.
+
+Fields that no enabled entity needs are not requested at all, and decode
+as None.
+
+With hedging, a request that takes longer than most recent requests gets a
+second, identical request, and the first answer is used. The other request
+is cancelled, so a logger never has more than two requests of an entry at
+once.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from pymeteobridgedata import BadRequest, MeteobridgeApiClient
+from pymeteobridgedata.const import FIELDS_OBSERVATION
+from pymeteobridgedata.data import DataLoggerDescription, ObservationDescription
+
+from .codec import ObservationCodec, extra_sensor_fields
+from .const import (
+    HEDGE_MAX_RATE,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    MAX_EXTRA_SENSORS,
+    POLL_TIER_SLOW,
+    SLOW_TIER_INTERVAL,
+)
+from .metrics import LatencyStats
+
+if TYPE_CHECKING:
+    from .replay import ResponseRecorder
+
+_LOGGER = logging.getLogger(__name__)
+
+# Observation fields calculated by the library, and the fields they need.
+SOURCE_FIELDS: dict[str, tuple[str, ...]] = {
+    "air_density": ("air_temperature", "station_pressure"),
+    "aqi": ("air_pm_25_havg",),
+    "aqi_level": ("air_pm_25_havg",),
+    "beaufort": ("wind_avg",),
+    "beaufort_description": ("wind_avg",),
+    "feels_like": ("air_temperature", "relative_humidity", "wind_gust"),
+    "is_freezing": ("air_temperature",),
+    "is_raining": ("precip_rate",),
+    "pressure_trend": ("trend_pressure",),
+    "temperature_trend": ("trend_temperature",),
+    "uv_description": ("uv",),
+    "visibility": ("air_temperature", "relative_humidity", "dew_point"),
+    "wet_bulb": ("air_temperature", "relative_humidity", "station_pressure"),
+    "wind_cardinal": ("wind_direction",),
+}
+
+# The measure time of every observation.
+REQUIRED_FIELDS = ("utc_time",)
+
+# A probe only asks for the logger time.
+PROBE_FIELDS = [FIELDS_OBSERVATION[0]]
+
+OBSERVATION_FIELDS = frozenset(
+    field[0] for field in FIELDS_OBSERVATION + extra_sensor_fields(MAX_EXTRA_SENSORS)
+)
+
+
+def source_fields(description: Any) -> set[str]:
+    """Return the observation fields an entity description reads."""
+    fields = set(SOURCE_FIELDS.get(description.key, (description.key,)))
+    if (attribute_field := getattr(description, "attribute_field", None)) is not None:
+        fields.add(attribute_field)
+    return fields & OBSERVATION_FIELDS
+
+
+def slow_tier_fields(descriptions: Iterable[Any]) -> frozenset[str]:
+    """Return the observation fields only slow tier descriptions read."""
+    fast: set[str] = set()
+    slow: set[str] = set()
+    for description in descriptions:
+        tier = getattr(description, "poll_tier", None)
+        (slow if tier == POLL_TIER_SLOW else fast).update(source_fields(description))
+    return frozenset(slow - fast)
+
+
+def needed_fields(
+    descriptions: Iterable[Any], disabled: Iterable[str], required: Iterable[str] = ()
+) -> frozenset[str]:
+    """Return the observation fields read by descriptions not disabled."""
+    disabled = set(disabled)
+    fields = set(REQUIRED_FIELDS).union(required)
+    for description in descriptions:
+        if description.key not in disabled:
+            fields |= source_fields(description)
+    return frozenset(fields)
+
+
+class MeteobridgePollClient(MeteobridgeApiClient):
+    """API client requesting only the fields in use, slow tier fields less often."""
+
+    def __init__(
+        self,
+        *args,
+        slow_fields: Iterable[str] = (),
+        slow_interval: float = SLOW_TIER_INTERVAL,
+        hedge: bool = False,
+        **kwargs,
+    ) -> None:
+        """Initialize the client."""
+        super().__init__(*args, **kwargs)
+        self.codec = ObservationCodec(self.cnv)
+        self.slow_fields = frozenset(slow_fields)
+        self.slow_interval = slow_interval
+        self.hedge = hedge
+        # None requests every field.
+        self.needed_fields: frozenset[str] | None = None
+        self._raw: list[str] | None = None
+        self._slow_due = 0.0
+        self.observation_requests = 0
+        self.fields_requested = 0
+        self.bytes_received = 0
+        self.last_response_bytes = 0
+        self.request_time = LatencyStats()
+        self.parse_time = LatencyStats()
+        self.hedgeable_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.recorder: ResponseRecorder | None = None
+
+    def set_device_data(self, device_data: DataLoggerDescription | None) -> None:
+        """Set the station description, instead of requesting it.
+
+        The library only sets it from the response to initialize(), and keeps
+        it in a private attribute. A client given a known description decodes
+        observations without requesting the station first. None makes the
+        next update validate the logger again.
+        """
+        self._device_data = device_data
+
+    def set_needed_fields(self, fields: Iterable[str] | None) -> None:
+        """Set the observation fields to request, None for all of them."""
+        old = self.needed_fields
+        self.needed_fields = None if fields is None else frozenset(fields)
+        if old is not None and (self.needed_fields is None or self.needed_fields - old):
+            # Fields needed again have no cached value, request them next poll.
+            self._slow_due = 0.0
+
+    async def _async_request(self, method: str, endpoint: str) -> str:
+        """Make a request, recording the response if recording is enabled."""
+        if self.recorder is None:
+            return await self._async_hedged_request(method, endpoint)
+        template = endpoint.removeprefix(self.base_url)
+        try:
+            result = await self._async_hedged_request(method, endpoint)
+        except BaseException as err:
+            # Also cancellation, which is how a request that took too long ends.
+            self.recorder.record(template, error=f"{type(err).__name__}: {err}")
+            raise
+        self.recorder.record(template, result)
+        return result
+
+    def hedge_delay(self) -> float | None:
+        """Return the seconds before a request is hedged, None to not hedge it."""
+        if not self.hedge or self.request_time.count < HEDGE_MIN_SAMPLES:
+            return None
+        if self.hedged_requests >= self.hedgeable_requests * HEDGE_MAX_RATE:
+            return None
+        threshold_ms = self.request_time.percentile(HEDGE_PERCENTILE) or 0.0
+        return max(HEDGE_MIN_DELAY, threshold_ms / 1000)
+
+    async def _async_hedged_request(self, method: str, endpoint: str) -> str:
+        """Make a request, and a second one if the first does not answer in time."""
+        if self.hedge:
+            self.hedgeable_requests += 1
+        if (delay := self.hedge_delay()) is None:
+            return await super()._async_request(method, endpoint)
+
+        request = super()._async_request
+        attempts = [asyncio.create_task(request(method, endpoint))]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                self.hedged_requests += 1
+                attempts.append(asyncio.create_task(request(method, endpoint)))
+            return await self._async_first_answer(attempts)
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+            # The losing attempt releases its connection before returning.
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def _async_first_answer(self, attempts: list[asyncio.Task[str]]) -> str:
+        """Return the first successful answer, or raise the last error."""
+        pending = set(attempts)
+        while True:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Retrieves every error, also of attempts that lost.
+            answered = [attempt for attempt in done if attempt.exception() is None]
+            if answered:
+                if answered[0] is not attempts[0]:
+                    self.hedge_wins += 1
+                return answered[0].result()
+            if not pending:
+                return done.pop().result()
+
+    async def async_probe(self) -> None:
+        """Check the logger answers, with the smallest possible request."""
+        await self._async_request(
+            "get", f"{self.base_url}{self._build_endpoint(PROBE_FIELDS)}"
+        )
+
+    async def update_observations(self) -> ObservationDescription:
+        """Request the fields in use and decode them."""
+        if self._device_data is None:
+            raise BadRequest("Waiting for valid data from Meteobridge.")
+
+        now = time.monotonic()
+        slow_due = self._raw is None or now >= self._slow_due
+        self._raw = await self._async_request_fields(
+            FIELDS_OBSERVATION, self._raw, slow_due
+        )
+        if slow_due:
+            self._slow_due = now + self.slow_interval
+
+        extra_items: list[str] = []
+        if self.extra_sensors > 0:
+            extra_items = await self._async_request_fields(
+                extra_sensor_fields(self.extra_sensors), None, True
+            )
+        start = time.perf_counter()
+        data = self.codec.decode(self._raw, extra_items, self._device_data)
+        self.parse_time.add(time.perf_counter() - start)
+        return data
+
+    def _is_requested(self, name: str, slow_due: bool) -> bool:
+        if self.needed_fields is not None and name not in self.needed_fields:
+            return False
+        return slow_due or name not in self.slow_fields
+
+    async def _async_request_fields(
+        self, data_fields: list[list[str]], cached: list[str] | None, slow_due: bool
+    ) -> list[str]:
+        """Return the raw values of data_fields, requesting the due ones."""
+        raw = list(cached) if cached is not None else ["None"] * len(data_fields)
+        positions = []
+        for position, field in enumerate(data_fields):
+            if self._is_requested(field[0], slow_due):
+                positions.append(position)
+            elif self.needed_fields is not None and field[0] not in self.needed_fields:
+                raw[position] = "None"
+        if not positions:
+            return raw
+
+        fields = [data_fields[position] for position in positions]
+        start = time.perf_counter()
+        result = await self._async_request(
+            "get", f"{self.base_url}{self._build_endpoint(fields)}"
+        )
+        self.request_time.add(time.perf_counter() - start)
+        if data_fields is FIELDS_OBSERVATION:
+            self.observation_requests += 1
+        self.fields_requested += len(fields)
+        self.last_response_bytes = len(result)
+        self.bytes_received += len(result)
+
+        items = result.strip().split(";")
+        if len(items) != len(fields):
+            raise BadRequest(
+                f"Meteobridge returned {len(items)} fields, expected {len(fields)}."
+            )
+        for position, item in zip(positions, items):
+            raw[position] = item
+        return raw
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the request settings and statistics."""
+        return {
+            "needed_fields": (
+                None if self.needed_fields is None else len(self.needed_fields)
+            ),
+            "slow_fields": len(self.slow_fields),
+            "slow_interval": self.slow_interval,
+            "observation_requests": self.observation_requests,
+            "fields_requested": self.fields_requested,
+            "bytes_received": self.bytes_received,
+            "last_response_bytes": self.last_response_bytes,
+            "request_time": self.request_time.as_dict(),
+            "parse_time": self.parse_time.as_dict(),
+            "hedging": {
+                "enabled": self.hedge,
+                "requests": self.hedgeable_requests,
+                "hedged": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": (
+                    round(self.hedged_requests / self.hedgeable_requests, 3)
+                    if self.hedgeable_requests
+                    else None
+                ),
+            },
+        }
@@ -0,0 +1,215 @@
+"""Decode Meteobridge template responses.
+
+The fields of a template response are in a fixed order, and their types and
+unit conversions only depend on the unit system. They are worked out once,
+when the codec is created, so a response is decoded into an
+ObservationDescription in a single pass over its items. The values are the
+same as those of the library parser, which evaluates each response as a
+Python literal and looks up the conversion of every field by name.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from pymeteobridgedata import BadRequest
+from pymeteobridgedata.const import FIELDS_OBSERVATION, UNIT_TYPE_METRIC
+from pymeteobridgedata.conversion import Conversions
+from pymeteobridgedata.data import DataLoggerDescription, ObservationDescription
+
+from .const import MAX_EXTRA_SENSORS
+
+Decoder = Callable[[str], Any]
+
+TEMPERATURE_FIELDS = frozenset(
+    {
+        "air_temperature",
+        "dew_point",
+        "heat_index",
+        "indoor_temperature",
+        "wind_chill",
+        *(
+            f"air_temperature_{period}{extreme}"
+            for period in "dmy"
+            for extreme in ("min", "max")
+        ),
+        *(
+            f"temperature_{sensor}_{channel}"
+            for sensor in ("leaf", "soil")
+            for channel in range(1, 5)
+        ),
+        *(
+            f"{sensor}_extra_{channel}"
+            for sensor in ("temperature", "heat_index")
+            for channel in range(1, MAX_EXTRA_SENSORS + 1)
+        ),
+    }
+)
+PRESSURE_FIELDS = frozenset({"sea_level_pressure", "station_pressure"})
+RAIN_FIELDS = frozenset(
+    {
+        "precip_rate",
+        "precip_accum_local_day",
+        "precip_accum_last24h",
+        "precip_accum_month",
+        "precip_accum_year",
+    }
+)
+WIND_SPEED_FIELDS = frozenset({"wind_avg", "wind_gust"})
+TIMESTAMP_FIELDS = frozenset({"utc_time", "lightning_strike_last_epoch"})
+MBTIME_FIELDS = frozenset(
+    f"air_temperature_{period}{extreme}time"
+    for period in "dmy"
+    for extreme in ("min", "max")
+)
+
+# Only used to calculate the air quality index.
+SOURCE_ONLY_FIELDS = ("air_pm_25_havg",)
+
+
+def extra_sensor_fields(extra_sensors: int) -> list[list[str]]:
+    """Return the template fields for the extra temperature/humidity sensors."""
+    fields = []
+    for channel in range(1, extra_sensors + 1):
+        fields.append(
+            [f"temperature_extra_{channel}", f"th{channel}temp-act:None", "float"]
+        )
+        fields.append(
+            [f"relative_humidity_extra_{channel}", f"th{channel}hum-act.0:None", "int"]
+        )
+        fields.append(
+            [f"heat_index_extra_{channel}", f"th{channel}heatindex-act.1:None", "float"]
+        )
+    return fields
+
+
+def _parse_number(item: str) -> int | float | None:
+    """Parse a number like the library does, keeping integers as int."""
+    if item == "None":
+        return None
+    try:
+        return int(item)
+    except ValueError:
+        return float(item)
+
+
+def _parse_string(item: str) -> str | None:
+    """Parse a text field."""
+    return None if item == "None" else item
+
+
+def _scale(factor: float, offset: float, digits: int | None) -> Callable[[Any], Any]:
+    """Return a converter multiplying by factor, adding offset, then rounding."""
+    if digits is None:
+        return lambda value: value
+    if factor == 1 and offset == 0:
+        return lambda value: round(value, digits)
+    return lambda value: round(value * factor + offset, digits)
+
+
+class ObservationCodec:
+    """Decoder for observation responses, compiled for a unit system."""
+
+    def __init__(self, cnv: Conversions) -> None:
+        """Compile the decoders of the observation and extra sensor fields."""
+        self._cnv = cnv
+        metric = cnv.units == UNIT_TYPE_METRIC
+        self._converters: dict[frozenset[str], Callable[[Any], Any]] = {
+            TEMPERATURE_FIELDS: (
+                _scale(1, 0, 1) if metric or cnv.homeassistant else _scale(1.8, 32, 1)
+            ),
+            PRESSURE_FIELDS: _scale(1, 0, None) if metric else _scale(0.029530, 0, 1),
+            RAIN_FIELDS: _scale(1, 0, 2) if metric else _scale(0.03937007874, 0, 2),
+            WIND_SPEED_FIELDS: (
+                _scale(1, 0, 1) if metric else _scale(2.236936292, 0, 1)
+            ),
+            TIMESTAMP_FIELDS: cnv.utc_from_timestamp,
+            MBTIME_FIELDS: cnv.utc_from_mbtime,
+        }
+        self._fields = self._compile(FIELDS_OBSERVATION)
+        self._all_fields = self._fields + self._compile(
+            extra_sensor_fields(MAX_EXTRA_SENSORS)
+        )
+
+    def _compile(
+        self, data_fields: list[list[str]]
+    ) -> list[tuple[str, Decoder, Callable[[Any], Any] | None]]:
+        """Return the name, parser and converter of each field, in order."""
+        compiled = []
+        for name, _tag, field_type in data_fields:
+            parse = _parse_string if field_type == "str" else _parse_number
+            convert = next(
+                (
+                    converter
+                    for names, converter in self._converters.items()
+                    if name in names
+                ),
+                None,
+            )
+            compiled.append((name, parse, convert))
+        return compiled
+
+    def decode(
+        self,
+        items: list[str],
+        extra_items: list[str],
+        device_data: DataLoggerDescription,
+    ) -> ObservationDescription:
+        """Decode the items of an observation and extra sensor response."""
+        if len(items) != len(self._fields) or len(items) + len(extra_items) > len(
+            self._all_fields
+        ):
+            raise BadRequest(
+                f"Meteobridge returned {len(items)} observation fields, "
+                f"expected {len(self._fields)}."
+            )
+        raw: dict[str, Any] = {}
+        values: dict[str, Any] = {}
+        try:
+            for (name, parse, convert), item in zip(
+                self._all_fields, items + extra_items
+            ):
+                value = raw[name] = parse(item)
+                if value is not None and convert is not None:
+                    value = convert(value)
+                values[name] = value
+            values.update(self._calculate(raw, device_data))
+        except (TypeError, ValueError) as err:
+            raise BadRequest(f"Error occured processing data: {err}") from None
+
+        for name in SOURCE_ONLY_FIELDS:
+            del values[name]
+        return ObservationDescription(key=device_data.key, **values)
+
+    def _calculate(
+        self, raw: dict[str, Any], device_data: DataLoggerDescription
+    ) -> dict[str, Any]:
+        """Return the fields calculated from the unconverted values."""
+        cnv = self._cnv
+        temperature = raw["air_temperature"]
+        humidity = raw["relative_humidity"]
+        beaufort = cnv.beaufort_value(raw["wind_avg"])
+        return {
+            "visibility": cnv.distance(
+                cnv.visibility(
+                    device_data.elevation, temperature, humidity, raw["dew_point"]
+                )
+            ),
+            "feels_like": cnv.temperature(
+                cnv.feels_like(temperature, humidity, raw["wind_gust"])
+            ),
+            "wet_bulb": cnv.temperature(
+                cnv.wetbulb(temperature, humidity, raw["station_pressure"])
+            ),
+            "air_density": cnv.air_density(temperature, raw["station_pressure"]),
+            "beaufort": beaufort.value,
+            "beaufort_description": beaufort.description,
+            "wind_cardinal": cnv.wind_direction(raw["wind_direction"]),
+            "uv_description": cnv.uv_description(raw["uv"]),
+            "temperature_trend": cnv.trend_description(raw["trend_temperature"]),
+            "pressure_trend": cnv.trend_description(raw["trend_pressure"]),
+            "aqi_level": cnv.aqi_level(raw["air_pm_25_havg"]),
+            "aqi": cnv.aqi_description(raw["air_pm_25_havg"]),
+            "is_freezing": cnv.is_freezing(temperature),
+            "is_raining": cnv.is_raining(raw["precip_rate"]),
+        }
@@ -1,6 +1,7 @@
 """Config flow to configure Meteobridge Integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 
 import voluptuous as vol
@@ -13,16 +14,27 @@ from homeassistant.const import (
     CONF_USERNAME,
 )
 from homeassistant.core import callback
-from homeassistant.helpers import aiohttp_client
-from pymeteobridgedata import BadRequest, MeteobridgeApiClient, NotAuthorized
-from pymeteobridgedata.data import DataLoggerDescription
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_CACHE_TTL,
+    CONF_DERIVED_SENSORS,
     CONF_EXTRA_SENSORS,
+    CONF_HEDGE_REQUESTS,
+    CONF_INGESTION_MODE,
+    CONF_RECORD_RESPONSES,
+    DATA_PROBES,
+    DEFAULT_CACHE_TTL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_USERNAME,
     DOMAIN,
+    FLOW_PROBE_TIMEOUT,
+    INGESTION_MODE_POLL,
+    INGESTION_MODES,
+    MAX_CACHE_TTL,
+    MAX_EXTRA_SENSORS,
 )
+from .session import async_get_session_pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,6 +44,8 @@ class MeteobridgeFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    _reauth_entry: config_entries.ConfigEntry | None = None
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -43,32 +57,17 @@ class MeteobridgeFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return await self._show_setup_form(user_input)
 
-        errors = {}
-
-        session = aiohttp_client.async_get_clientsession(self.hass)
-
-        meteobridge = MeteobridgeApiClient(
-            user_input[CONF_USERNAME],
-            user_input[CONF_PASSWORD],
-            user_input[CONF_HOST],
-            session=session,
-        )
-
-        try:
-            await meteobridge.initialize()
-
-            device_data: DataLoggerDescription = meteobridge.device_data
-
-        except NotAuthorized:
-            errors["base"] = "invalid_credentials"
-            return await self._show_setup_form(errors)
-        except BadRequest:
-            errors["base"] = "host_not_found"
-            return await self._show_setup_form(errors)
+        device_data, error = await self._async_probe(user_input)
+        if error is not None:
+            return await self._show_setup_form({"base": error})
 
         await self.async_set_unique_id(device_data.key)
         self._abort_if_unique_id_configured()
 
+        # Handed to the setup of the new entry, so it does not request the
+        # station description again.
+        self.hass.data.setdefault(DATA_PROBES, {})[device_data.key] = device_data
+
         return self.async_create_entry(
             title=f"{device_data.platform} ({user_input[CONF_HOST]})",
             data={
@@ -80,9 +79,84 @@ class MeteobridgeFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             options={
                 CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
                 CONF_EXTRA_SENSORS: 0,
+                CONF_INGESTION_MODE: INGESTION_MODE_POLL,
             },
         )
 
+    async def async_step_reauth(self, entry_data):
+        """Handle the logger refusing the credentials of an entry."""
+        self._reauth_entry = self.hass.config_entries.async_get_entry(
+            self.context["entry_id"]
+        )
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for new credentials, and apply them to the entry."""
+        entry = self._reauth_entry
+        errors = {}
+        if user_input is not None:
+            device_data, error = await self._async_probe(
+                {CONF_HOST: entry.data[CONF_HOST], **user_input}
+            )
+            if error is None and device_data.key != entry.unique_id:
+                error = "host_not_found"
+            if error is None:
+                # A loaded entry applies new credentials without a reload.
+                self.hass.config_entries.async_update_entry(
+                    entry, options={**entry.options, **user_input}
+                )
+                if entry.state is not config_entries.ConfigEntryState.LOADED:
+                    await self.hass.config_entries.async_reload(entry.entry_id)
+                return self.async_abort(reason="reauth_successful")
+            errors["base"] = error
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_USERNAME,
+                        default=entry.options.get(CONF_USERNAME, DEFAULT_USERNAME),
+                    ): str,
+                    vol.Required(CONF_PASSWORD): str,
+                }
+            ),
+            description_placeholders={"host": entry.data[CONF_HOST]},
+            errors=errors,
+        )
+
+    async def _async_probe(self, user_input):
+        """Request the station description, return it or an error key."""
+        # The API client is only loaded once a form is submitted.
+        from pymeteobridgedata import BadRequest, MeteobridgeApiClient, NotAuthorized
+
+        # Shares the connection the entry will use once it is set up.
+        session_pool = async_get_session_pool(self.hass)
+        session = session_pool.async_acquire(user_input[CONF_HOST], self.flow_id)
+
+        meteobridge = MeteobridgeApiClient(
+            user_input[CONF_USERNAME],
+            user_input[CONF_PASSWORD],
+            user_input[CONF_HOST],
+            session=session,
+        )
+
+        # Only the station description is requested, the smallest request
+        # that identifies the logger.
+        try:
+            async with asyncio.timeout(FLOW_PROBE_TIMEOUT):
+                await meteobridge.initialize()
+        except NotAuthorized:
+            return None, "invalid_credentials"
+        except (BadRequest, TimeoutError):
+            return None, "host_not_found"
+        finally:
+            session_pool.async_release(user_input[CONF_HOST], self.flow_id)
+
+        if meteobridge.device_data is None:
+            return None, "host_not_found"
+        return meteobridge.device_data, None
+
     async def _show_setup_form(self, errors=None):
         """Show the setup form to the user."""
         return self.async_show_form(
@@ -133,7 +207,43 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_EXTRA_SENSORS,
                         default=self.config_entry.options.get(CONF_EXTRA_SENSORS, 0),
-                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=7)),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_EXTRA_SENSORS)),
+                    vol.Optional(
+                        CONF_CACHE_TTL,
+                        default=self.config_entry.options.get(
+                            CONF_CACHE_TTL, DEFAULT_CACHE_TTL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_CACHE_TTL)),
+                    vol.Optional(
+                        CONF_INGESTION_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_INGESTION_MODE, INGESTION_MODE_POLL
+                        ),
+                    ): vol.In(INGESTION_MODES),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.config_entry.options.get(
+                            CONF_ADAPTIVE_POLLING, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DERIVED_SENSORS,
+                        default=self.config_entry.options.get(
+                            CONF_DERIVED_SENSORS, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_HEDGE_REQUESTS,
+                        default=self.config_entry.options.get(
+                            CONF_HEDGE_REQUESTS, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_RECORD_RESPONSES,
+                        default=self.config_entry.options.get(
+                            CONF_RECORD_RESPONSES, False
+                        ),
+                    ): bool,
                 }
             ),
         )
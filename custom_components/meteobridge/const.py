@@ -15,8 +15,16 @@ METEOBRIDGE_PLATFORMS = [
 ]
 
 ATTR_MEASSURE_TIME = "meassure_time"
+# Set on restored states until the first update from the logger.
+ATTR_STALE = "stale"
 
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_DERIVED_SENSORS = "derived_sensors"
 CONF_EXTRA_SENSORS = "extra_sensors"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_INGESTION_MODE = "ingestion_mode"
+CONF_RECORD_RESPONSES = "record_responses"
 CONFIG_OPTIONS = [
     CONF_PASSWORD,
     CONF_USERNAME,
@@ -26,11 +34,84 @@ CONFIG_OPTIONS = [
 CONF_UNIT_SYSTEM_IMPERIAL = "imperial"
 CONF_UNIT_SYSTEM_METRIC = "metric"
 
+DATA_FLEET = f"{DOMAIN}_fleet"
+DATA_PROBES = f"{DOMAIN}_probes"
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+DATA_STORE = f"{DOMAIN}_store"
+
 DEFAULT_ATTRIBUTION = "Powered by Meteobridge"
 DEFAULT_BRAND = "Meteobridge"
+DEFAULT_CACHE_TTL = 5
+DEFAULT_HEARTBEAT_INTERVAL = 900
 DEFAULT_SCAN_INTERVAL = 60
 DEFAULT_USERNAME = "meteobridge"
 
+# Below the shortest poll interval, so scheduled polls always fetch.
+MAX_CACHE_TTL = 9
+MAX_EXTRA_SENSORS = 7
+
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_GUST_RISE = 1.0
+ADAPTIVE_GUST_RISE_RELATIVE = 0.2
+ADAPTIVE_MIN_SCAN_INTERVAL = 10
+
+BREAKER_BASE_BACKOFF = 30
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_JITTER = 0.2
+BREAKER_MAX_BACKOFF = 15 * 60
+BREAKER_MIN_DEADLINE = 3
+
+DERIVED_GUST_WINDOW = 10 * 60
+DERIVED_PRESSURE_WINDOW = 3 * 60 * 60
+DERIVED_RAIN_WINDOW = 60 * 60
+DERIVED_WIND_DIRECTION_WINDOW = 10 * 60
+
+# Fetches running at once across all entries.
+FLEET_MAX_CONCURRENT_FETCHES = 4
+
+# Seconds the config flow waits for the station description.
+FLOW_PROBE_TIMEOUT = 10
+
+# A hedged request gets a second request when it has taken longer than this
+# percentile of the recent request times, and at least the minimum delay.
+# At most a tenth of the requests are hedged.
+HEDGE_MAX_RATE = 0.1
+HEDGE_MIN_DELAY = 0.25
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 95
+
+# One hour of samples at the shortest poll interval, six at the default.
+HISTORY_CAPACITY = 360
+HISTORY_MEMORY_BUDGET = 512 * 1024
+
+# Recent durations kept for percentiles.
+METRICS_WINDOW = 256
+
+INGESTION_MODE_POLL = "poll"
+INGESTION_MODE_PUSH = "push"
+INGESTION_MODES = [INGESTION_MODE_POLL, INGESTION_MODE_PUSH]
+PUSH_QUERY_PARAMETER = "d"
+
+POLL_TIER_FAST = "fast"
+POLL_TIER_SLOW = "slow"
+SLOW_TIER_INTERVAL = 5 * 60
+
+# Recordings are written to <config>/meteobridge_recordings/<entry id>.jsonl.
+RECORDING_DIRECTORY = f"{DOMAIN}_recordings"
+RECORDING_FLUSH_RECORDS = 20
+RECORDING_MAX_BYTES = 50 * 1024 * 1024
+
+SESSION_CLOSE_DELAY = 30
+SESSION_CONNECTIONS_PER_HOST = 2
+SESSION_KEEPALIVE_TIMEOUT = 90
+SESSION_TIMEOUT = 10
+
+SIGNAL_NEW_CAPABILITIES = f"{DOMAIN}_new_capabilities_{{}}"
+
+STORAGE_KEY = DOMAIN
+STORAGE_SAVE_DELAY = 10
+STORAGE_VERSION = 1
+
 TRANSLATION_KEY_AQI_DESCRIPTION = "aqi_description"
 TRANSLATION_KEY_BEAUFORT = "beaufort"
 TRANSLATION_KEY_TREND = "trend"
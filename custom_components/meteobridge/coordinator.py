@@ -0,0 +1,143 @@
+"""Data update coordinator for Meteobridge."""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from operator import attrgetter
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers import event
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from pymeteobridgedata.data import ObservationDescription
+
+from .metrics import LatencyStats
+
+# Listeners by observation field, and listeners without a context.
+ListenerIndex = tuple[dict[str, list[CALLBACK_TYPE]], list[CALLBACK_TYPE]]
+
+
+class MeteobridgeDataUpdateCoordinator(DataUpdateCoordinator[ObservationDescription]):
+    """Coordinator that only notifies entities whose values changed.
+
+    Each observation field used by an entity gets a slot. After every update
+    the data is projected once into a tuple with one value per slot, and
+    compared to the previous tuple. Listeners registered with a context (a
+    set of field names) are only called if one of their fields changed.
+    Listeners without a context are always called.
+
+    A coordinator with a phase schedules its refreshes at that fraction of
+    the update interval, so entries polling at the same interval take turns.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the coordinator."""
+        super().__init__(*args, **kwargs)
+        self.slots: dict[str, int] = {}
+        self.snapshot: tuple[Any, ...] = ()
+        self._getter: attrgetter | None = None
+        self._snapshot_available: bool | None = None
+        self._keys: tuple[str, ...] = ()
+        self._index: ListenerIndex | None = None
+        self.dispatch_time = LatencyStats()
+        self.phase: float | None = None
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh at the phase, if the last one succeeded."""
+        # Failed polls are retried on the circuit breaker backoff, which has
+        # its own jitter.
+        if (
+            self.phase is None
+            or self.update_interval is None
+            or not self.last_update_success
+        ):
+            super()._schedule_refresh()
+            return
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+        interval = self.update_interval.total_seconds()
+        offset = self.phase * interval
+        # The point of the phase nearest to one interval from now.
+        now = self.hass.loop.time()
+        next_refresh = offset + round((now + interval - offset) / interval) * interval
+        self._unsub_refresh = event.async_call_at(self.hass, self._job, next_refresh)
+
+    @callback
+    def slot(self, key: str) -> int:
+        """Return the snapshot slot for an observation field, adding it if new."""
+        if key not in self.slots:
+            self.slots[key] = len(self.slots)
+            self._keys = tuple(self.slots)
+            self._getter = attrgetter(*self.slots)
+            self.snapshot = self._project()
+        return self.slots[key]
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, optionally only for the fields in context."""
+        remove = super().async_add_listener(update_callback, context)
+        self._index = None
+
+        @callback
+        def remove_listener() -> None:
+            remove()
+            self._index = None
+
+        return remove_listener
+
+    def _listener_index(self) -> ListenerIndex:
+        """Return listeners by field, and listeners without a context."""
+        if self._index is None:
+            by_key: dict[str, list[CALLBACK_TYPE]] = {}
+            always: list[CALLBACK_TYPE] = []
+            for update_callback, context in self._listeners.values():
+                if context is None:
+                    always.append(update_callback)
+                    continue
+                for key in context:
+                    by_key.setdefault(key, []).append(update_callback)
+            self._index = (by_key, always)
+        return self._index
+
+    def _project(self) -> tuple[Any, ...]:
+        """Return the current data as a tuple with one value per slot."""
+        if self.data is None or self._getter is None:
+            return (None,) * len(self.slots)
+        try:
+            values = self._getter(self.data)
+        except AttributeError:
+            values = tuple(getattr(self.data, key, None) for key in self._keys)
+        return values if len(self.slots) > 1 else (values,)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners whose fields changed since the last update."""
+        start = time.perf_counter()
+        self._async_notify_changed()
+        self.dispatch_time.add(time.perf_counter() - start)
+
+    @callback
+    def _async_notify_changed(self) -> None:
+        previous = self.snapshot
+        self.snapshot = self._project()
+        if (
+            self.last_update_success != self._snapshot_available
+            or len(previous) != len(self.snapshot)
+        ):
+            self._snapshot_available = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        keys = self._keys
+        by_key, always = self._listener_index()
+        notify = dict.fromkeys(always)
+        for index, (old, new) in enumerate(zip(previous, self.snapshot)):
+            if old is not new and old != new:
+                notify.update(dict.fromkeys(by_key.get(keys[index], ())))
+        for update_callback in notify:
+            update_callback()
@@ -0,0 +1,187 @@
+"""Sliding window values derived from Meteobridge observations.
+
+Each aggregator is updated once per observation, in O(1) amortized time,
+and only holds the samples inside its window. This replaces statistics and
+template helpers that query the recorder on every state change.
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+from pymeteobridgedata.data import ObservationDescription
+
+from .const import (
+    DERIVED_GUST_WINDOW,
+    DERIVED_PRESSURE_WINDOW,
+    DERIVED_RAIN_WINDOW,
+    DERIVED_WIND_DIRECTION_WINDOW,
+)
+
+
+class SlidingWindow:
+    """Base class for aggregators over the last window seconds."""
+
+    def __init__(self, window: float) -> None:
+        """Initialize the aggregator."""
+        self.window = window
+        self._samples: deque[tuple[float, ...]] = deque()
+
+    def _evict(self, now: float) -> None:
+        """Drop samples that are older than the window."""
+        cutoff = now - self.window
+        while self._samples and self._samples[0][0] < cutoff:
+            self._drop(self._samples.popleft())
+
+    def _drop(self, sample: tuple[float, ...]) -> None:
+        """Update running totals for a sample leaving the window."""
+
+
+class SlidingMax(SlidingWindow):
+    """Maximum over the window, using a monotonically decreasing deque."""
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        while self._samples and self._samples[-1][1] <= value:
+            self._samples.pop()
+        self._samples.append((timestamp, value))
+        self._evict(timestamp)
+
+    @property
+    def value(self) -> float | None:
+        """Return the maximum."""
+        return self._samples[0][1] if self._samples else None
+
+
+class SlidingSum(SlidingWindow):
+    """Sum over the window, kept as a running total."""
+
+    def __init__(self, window: float) -> None:
+        """Initialize the aggregator."""
+        super().__init__(window)
+        self._total = 0.0
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        self._samples.append((timestamp, value))
+        self._total += value
+        self._evict(timestamp)
+
+    def _drop(self, sample: tuple[float, ...]) -> None:
+        self._total -= sample[1]
+        if not self._samples:
+            # Do not let rounding errors accumulate.
+            self._total = 0.0
+
+    @property
+    def value(self) -> float | None:
+        """Return the sum."""
+        return self._total if self._samples else None
+
+
+class SlidingChange(SlidingWindow):
+    """Change between the oldest and newest sample in the window."""
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample."""
+        self._samples.append((timestamp, value))
+        self._evict(timestamp)
+
+    @property
+    def value(self) -> float | None:
+        """Return the change."""
+        if not self._samples:
+            return None
+        return self._samples[-1][1] - self._samples[0][1]
+
+
+class SlidingVectorMean(SlidingWindow):
+    """Mean of angles in degrees, averaging unit vectors."""
+
+    def __init__(self, window: float) -> None:
+        """Initialize the aggregator."""
+        super().__init__(window)
+        self._sin = 0.0
+        self._cos = 0.0
+
+    def add(self, timestamp: float, degrees: float) -> None:
+        """Add a sample."""
+        radians = math.radians(degrees)
+        sample = (timestamp, math.sin(radians), math.cos(radians))
+        self._samples.append(sample)
+        self._sin += sample[1]
+        self._cos += sample[2]
+        self._evict(timestamp)
+
+    def _drop(self, sample: tuple[float, ...]) -> None:
+        self._sin -= sample[1]
+        self._cos -= sample[2]
+        if not self._samples:
+            self._sin = self._cos = 0.0
+
+    @property
+    def value(self) -> float | None:
+        """Return the mean direction, or None if the directions cancel out."""
+        if not self._samples or math.hypot(self._sin, self._cos) < 1e-9:
+            return None
+        return math.degrees(math.atan2(self._sin, self._cos)) % 360
+
+
+class MeteobridgeDerivedValues:
+    """Derived values for an entry, updated from each observation."""
+
+    # Observation fields the aggregators read.
+    source_fields = (
+        "wind_gust",
+        "sea_level_pressure",
+        "wind_direction",
+        "wind_avg",
+        "precip_accum_local_day",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the aggregators."""
+        self.wind_gust_max = SlidingMax(DERIVED_GUST_WINDOW)
+        self.rain_last_hour = SlidingSum(DERIVED_RAIN_WINDOW)
+        self.pressure_tendency = SlidingChange(DERIVED_PRESSURE_WINDOW)
+        self.wind_direction_mean = SlidingVectorMean(DERIVED_WIND_DIRECTION_WINDOW)
+        self._last_rain_today: float | None = None
+
+    def update(self, data: ObservationDescription, timestamp: float) -> None:
+        """Add an observation."""
+        if data.wind_gust is not None:
+            self.wind_gust_max.add(timestamp, data.wind_gust)
+        if data.sea_level_pressure is not None:
+            self.pressure_tendency.add(timestamp, data.sea_level_pressure)
+        if data.wind_direction is not None and data.wind_avg:
+            # The direction of calm wind is meaningless.
+            self.wind_direction_mean.add(timestamp, data.wind_direction)
+        self._update_rain(data.precip_accum_local_day, timestamp)
+
+    def _update_rain(self, rain_today: float | None, timestamp: float) -> None:
+        """Add the rain fallen since the last observation."""
+        if rain_today is None:
+            return
+        if self._last_rain_today is not None:
+            fallen = rain_today - self._last_rain_today
+            # The daily total resets at midnight.
+            self.rain_last_hour.add(timestamp, fallen if fallen >= 0 else rain_today)
+        self._last_rain_today = rain_today
+
+    def value(self, key: str) -> float | None:
+        """Return the current value of a derived sensor key."""
+        value = getattr(self, key).value
+        return None if value is None else round(value, 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current values."""
+        return {
+            key: self.value(key)
+            for key in (
+                "wind_gust_max",
+                "rain_last_hour",
+                "pressure_tendency",
+                "wind_direction_mean",
+            )
+        }
@@ -0,0 +1,54 @@
+"""Diagnostics support for Meteobridge."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .fleet import async_get_fleet
+from .metrics import measurement_age
+from .models import MeteobridgeEntryData
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME, CONF_WEBHOOK_ID}
+
+
+def _as_dict(component: Any) -> dict[str, Any] | None:
+    """Return the state of an optional component."""
+    as_dict = getattr(component, "as_dict", None)
+    return as_dict() if as_dict is not None else None
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data: MeteobridgeEntryData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data.coordinator
+    update_interval = coordinator.update_interval
+    fleet = async_get_fleet(hass)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                update_interval.total_seconds() if update_interval else None
+            ),
+            "measurement_age": measurement_age(coordinator.data, dt_util.utcnow()),
+            "dispatch_time": coordinator.dispatch_time.as_dict(),
+            "phase": coordinator.phase,
+            "phase_offset": fleet.offset(entry.entry_id),
+        },
+        "fleet": fleet.as_dict(),
+        "client": _as_dict(entry_data.meteobridgeapi),
+        "breaker": _as_dict(entry_data.breaker),
+        "fetcher": _as_dict(entry_data.fetcher),
+        "scheduler": _as_dict(entry_data.scheduler),
+        "history": _as_dict(entry_data.history),
+        "derived": _as_dict(entry_data.derived),
+        "recorder": _as_dict(entry_data.recorder),
+    }
@@ -1,18 +1,107 @@
 """Common entity class for Meteobridge."""
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
+from typing import Any
+
 import homeassistant.helpers.device_registry as dr
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ATTRIBUTION
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DEFAULT_ATTRIBUTION, DEFAULT_BRAND, DOMAIN
+from .const import (
+    ATTR_STALE,
+    DEFAULT_ATTRIBUTION,
+    DEFAULT_BRAND,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DOMAIN,
+    POLL_TIER_FAST,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeteobridgeWriteThrottleMixin:
+    """Mixin for optional state write throttling."""
+
+    # Changes smaller than these (absolute, or relative to the last written
+    # value) are treated as noise and not written.
+    deadband: float | None = None
+    deadband_relative: float | None = None
+    # Set to 360 for angles, so the deadband wraps around north.
+    deadband_modulus: float | None = None
+    # Seconds. The heartbeat always writes, regardless of the other settings.
+    min_write_interval: int | None = None
+    heartbeat_interval: int | None = None
+    # Changes to these values, such as an alarm turning on, are written at
+    # once, regardless of the minimum write interval.
+    urgent_values: frozenset[Any] = frozenset()
+
+    @property
+    def throttled(self) -> bool:
+        """Return True if any write throttling is configured."""
+        return (
+            self.deadband is not None
+            or self.deadband_relative is not None
+            or self.min_write_interval is not None
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeteobridgePollTierMixin:
+    """Mixin for the rate at which the fields of an entity are requested."""
+
+    # Fields only slow tier entities read are requested every
+    # SLOW_TIER_INTERVAL seconds, instead of on every poll.
+    poll_tier: str = POLL_TIER_FAST
+
+
+def _within_deadband(
+    description: MeteobridgeWriteThrottleMixin, old_value: Any, new_value: Any
+) -> bool:
+    """Return True if the change from old_value to new_value is only noise."""
+    if old_value == new_value:
+        return True
+    if not isinstance(old_value, (int, float)) or not isinstance(
+        new_value, (int, float)
+    ):
+        return False
+    if isinstance(old_value, bool) or isinstance(new_value, bool):
+        return False
+
+    delta = abs(new_value - old_value)
+    if description.deadband_modulus is not None:
+        delta %= description.deadband_modulus
+        delta = min(delta, description.deadband_modulus - delta)
+    if description.deadband is not None and delta <= description.deadband:
+        return True
+    if (
+        description.deadband_relative is not None
+        and delta <= abs(old_value) * description.deadband_relative
+    ):
+        return True
+    return False
+
+
+def device_info(unique_id: str, ip: str) -> DeviceInfo:
+    """Return the device info of a logger."""
+    return DeviceInfo(
+        manufacturer=DEFAULT_BRAND,
+        via_device=(DOMAIN, unique_id),
+        connections={(dr.CONNECTION_NETWORK_MAC, unique_id)},
+        configuration_url=f"http://{ip}",
+    )
 
 
 class MeteobridgeEntity(CoordinatorEntity, Entity):
     """Base class for Meteobridge entities."""
 
+    # Entities not reading observation fields are updated on every refresh,
+    # their descriptions throttle how often that is written.
+    _uses_observation = True
+
     def __init__(
         self,
         meteobridgeapi,
@@ -33,16 +122,115 @@ class MeteobridgeEntity(CoordinatorEntity, Entity):
         self.entry: ConfigEntry = entries
         self._attr_available = self.coordinator.last_update_success
         self._attr_unique_id = f"{description.key}_{self.device_data.key}"
-        self._attr_device_info = DeviceInfo(
-            manufacturer=DEFAULT_BRAND,
-            via_device=(DOMAIN, self.entry.unique_id),
-            connections={(dr.CONNECTION_NETWORK_MAC, self.entry.unique_id)},
-            configuration_url=f"http://{self.device_data.ip}",
-        )
+        self._attr_extra_state_attributes = {ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION}
+        self._last_written_value: Any = None
+        self._last_written_attribute: Any = None
+        self._last_written_available: bool | None = None
+        self._last_write: float | None = None
+        self._stale = False
+
+        self._value_slot: int | None = None
+        self._attribute_slot: int | None = None
+        if self._uses_observation:
+            attribute_field = getattr(description, "attribute_field", None)
+            self._value_slot = coordinator.slot(description.key)
+            fields = {description.key}
+            if attribute_field is not None:
+                self._attribute_slot = coordinator.slot(attribute_field)
+                fields.add(attribute_field)
+            # Throttled entities see every update, so the heartbeat can fire.
+            if not (
+                isinstance(description, MeteobridgeWriteThrottleMixin)
+                and description.throttled
+            ):
+                self.coordinator_context = frozenset(fields)
+        self._async_update_attrs()
 
     @property
-    def extra_state_attributes(self):
-        """Return common attributes"""
-        return {
-            ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION,
-        }
+    def device_info(self) -> DeviceInfo:
+        """Return the device info, shared by all entities of the entry."""
+        return self.hass.data[DOMAIN][self.entry.entry_id].device_info
+
+    def _current_value(self) -> Any:
+        """Return the value of this entity in the latest coordinator data."""
+        if self._value_slot is None:
+            return None
+        return self.coordinator.snapshot[self._value_slot]
+
+    def _current_attribute(self) -> Any:
+        """Return the attribute field value in the latest coordinator data."""
+        if self._attribute_slot is None:
+            return None
+        return self.coordinator.snapshot[self._attribute_slot]
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the cached state from the latest coordinator data."""
+
+    def _record_written_state(self) -> None:
+        """Remember what was last written to the state machine."""
+        self._last_written_value = self._current_value()
+        self._last_written_attribute = self._current_attribute()
+        self._last_written_available = self.coordinator.last_update_success
+        self._last_write = time.monotonic()
+
+    def _should_write_state(self) -> bool:
+        """Decide if a coordinator update should be written to the state machine."""
+        description = self.entity_description
+        if (
+            isinstance(description, MeteobridgeWriteThrottleMixin)
+            and description.throttled
+            and self._last_write is not None
+            and self.coordinator.last_update_success == self._last_written_available
+            and self._current_attribute() == self._last_written_attribute
+        ):
+            since_write = time.monotonic() - self._last_write
+            heartbeat = description.heartbeat_interval or DEFAULT_HEARTBEAT_INTERVAL
+            if since_write < heartbeat:
+                if (
+                    description.min_write_interval is not None
+                    and since_write < description.min_write_interval
+                    and self._current_value() not in description.urgent_values
+                ):
+                    return False
+                if _within_deadband(
+                    description, self._last_written_value, self._current_value()
+                ):
+                    return False
+
+        self._record_written_state()
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        """When entity is added to hass."""
+        await super().async_added_to_hass()
+        # After a cached start there is no data until the logger answers.
+        if (
+            self._uses_observation
+            and self.coordinator.data is None
+            and await self._async_restore_state()
+        ):
+            self._stale = True
+            self._attr_extra_state_attributes = {
+                **self._attr_extra_state_attributes,
+                ATTR_STALE: True,
+            }
+        # Home Assistant writes the initial state right after this.
+        self._record_written_state()
+
+    async def _async_restore_state(self) -> bool:
+        """Restore the state of the previous run, return True if there was one."""
+        return False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._stale:
+            # The restored state is replaced by the first update.
+            self._stale = False
+            self._attr_extra_state_attributes = {ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION}
+            self._record_written_state()
+        elif not self._should_write_state():
+            return
+        self._async_update_attrs()
+        super()._handle_coordinator_update()
@@ -0,0 +1,685 @@
+"""Set up a Meteobridge config entry.
+
+Imported when the first entry is set up. Features that are off by default
+(push ingestion, recording, adaptive polling and derived sensors) are only
+imported by the entries that use them.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.helpers.device_registry as dr
+import homeassistant.helpers.entity_registry as er
+from aiohttp import ClientSession
+from aiohttp.client_exceptions import ServerDisconnectedError
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    CONF_WEBHOOK_ID,
+    EVENT_HOMEASSISTANT_STOP,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.setup import async_setup_component
+from homeassistant.util.unit_system import (
+    METRIC_SYSTEM,
+)
+
+from pymeteobridgedata import BadRequest, Invalid, MeteobridgeApiClient, NotAuthorized
+from pymeteobridgedata.data import DataLoggerDescription, ObservationDescription
+
+from .const import (
+    ADAPTIVE_MIN_SCAN_INTERVAL,
+    CONF_ADAPTIVE_POLLING,
+    CONF_CACHE_TTL,
+    CONF_DERIVED_SENSORS,
+    CONF_EXTRA_SENSORS,
+    CONF_HEDGE_REQUESTS,
+    CONF_RECORD_RESPONSES,
+    CONFIG_OPTIONS,
+    CONF_UNIT_SYSTEM_IMPERIAL,
+    CONF_UNIT_SYSTEM_METRIC,
+    DATA_PROBES,
+    DEFAULT_BRAND,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    HISTORY_CAPACITY,
+    HISTORY_MEMORY_BUDGET,
+    METEOBRIDGE_PLATFORMS,
+    PUSH_QUERY_PARAMETER,
+    RECORDING_DIRECTORY,
+    SIGNAL_NEW_CAPABILITIES,
+)
+from .breaker import (
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    request_deadline,
+)
+from .client import MeteobridgePollClient, needed_fields, slow_tier_fields
+from .coordinator import MeteobridgeDataUpdateCoordinator
+from .entity import device_info
+from .fetcher import SingleFlightFetcher
+from .fleet import MeteobridgeFleet, async_get_fleet
+from .history import MeteobridgeHistory
+from .models import MeteobridgeEntryData
+from .options import async_apply_options, is_push_mode, requires_reload
+from .session import async_get_session_pool
+from .storage import (
+    CachedLogger,
+    MeteobridgeMetadataStore,
+    async_get_metadata_store,
+    available_keys,
+)
+
+if TYPE_CHECKING:
+    from .derived import MeteobridgeDerivedValues
+    from .push import MeteobridgePushClient
+    from .replay import ResponseRecorder
+    from .scheduler import AdaptivePollScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def _async_import_options_from_data_if_missing(hass: HomeAssistant, entry: ConfigEntry):
+    options = dict(entry.options)
+    data = dict(entry.data)
+    modified = False
+    for importable_option in CONFIG_OPTIONS:
+        if importable_option not in entry.options and importable_option in entry.data:
+            options[importable_option] = entry.data[importable_option]
+            del data[importable_option]
+            modified = True
+
+    if modified:
+        hass.config_entries.async_update_entry(entry, data=data, options=options)
+
+
+async def async_setup_meteobridge_entry(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> bool:
+    """Set up a Meteobridge config entry."""
+    _async_import_options_from_data_if_missing(hass, entry)
+
+    push_mode = is_push_mode(entry.options)
+    # The webhook integration is only needed, and set up, in push mode.
+    if push_mode and not await async_setup_component(hass, "webhook", {}):
+        return False
+
+    session_pool = async_get_session_pool(hass)
+    session = session_pool.async_acquire(entry.data[CONF_HOST], entry.entry_id)
+    entry.async_on_unload(
+        lambda: session_pool.async_release(entry.data[CONF_HOST], entry.entry_id)
+    )
+    unit_system = (
+        CONF_UNIT_SYSTEM_METRIC
+        if hass.config.units is METRIC_SYSTEM
+        else CONF_UNIT_SYSTEM_IMPERIAL
+    )
+
+    # The config flow probed the logger of a new entry moments ago.
+    probed = hass.data.get(DATA_PROBES, {}).pop(entry.unique_id, None)
+    meteobridgeapi = _create_client(entry, push_mode, unit_system, session, probed)
+
+    metadata_store = await async_get_metadata_store(hass)
+    cached = metadata_store.async_get(entry.unique_id)
+    device_data = await _async_get_device_data(hass, entry, meteobridgeapi, cached)
+
+    unit_descriptions = await meteobridgeapi.load_unit_system()
+
+    scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    scheduler = None
+    if entry.options.get(CONF_ADAPTIVE_POLLING, False) and not push_mode:
+        from .scheduler import AdaptivePollScheduler
+
+        scheduler = AdaptivePollScheduler(ADAPTIVE_MIN_SCAN_INTERVAL, scan_interval)
+
+    recorder = _async_create_recorder(hass, entry, meteobridgeapi, device_data)
+    breaker = CircuitBreaker(entry.title, request_deadline(scan_interval))
+    fleet = async_get_fleet(hass)
+    fetcher = SingleFlightFetcher(
+        partial(
+            _async_fetch_observations, hass, entry, meteobridgeapi, breaker, fleet
+        ),
+        entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+    )
+    coordinator = _async_create_coordinator(
+        hass, entry, fetcher, push_mode, scheduler, breaker, fleet
+    )
+    if cached is None:
+        await coordinator.async_config_entry_first_refresh()
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady
+
+    entry_data = MeteobridgeEntryData(
+        coordinator=coordinator,
+        meteobridgeapi=meteobridgeapi,
+        device_data=device_data,
+        unit_descriptions=unit_descriptions,
+        scheduler=scheduler,
+        fetcher=fetcher,
+        breaker=breaker,
+        recorder=recorder,
+        history=MeteobridgeHistory(HISTORY_CAPACITY, HISTORY_MEMORY_BUDGET),
+        derived=_create_derived_values(entry),
+        device_info=device_info(entry.unique_id, device_data.ip),
+        capabilities=set(
+            available_keys(coordinator.data)
+            if cached is None
+            else cached.capabilities
+        ),
+        options=dict(entry.options),
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = entry_data
+    if cached is None:
+        _async_remove_unreported_entities(hass, entry, entry_data)
+    _async_track_capabilities(hass, entry, entry_data, metadata_store)
+    _async_track_history(entry, entry_data)
+
+    if push_mode:
+        _async_setup_push(hass, entry, meteobridgeapi, coordinator)
+
+    await _async_get_or_create_nvr_device_in_registry(hass, entry, device_data)
+    await hass.config_entries.async_forward_entry_setups(entry, METEOBRIDGE_PLATFORMS)
+    _async_track_needed_fields(hass, entry, entry_data)
+
+    if cached is not None:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
+    return True
+
+
+def _field_descriptions() -> list[Any]:
+    """Return the descriptions reading more than their own fast tier field.
+
+    The descriptions of the channel sensors are only created for the entries
+    reporting them, their fields are added by key instead. The platforms are
+    loaded by then.
+    """
+    from .binary_sensor import BINARY_SENSOR_TYPES
+    from .sensor import CHANNEL_SENSOR_KEYS, SENSOR_TABLE, sensor_descriptions
+
+    return [
+        *sensor_descriptions(SENSOR_TABLE.keys() - CHANNEL_SENSOR_KEYS),
+        *BINARY_SENSOR_TYPES,
+    ]
+
+
+def _create_client(
+    entry: ConfigEntry,
+    push_mode: bool,
+    unit_system: str,
+    session: ClientSession,
+    device_data: DataLoggerDescription | None = None,
+) -> MeteobridgeApiClient:
+    """Create the API client for the ingestion mode.
+
+    With device_data, the client is ready without requesting the station.
+    """
+    api_class: type[MeteobridgeApiClient] = MeteobridgePollClient
+    if push_mode:
+        from .push import MeteobridgePushClient
+
+        api_class = MeteobridgePushClient
+
+    meteobridgeapi = api_class(
+        entry.options[CONF_USERNAME],
+        entry.options[CONF_PASSWORD],
+        entry.data[CONF_HOST],
+        extra_sensors=entry.options[CONF_EXTRA_SENSORS],
+        units=unit_system,
+        session=session,
+    )
+    if isinstance(meteobridgeapi, MeteobridgePollClient):
+        meteobridgeapi.hedge = entry.options.get(CONF_HEDGE_REQUESTS, False)
+    meteobridgeapi.set_device_data(device_data)
+    return meteobridgeapi
+
+
+async def _async_get_device_data(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meteobridgeapi: MeteobridgeApiClient,
+    cached: CachedLogger | None,
+) -> DataLoggerDescription:
+    """Return the station description of the logger."""
+    if cached is not None:
+        # The logger is validated by the first refresh, in the background.
+        return cached.device_data
+    if meteobridgeapi.device_data is not None:
+        return meteobridgeapi.device_data
+    try:
+        return await _async_validate_device(hass, entry, meteobridgeapi)
+    except NotAuthorized as err:
+        raise ConfigEntryAuthFailed(
+            f"Authorize failure at Meteobridge Server: {err}"
+        ) from err
+    except (BadRequest, ServerDisconnectedError) as notreadyerror:
+        _LOGGER.warning(str(notreadyerror))
+        raise ConfigEntryNotReady from notreadyerror
+
+
+async def _async_validate_device(
+    hass: HomeAssistant, entry: ConfigEntry, meteobridgeapi: MeteobridgeApiClient
+) -> DataLoggerDescription:
+    """Connect to the logger and check it is the one the entry was set up for."""
+    await meteobridgeapi.initialize()
+    device_data: DataLoggerDescription = meteobridgeapi.device_data
+    if device_data is None:
+        raise BadRequest("No station data received from Meteobridge.")
+    _LOGGER.debug("Connected to Meteobridge Platform %s", device_data.station)
+
+    if entry.unique_id is None:
+        hass.config_entries.async_update_entry(entry, unique_id=device_data.key)
+    elif device_data.key != entry.unique_id:
+        raise BadRequest(
+            f"Found Meteobridge {device_data.key} at {entry.data[CONF_HOST]}, "
+            f"expected {entry.unique_id}."
+        )
+    return device_data
+
+
+async def _async_fetch_observations(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meteobridgeapi: MeteobridgeApiClient,
+    breaker: CircuitBreaker,
+    fleet: MeteobridgeFleet,
+) -> ObservationDescription:
+    """Fetch observations, unless the circuit breaker holds off the logger."""
+    if not breaker.allow_request():
+        raise UpdateFailed(
+            f"Meteobridge did not answer, retrying in {breaker.retry_in:.0f} seconds"
+        )
+    try:
+        # The deadline only starts once the fleet lets the fetch run.
+        async with fleet.async_fetch_slot(), asyncio.timeout(breaker.deadline):
+            data = await _async_request_observations(
+                hass, entry, meteobridgeapi, breaker.state == STATE_HALF_OPEN
+            )
+    except NotAuthorized as err:
+        breaker.record_failure(err)
+        # Starts a reauthentication flow, also after a cached start.
+        raise ConfigEntryAuthFailed(
+            f"Authorize failure at Meteobridge Server: {err}"
+        ) from err
+    except TimeoutError as err:
+        breaker.record_failure(err)
+        raise UpdateFailed(
+            f"No answer from Meteobridge within {breaker.deadline:.0f} seconds"
+        ) from err
+    except (BadRequest, Invalid, ServerDisconnectedError) as err:
+        breaker.record_failure(err)
+        raise UpdateFailed(f"Error while retreiving data: {err}") from err
+    breaker.record_success()
+    return data
+
+
+async def _async_request_observations(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meteobridgeapi: MeteobridgeApiClient,
+    probe: bool,
+) -> ObservationDescription:
+    """Request observations, validating the logger first after a cached start."""
+    if probe and isinstance(meteobridgeapi, MeteobridgePollClient):
+        await meteobridgeapi.async_probe()
+    if meteobridgeapi.device_data is None:
+        device_data = await _async_validate_device(hass, entry, meteobridgeapi)
+        await _async_get_or_create_nvr_device_in_registry(hass, entry, device_data)
+    return await meteobridgeapi.update_observations()
+
+
+@callback
+def _async_create_coordinator(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    fetcher: SingleFlightFetcher[ObservationDescription],
+    push_mode: bool,
+    scheduler: AdaptivePollScheduler | None,
+    breaker: CircuitBreaker,
+    fleet: MeteobridgeFleet,
+) -> MeteobridgeDataUpdateCoordinator:
+    """Create the coordinator polling the Meteobridge."""
+
+    async def async_update_data():
+        """Obtain the latest data from Meteobridge."""
+        # The interval is picked up when the coordinator schedules the next
+        # refresh. There is none in push mode.
+        try:
+            data = await fetcher.async_fetch()
+        except UpdateFailed:
+            if breaker.state == STATE_OPEN and not push_mode:
+                coordinator.update_interval = timedelta(
+                    seconds=max(breaker.retry_in, 1)
+                )
+            raise
+
+        if scheduler is not None and data is not None:
+            coordinator.update_interval = scheduler.update(data)
+        elif not push_mode:
+            coordinator.update_interval = timedelta(
+                seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            )
+        return data
+
+    # In push mode the coordinator only polls once, to have data at startup.
+    update_interval = None
+    if not push_mode:
+        update_interval = timedelta(
+            seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+
+    coordinator = MeteobridgeDataUpdateCoordinator(
+        hass,
+        _LOGGER,
+        name=DOMAIN,
+        update_method=async_update_data,
+        update_interval=update_interval,
+    )
+    if not push_mode:
+        entry.async_on_unload(fleet.async_register(entry.entry_id, coordinator))
+    return coordinator
+
+
+def _create_derived_values(entry: ConfigEntry) -> MeteobridgeDerivedValues | None:
+    """Create the derived values of the entry, if the user enabled them."""
+    if not entry.options.get(CONF_DERIVED_SENSORS, False):
+        return None
+    from .derived import MeteobridgeDerivedValues
+
+    return MeteobridgeDerivedValues()
+
+
+@callback
+def _async_track_capabilities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    entry_data: MeteobridgeEntryData,
+    metadata_store: MeteobridgeMetadataStore,
+) -> None:
+    """Learn the observation fields the logger reports and announce new ones."""
+    coordinator = entry_data.coordinator
+    saved = False
+
+    @callback
+    def _async_check_capabilities() -> None:
+        nonlocal saved
+        if not coordinator.last_update_success or coordinator.data is None:
+            return
+        new_keys = available_keys(coordinator.data) - entry_data.capabilities
+        if saved and not new_keys:
+            return
+        entry_data.capabilities |= new_keys
+        metadata_store.async_update(
+            entry.unique_id,
+            entry_data.meteobridgeapi.device_data,
+            entry_data.capabilities,
+        )
+        saved = True
+        if new_keys:
+            _LOGGER.debug("Meteobridge started reporting %s", sorted(new_keys))
+            async_dispatcher_send(
+                hass, SIGNAL_NEW_CAPABILITIES.format(entry.entry_id), new_keys
+            )
+
+    _async_check_capabilities()
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_capabilities))
+
+
+@callback
+def _async_remove_unreported_entities(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: MeteobridgeEntryData
+) -> None:
+    """Remove the entities of observation fields the logger does not report.
+
+    Earlier versions created an entity for every field. Without saved
+    capabilities, after an upgrade, those the first refresh found no value
+    for are removed. They are added again once the logger reports them.
+    """
+    from .binary_sensor import BINARY_SENSOR_TYPES
+    from .sensor import SENSOR_TABLE
+
+    observation_keys = {
+        "sensor": SENSOR_TABLE.keys(),
+        "binary_sensor": {description.key for description in BINARY_SENSOR_TYPES},
+    }
+    entity_registry = er.async_get(hass)
+    suffix = f"_{entry_data.device_data.key}"
+    for registry_entry in er.async_entries_for_config_entry(
+        entity_registry, entry.entry_id
+    ):
+        key = registry_entry.unique_id.removesuffix(suffix)
+        if (
+            key in observation_keys.get(registry_entry.domain, ())
+            and key not in entry_data.capabilities
+        ):
+            _LOGGER.debug("Removing %s, not reported", registry_entry.entity_id)
+            entity_registry.async_remove(registry_entry.entity_id)
+
+
+@callback
+def _async_track_history(entry: ConfigEntry, entry_data: MeteobridgeEntryData) -> None:
+    """Record each new observation in the entry history and derived values."""
+    coordinator = entry_data.coordinator
+    history = entry_data.history
+    derived = entry_data.derived
+    recorded: ObservationDescription | None = None
+
+    @callback
+    def _async_record() -> None:
+        nonlocal recorded
+        data = coordinator.data
+        # Cached fetches return the same object, which is already recorded.
+        if not coordinator.last_update_success or data is None or data is recorded:
+            return
+        now = time.time()
+        history.record(data, now)
+        if derived is not None:
+            derived.update(data, now)
+        recorded = data
+
+    _async_record()
+    entry.async_on_unload(coordinator.async_add_listener(_async_record))
+
+
+@callback
+def _async_create_recorder(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meteobridgeapi: MeteobridgeApiClient,
+    device_data: DataLoggerDescription,
+) -> ResponseRecorder | None:
+    """Record the responses of a polled logger, if the user enabled it."""
+    if not entry.options.get(CONF_RECORD_RESPONSES, False) or not isinstance(
+        meteobridgeapi, MeteobridgePollClient
+    ):
+        return None
+    from .replay import ResponseRecorder
+
+    recorder = ResponseRecorder(
+        hass, hass.config.path(RECORDING_DIRECTORY, f"{entry.entry_id}.jsonl")
+    )
+    recorder.start(device_data, entry.options[CONF_EXTRA_SENSORS])
+    meteobridgeapi.recorder = recorder
+
+    async def _async_flush(event: Event | None = None) -> None:
+        await recorder.async_flush()
+
+    entry.async_on_unload(_async_flush)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush)
+    )
+    return recorder
+
+
+@callback
+def _async_track_needed_fields(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: MeteobridgeEntryData
+) -> None:
+    """Only request the fields of enabled entities, updated when they change."""
+    meteobridgeapi = entry_data.meteobridgeapi
+    if not isinstance(meteobridgeapi, MeteobridgePollClient):
+        # Pushed data has the fields of the template on the Meteobridge.
+        return
+    required: set[str] = set()
+    for source in (entry_data.scheduler, entry_data.derived):
+        if source is not None:
+            required.update(source.source_fields)
+    from .sensor import CHANNEL_SENSOR_KEYS
+
+    descriptions = _field_descriptions()
+    meteobridgeapi.slow_fields = slow_tier_fields(descriptions)
+
+    entity_registry = er.async_get(hass)
+    suffix = f"_{entry_data.device_data.key}"
+    disabled = {
+        registry_entry.unique_id.removesuffix(suffix)
+        for registry_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        )
+        if registry_entry.disabled
+    }
+
+    @callback
+    def _async_set_needed_fields() -> None:
+        meteobridgeapi.set_needed_fields(
+            needed_fields(
+                descriptions, disabled, required | (CHANNEL_SENSOR_KEYS - disabled)
+            )
+        )
+
+    @callback
+    def _async_entity_registry_filter(event: Event) -> bool:
+        return (
+            _disabled_change(entity_registry, event, entry.entry_id, suffix, disabled)
+            is not None
+        )
+
+    @callback
+    def _async_entity_registry_updated(event: Event) -> None:
+        change = _disabled_change(
+            entity_registry, event, entry.entry_id, suffix, disabled
+        )
+        if change is None:
+            return
+        key, is_disabled = change
+        if is_disabled:
+            disabled.add(key)
+        else:
+            disabled.discard(key)
+        _async_set_needed_fields()
+
+    _async_set_needed_fields()
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            _async_entity_registry_updated,
+            event_filter=_async_entity_registry_filter,
+        )
+    )
+
+
+@callback
+def _disabled_change(
+    entity_registry: er.EntityRegistry,
+    event: Event,
+    entry_id: str,
+    suffix: str,
+    disabled: set[str],
+) -> tuple[str, bool] | None:
+    """Return the key and state of an entity of the entry, if it was toggled.
+
+    Registry events of every entry pass here, so only the entity of the
+    event is looked up.
+    """
+    action = event.data["action"]
+    if action == "remove" or (
+        action == "update" and "disabled_by" not in event.data["changes"]
+    ):
+        return None
+    registry_entry = entity_registry.async_get(event.data["entity_id"])
+    if registry_entry is None or registry_entry.config_entry_id != entry_id:
+        return None
+    key = registry_entry.unique_id.removesuffix(suffix)
+    if registry_entry.disabled == (key in disabled):
+        return None
+    return key, registry_entry.disabled
+
+
+@callback
+def _async_setup_push(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    meteobridgeapi: MeteobridgePushClient,
+    coordinator: MeteobridgeDataUpdateCoordinator,
+) -> None:
+    """Register the webhook for push ingestion."""
+    from homeassistant.components import webhook
+
+    from .push import async_register_push_webhook, build_push_template
+
+    if CONF_WEBHOOK_ID not in entry.data:
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+        )
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+
+    async_register_push_webhook(hass, webhook_id, meteobridgeapi, coordinator)
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
+
+    try:
+        url = webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        url = f"http://<home-assistant>:8123{webhook.async_generate_path(webhook_id)}"
+    _LOGGER.info(
+        "Meteobridge push mode enabled. Configure an HTTP event on the "
+        "Meteobridge to request %s?%s=%s",
+        url,
+        PUSH_QUERY_PARAMETER,
+        build_push_template(entry.options[CONF_EXTRA_SENSORS]),
+    )
+
+
+async def _async_get_or_create_nvr_device_in_registry(
+    hass: HomeAssistant, entry: ConfigEntry, device_data: DataLoggerDescription
+) -> None:
+    device_registry = dr.async_get(hass)
+
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        connections={(dr.CONNECTION_NETWORK_MAC, entry.unique_id)},
+        identifiers={(DOMAIN, entry.unique_id)},
+        manufacturer=DEFAULT_BRAND,
+        name=f"{device_data.station} ({device_data.ip})",
+        model=device_data.platform,
+        sw_version=device_data.swversion,
+    )
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry):
+    """Update options."""
+    entry_data: MeteobridgeEntryData = hass.data[DOMAIN][entry.entry_id]
+    if entry_data.options == dict(entry.options):
+        return
+    if requires_reload(entry_data.options, dict(entry.options)):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    await async_apply_options(hass, entry, entry_data)
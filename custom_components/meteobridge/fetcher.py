@@ -0,0 +1,64 @@
+"""Coalesce observation requests to a Meteobridge.
+
+A Meteobridge is a small device. Refreshes requested at nearly the same time,
+by entity updates, automations and the coordinator, share one request, and
+a result younger than the cache TTL is reused instead of asking again.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlightFetcher(Generic[_T]):
+    """Run at most one fetch at a time, and reuse recent results."""
+
+    def __init__(self, fetch: Callable[[], Awaitable[_T]], cache_ttl: float) -> None:
+        """Initialize the fetcher."""
+        self._fetch = fetch
+        self.cache_ttl = cache_ttl
+        self._in_flight: asyncio.Future[_T] | None = None
+        self._result: _T | None = None
+        self._fetched_at = 0.0
+        self.fetches = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    async def async_fetch(self) -> _T:
+        """Return fresh data, sharing a running fetch or a recent result."""
+        if (
+            self._result is not None
+            and time.monotonic() - self._fetched_at < self.cache_ttl
+        ):
+            self.cache_hits += 1
+            return self._result
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.ensure_future(self._async_fetch())
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the fetch the others wait for.
+        return await asyncio.shield(self._in_flight)
+
+    async def _async_fetch(self) -> _T:
+        self.fetches += 1
+        try:
+            result = await self._fetch()
+        finally:
+            self._in_flight = None
+        self._result = result
+        self._fetched_at = time.monotonic()
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the fetch statistics."""
+        return {
+            "cache_ttl": self.cache_ttl,
+            "fetches": self.fetches,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+        }
@@ -0,0 +1,106 @@
+"""Spread the polls of all Meteobridge entries over their interval.
+
+Coordinators schedule their next refresh one interval after the last one,
+rounded to the second, so entries set up together after a restart keep
+polling in the same second. The fleet gives every polled entry a phase, an
+even share of the interval, and the coordinator schedules its refreshes at
+that point of the interval. A domain-wide limit on fetches running at once
+keeps a burst of manual refreshes from flooding the event loop and the
+network.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_FLEET, FLEET_MAX_CONCURRENT_FETCHES
+from .coordinator import MeteobridgeDataUpdateCoordinator
+from .metrics import LatencyStats
+
+
+class MeteobridgeFleet:
+    """Phases and a concurrency limit for the polls of all entries."""
+
+    def __init__(self, max_concurrent: int = FLEET_MAX_CONCURRENT_FETCHES) -> None:
+        """Initialize an empty fleet."""
+        self.max_concurrent = max_concurrent
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._coordinators: dict[str, MeteobridgeDataUpdateCoordinator] = {}
+        self.running = 0
+        self.peak_running = 0
+        self.queued = 0
+        self.queue_time = LatencyStats()
+
+    @callback
+    def async_register(
+        self, entry_id: str, coordinator: MeteobridgeDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Give the coordinator of an entry a phase, return how to remove it."""
+        self._coordinators[entry_id] = coordinator
+        self._assign_phases()
+
+        @callback
+        def _async_unregister() -> None:
+            if self._coordinators.get(entry_id) is coordinator:
+                del self._coordinators[entry_id]
+            coordinator.phase = None
+            self._assign_phases()
+
+        return _async_unregister
+
+    def _assign_phases(self) -> None:
+        """Spread the phases evenly, taking effect from the next refresh."""
+        count = len(self._coordinators)
+        for index, entry_id in enumerate(sorted(self._coordinators)):
+            self._coordinators[entry_id].phase = index / count
+
+    @asynccontextmanager
+    async def async_fetch_slot(self) -> AsyncIterator[None]:
+        """Wait until fewer than max_concurrent fetches are running."""
+        if self._semaphore.locked():
+            self.queued += 1
+        start = time.perf_counter()
+        async with self._semaphore:
+            self.queue_time.add(time.perf_counter() - start)
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+            try:
+                yield
+            finally:
+                self.running -= 1
+
+    def offset(self, entry_id: str) -> float | None:
+        """Return the seconds into the poll interval the entry polls at."""
+        coordinator = self._coordinators.get(entry_id)
+        if coordinator is None or coordinator.phase is None:
+            return None
+        if coordinator.update_interval is None:
+            return None
+        return round(coordinator.phase * coordinator.update_interval.total_seconds(), 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the phases and fetch statistics."""
+        return {
+            "entries": len(self._coordinators),
+            "max_concurrent": self.max_concurrent,
+            "running": self.running,
+            "peak_running": self.peak_running,
+            "queued": self.queued,
+            "queue_time": self.queue_time.as_dict(),
+            "offsets": {
+                entry_id: self.offset(entry_id) for entry_id in sorted(self._coordinators)
+            },
+        }
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> MeteobridgeFleet:
+    """Return the fleet of all entries, creating it on first use."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = MeteobridgeFleet()
+    return fleet
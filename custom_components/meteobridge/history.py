@@ -0,0 +1,117 @@
+"""Recent observation history for Meteobridge, kept in memory.
+
+Every numeric observation field gets a fixed size ring buffer of timestamps
+and values, stored in typed arrays. The buffers of an entry share a memory
+budget, so their footprint is known up front and does not grow over time.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+from array import array
+from collections.abc import Iterator
+from typing import Any
+
+from pymeteobridgedata.data import ObservationDescription
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bytes per sample: one double for the timestamp and one for the value.
+SAMPLE_SIZE = 2 * array("d").itemsize
+
+
+class RingBuffer:
+    """Fixed capacity buffer of (timestamp, value) samples."""
+
+    __slots__ = ("capacity", "_times", "_values", "_next", "_size")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the buffer."""
+        self.capacity = capacity
+        self._times = array("d", [0.0]) * capacity
+        self._values = array("d", [0.0]) * capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def latest(self) -> tuple[float, float] | None:
+        """Return the newest sample."""
+        if not self._size:
+            return None
+        index = self._next - 1
+        return self._times[index], self._values[index]
+
+    def samples(self, since: float | None = None) -> Iterator[tuple[float, float]]:
+        """Yield samples from oldest to newest, optionally only from since."""
+        start = self._next - self._size
+        for offset in range(self._size):
+            index = (start + offset) % self.capacity
+            timestamp = self._times[index]
+            if since is None or timestamp >= since:
+                yield timestamp, self._values[index]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the sample arrays."""
+        return self.capacity * SAMPLE_SIZE
+
+
+class MeteobridgeHistory:
+    """Ring buffers for the numeric observation fields of an entry."""
+
+    def __init__(self, capacity: int, memory_budget: int) -> None:
+        """Initialize the history."""
+        self.capacity = capacity
+        self.memory_budget = memory_budget
+        self.buffers: dict[str, RingBuffer] = {}
+        self._skipped: set[str] = set()
+
+    def record(self, data: ObservationDescription, timestamp: float) -> None:
+        """Add the numeric values of an observation."""
+        for field in dataclasses.fields(data):
+            value = getattr(data, field.name)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if (buffer := self.buffers.get(field.name)) is None:
+                if (buffer := self._add_buffer(field.name)) is None:
+                    continue
+            buffer.append(timestamp, value)
+
+    def _add_buffer(self, key: str) -> RingBuffer | None:
+        """Return a new buffer for key, if the memory budget allows it."""
+        if self.nbytes + self.capacity * SAMPLE_SIZE > self.memory_budget:
+            if key not in self._skipped:
+                self._skipped.add(key)
+                _LOGGER.debug("History memory budget reached, not keeping %s", key)
+            return None
+        buffer = self.buffers[key] = RingBuffer(self.capacity)
+        return buffer
+
+    def get(self, key: str) -> RingBuffer | None:
+        """Return the buffer for key."""
+        return self.buffers.get(key)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by all sample arrays."""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history size and memory use."""
+        return {
+            "keys": len(self.buffers),
+            "capacity": self.capacity,
+            "nbytes": self.nbytes,
+            "memory_budget": self.memory_budget,
+            "skipped_keys": sorted(self._skipped),
+        }
@@ -0,0 +1,73 @@
+"""Timing statistics for Meteobridge polls.
+
+Durations are counted in a fixed histogram since the entry was set up, and
+the most recent ones are kept for percentiles. Both have a fixed size, so
+keeping statistics does not grow with the uptime.
+"""
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from typing import Any
+
+from pymeteobridgedata.data import ObservationDescription
+
+from .const import METRICS_WINDOW
+
+# Upper bounds of the histogram buckets, in milliseconds.
+HISTOGRAM_BOUNDS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyStats:
+    """Histogram and recent percentiles of durations."""
+
+    __slots__ = ("_recent", "buckets", "count", "total")
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """Initialize empty statistics."""
+        self._recent: deque[float] = deque(maxlen=window)
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a duration."""
+        milliseconds = seconds * 1000
+        self._recent.append(milliseconds)
+        self.buckets[bisect_left(HISTOGRAM_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the recent durations, in milliseconds."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        index = max(0, math.ceil(len(ordered) * percent / 100) - 1)
+        return round(ordered[index], 2)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics, in milliseconds."""
+        labels = [f"<={bound}" for bound in HISTOGRAM_BOUNDS_MS]
+        labels.append(f">{HISTOGRAM_BOUNDS_MS[-1]}")
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_recent_ms": round(max(self._recent), 2) if self._recent else None,
+            "histogram_ms": dict(zip(labels, self.buckets)),
+        }
+
+
+def measurement_age(
+    data: ObservationDescription | None, now: datetime
+) -> float | None:
+    """Return the seconds since the logger took the newest measurement."""
+    measured = getattr(data, "utc_time", None)
+    if not isinstance(measured, datetime):
+        return None
+    return round((now - measured).total_seconds(), 1)
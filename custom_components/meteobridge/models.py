@@ -1,12 +1,21 @@
 """The Meteobridge integration models."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from pymeteobridgedata import MeteobridgeApiClient
-from pymeteobridgedata.data import DataLoggerDescription
+if TYPE_CHECKING:
+    from homeassistant.helpers.entity import DeviceInfo
+    from pymeteobridgedata import MeteobridgeApiClient
+    from pymeteobridgedata.data import DataLoggerDescription
+
+    from .breaker import CircuitBreaker
+    from .coordinator import MeteobridgeDataUpdateCoordinator
+    from .derived import MeteobridgeDerivedValues
+    from .fetcher import SingleFlightFetcher
+    from .history import MeteobridgeHistory
+    from .replay import ResponseRecorder
+    from .scheduler import AdaptivePollScheduler
 
 
 @dataclass
@@ -14,6 +23,15 @@ class MeteobridgeEntryData:
     """Data for the meteobridge integration."""
 
     meteobridgeapi: MeteobridgeApiClient
-    coordinator: DataUpdateCoordinator
+    coordinator: MeteobridgeDataUpdateCoordinator
     device_data: DataLoggerDescription
     unit_descriptions: dict[str, Any]
+    scheduler: AdaptivePollScheduler | None = None
+    fetcher: SingleFlightFetcher | None = None
+    history: MeteobridgeHistory | None = None
+    derived: MeteobridgeDerivedValues | None = None
+    breaker: CircuitBreaker | None = None
+    recorder: ResponseRecorder | None = None
+    device_info: DeviceInfo | None = None
+    capabilities: set[str] = field(default_factory=set)
+    options: dict[str, Any] = field(default_factory=dict)
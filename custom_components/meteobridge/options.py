@@ -0,0 +1,146 @@
+"""Apply changed Meteobridge options to a running entry.
+
+Most options can be changed without reloading the entry. Only a change of
+ingestion mode, adaptive polling, derived sensors or response recording
+changes which objects the entry is made of, and still needs a reload. In
+push mode a change of extra sensors reloads too, as the Meteobridge has to
+be given the new push template.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pymeteobridgedata import MeteobridgeApiClient
+
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_CACHE_TTL,
+    CONF_DERIVED_SENSORS,
+    CONF_EXTRA_SENSORS,
+    CONF_HEDGE_REQUESTS,
+    CONF_INGESTION_MODE,
+    CONF_RECORD_RESPONSES,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    INGESTION_MODE_POLL,
+    INGESTION_MODE_PUSH,
+    MAX_EXTRA_SENSORS,
+)
+from .models import MeteobridgeEntryData
+from .breaker import request_deadline
+from .client import MeteobridgePollClient
+from .codec import extra_sensor_fields
+from .storage import async_get_metadata_store
+
+_LOGGER = logging.getLogger(__name__)
+
+RELOAD_OPTIONS = (
+    CONF_INGESTION_MODE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_DERIVED_SENSORS,
+    CONF_RECORD_RESPONSES,
+)
+
+
+def requires_reload(old: dict[str, Any], new: dict[str, Any]) -> bool:
+    """Return True if the change cannot be applied to the running entry."""
+    options = RELOAD_OPTIONS
+    if is_push_mode(new):
+        # The pushed template has one value for each extra sensor.
+        options += (CONF_EXTRA_SENSORS,)
+    return any(old.get(option) != new.get(option) for option in options)
+
+
+def is_push_mode(options: dict[str, Any]) -> bool:
+    """Return True if the options have the Meteobridge push its data."""
+    return options.get(CONF_INGESTION_MODE, INGESTION_MODE_POLL) == INGESTION_MODE_PUSH
+
+
+def set_credentials(
+    meteobridgeapi: MeteobridgeApiClient, username: str, password: str
+) -> None:
+    """Swap the credentials of a client, keeping its session."""
+    meteobridgeapi.base_url = meteobridgeapi.base_url.replace(
+        f"{meteobridgeapi.username}:{meteobridgeapi.password}@",
+        f"{username}:{password}@",
+        1,
+    )
+    meteobridgeapi.username = username
+    meteobridgeapi.password = password
+
+
+async def async_apply_options(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: MeteobridgeEntryData
+) -> None:
+    """Apply changed options to the running entry."""
+    old, new = entry_data.options, dict(entry.options)
+    entry_data.options = new
+    meteobridgeapi = entry_data.meteobridgeapi
+    coordinator = entry_data.coordinator
+
+    if (old.get(CONF_USERNAME), old.get(CONF_PASSWORD)) != (
+        new[CONF_USERNAME],
+        new[CONF_PASSWORD],
+    ):
+        set_credentials(meteobridgeapi, new[CONF_USERNAME], new[CONF_PASSWORD])
+
+    if isinstance(meteobridgeapi, MeteobridgePollClient):
+        meteobridgeapi.hedge = new.get(CONF_HEDGE_REQUESTS, False)
+
+    if entry_data.fetcher is not None:
+        entry_data.fetcher.cache_ttl = new.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+
+    scan_interval = new.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    if entry_data.breaker is not None:
+        entry_data.breaker.deadline = request_deadline(scan_interval)
+    if coordinator.update_interval is not None:
+        coordinator.update_interval = timedelta(seconds=scan_interval)
+    if entry_data.scheduler is not None:
+        entry_data.scheduler.set_max_interval(scan_interval)
+        coordinator.update_interval = timedelta(seconds=entry_data.scheduler.interval)
+
+    if old.get(CONF_EXTRA_SENSORS) != new[CONF_EXTRA_SENSORS]:
+        meteobridgeapi.extra_sensors = new[CONF_EXTRA_SENSORS]
+        await _async_remove_extra_sensors(hass, entry, entry_data)
+
+    # Polls with the new settings, and schedules the next poll at the new
+    # interval. Entities for added extra sensors appear once they report. In
+    # push mode there is nothing to poll, the next push is decoded with the
+    # new settings.
+    if not is_push_mode(new):
+        await coordinator.async_refresh()
+    _LOGGER.debug("Applied options to %s without reloading", entry.title)
+
+
+async def _async_remove_extra_sensors(
+    hass: HomeAssistant, entry: ConfigEntry, entry_data: MeteobridgeEntryData
+) -> None:
+    """Remove the entities of extra sensor channels no longer configured."""
+    unused = {field[0] for field in extra_sensor_fields(MAX_EXTRA_SENSORS)} - {
+        field[0] for field in extra_sensor_fields(entry.options[CONF_EXTRA_SENSORS])
+    }
+    if not (removed := entry_data.capabilities & unused):
+        return
+
+    entry_data.capabilities -= removed
+    metadata_store = await async_get_metadata_store(hass)
+    metadata_store.async_update(
+        entry.unique_id,
+        entry_data.meteobridgeapi.device_data or entry_data.device_data,
+        entry_data.capabilities,
+    )
+
+    entity_registry = er.async_get(hass)
+    for key in removed:
+        unique_id = f"{key}_{entry_data.device_data.key}"
+        if entity_id := entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, unique_id
+        ):
+            entity_registry.async_remove(entity_id)
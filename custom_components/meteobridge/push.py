@@ -0,0 +1,103 @@
+"""Push ingestion for Meteobridge.
+
+Meteobridge can send an HTTP request with a filled in template on its own
+schedule. The template uses the same fields, in the same order, as the
+request the integration makes when polling, so the pushed values are
+decoded into an ObservationDescription by the same codec.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from pymeteobridgedata import BadRequest, MeteobridgeApiClient
+from pymeteobridgedata.const import FIELDS_OBSERVATION
+from pymeteobridgedata.data import ObservationDescription
+
+from .client import MeteobridgePollClient
+from .codec import ObservationCodec, extra_sensor_fields
+from .const import DOMAIN, PUSH_QUERY_PARAMETER
+from .metrics import LatencyStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def build_push_template(extra_sensors: int) -> str:
+    """Return the template Meteobridge must fill in for each push."""
+    fields = FIELDS_OBSERVATION + extra_sensor_fields(extra_sensors)
+    return ";".join(f"[{field[1]}]" for field in fields)
+
+
+class MeteobridgePushClient(MeteobridgeApiClient):
+    """API client that can also decode pushed template data."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the client."""
+        super().__init__(*args, **kwargs)
+        self.codec = ObservationCodec(self.cnv)
+        self.parse_time = LatencyStats()
+
+    set_device_data = MeteobridgePollClient.set_device_data
+
+    async def decode_push(self, payload: str) -> ObservationDescription:
+        """Decode a pushed template into an ObservationDescription."""
+        items = payload.strip().split(";")
+        expected = len(FIELDS_OBSERVATION) + 3 * self.extra_sensors
+        if len(items) != expected:
+            raise BadRequest(
+                f"Pushed data has {len(items)} fields, expected {expected}. "
+                "Check the template configured on the Meteobridge."
+            )
+        if self._device_data is None:
+            raise BadRequest("Waiting for valid data from Meteobridge.")
+
+        split = len(FIELDS_OBSERVATION)
+        start = time.perf_counter()
+        data = self.codec.decode(items[:split], items[split:], self._device_data)
+        self.parse_time.add(time.perf_counter() - start)
+        return data
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the decoding statistics."""
+        return {"parse_time": self.parse_time.as_dict()}
+
+
+def async_register_push_webhook(
+    hass: HomeAssistant,
+    webhook_id: str,
+    meteobridgeapi: MeteobridgePushClient,
+    coordinator: DataUpdateCoordinator,
+) -> None:
+    """Register the webhook Meteobridge pushes its data to."""
+
+    async def _async_handle_push(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response:
+        """Handle data pushed by Meteobridge."""
+        payload = request.query.get(PUSH_QUERY_PARAMETER)
+        if payload is None:
+            payload = await request.text()
+
+        try:
+            data = await meteobridgeapi.decode_push(payload)
+        except BadRequest as err:
+            _LOGGER.warning("Invalid data pushed from Meteobridge: %s", err)
+            return web.Response(status=400, text=str(err))
+
+        coordinator.async_set_updated_data(data)
+        return web.Response(status=200)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"{DOMAIN.capitalize()} {meteobridgeapi.ip_address}",
+        webhook_id,
+        _async_handle_push,
+        local_only=True,
+        allowed_methods=("GET", "POST"),
+    )
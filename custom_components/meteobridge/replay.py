@@ -0,0 +1,262 @@
+"""Record raw Meteobridge responses, and replay them without a logger.
+
+When recording is enabled, every template response of a polled Meteobridge
+is appended to a JSON lines file, with the time it arrived. The first line
+describes the station, and each template is written once, the responses
+refer to it by number. A recording can be loaded on any machine and handed
+to MeteobridgeReplayClient, which answers template requests from it instead
+of the network, as fast as possible or paced like the original polls. This
+reproduces what a logger sent, including its failures, to investigate an
+incident or to benchmark the entities fed from it.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from pymeteobridgedata import BadRequest
+from pymeteobridgedata.data import DataLoggerDescription
+
+from .client import MeteobridgePollClient
+from .const import RECORDING_FLUSH_RECORDS, RECORDING_MAX_BYTES
+from .coordinator import MeteobridgeDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+TEMPLATE_TAG = re.compile(r"\[([^\]]+)\]")
+
+
+class RecordingEnded(BadRequest):
+    """Raised when a request is made after the last recorded response."""
+
+
+class ResponseRecorder:
+    """Append the raw responses of a logger to a JSON lines file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        max_bytes: int = RECORDING_MAX_BYTES,
+        flush_records: int = RECORDING_FLUSH_RECORDS,
+    ) -> None:
+        """Initialize the recorder, writing nothing yet."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_records = flush_records
+        self._pending: list[str] = []
+        self._templates: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self.full = False
+        self.records = 0
+        self.dropped = 0
+        self.bytes_written = 0
+
+    def start(self, device_data: DataLoggerDescription, extra_sensors: int) -> None:
+        """Describe the station the following responses come from."""
+        self._append(
+            {
+                "t": round(time.time(), 3),
+                "device": dataclasses.asdict(device_data),
+                "extra_sensors": extra_sensors,
+            }
+        )
+
+    def record(
+        self, template: str, response: str | None = None, error: str | None = None
+    ) -> None:
+        """Record the response to a template request, or the error it raised."""
+        if (number := self._templates.get(template)) is None:
+            number = self._templates[template] = len(self._templates)
+            self._append({"d": number, "q": template})
+        record: dict[str, Any] = {"t": round(time.time(), 3), "q": number}
+        if error is None:
+            record["r"] = response
+        else:
+            record["e"] = error
+        self._append(record)
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if self.full:
+            self.dropped += 1
+            return
+        self._pending.append(json.dumps(record, separators=(",", ":")))
+        self.records += 1
+        if len(self._pending) >= self.flush_records:
+            self.hass.async_create_background_task(
+                self.async_flush(), f"meteobridge recording {self.path}"
+            )
+
+    async def async_flush(self) -> None:
+        """Write the pending records to the file."""
+        lines, self._pending = self._pending, []
+        if not lines:
+            return
+        async with self._lock:
+            written = await self.hass.async_add_executor_job(self._write, lines)
+        if written:
+            self.bytes_written += written
+            return
+        self.full = True
+        self.dropped += len(lines)
+        _LOGGER.warning(
+            "Recording %s reached %s bytes, no more responses are recorded",
+            self.path,
+            self.max_bytes,
+        )
+
+    def _write(self, lines: list[str]) -> int:
+        """Append lines to the file, unless it would grow too large."""
+        data = "".join(f"{line}\n" for line in lines).encode()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "ab") as file:
+            if file.tell() + len(data) > self.max_bytes:
+                return 0
+            file.write(data)
+        return len(data)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the recording statistics."""
+        return {
+            "path": self.path,
+            "records": self.records,
+            "bytes_written": self.bytes_written,
+            "full": self.full,
+            "dropped": self.dropped,
+        }
+
+
+@dataclass
+class ReplayRecord:
+    """A recorded response, or the error a request raised."""
+
+    time: float
+    template: str
+    response: str | None
+    error: str | None
+
+
+@dataclass
+class Recording:
+    """The station and responses of a recording, in the order they arrived."""
+
+    device_data: DataLoggerDescription
+    extra_sensors: int
+    records: list[ReplayRecord]
+
+
+def load_recording(path: str) -> Recording:
+    """Read a recording written by ResponseRecorder."""
+    device_data: DataLoggerDescription | None = None
+    extra_sensors = 0
+    templates: dict[int, str] = {}
+    records = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            if "device" in record:
+                device_data = DataLoggerDescription(**record["device"])
+                extra_sensors = record["extra_sensors"]
+            elif "d" in record:
+                templates[record["d"]] = record["q"]
+            else:
+                records.append(
+                    ReplayRecord(
+                        record["t"],
+                        templates[record["q"]],
+                        record.get("r"),
+                        record.get("e"),
+                    )
+                )
+    if device_data is None:
+        raise ValueError(f"{path} does not describe a station")
+    return Recording(device_data, extra_sensors, records)
+
+
+class MeteobridgeReplayClient(MeteobridgePollClient):
+    """Client answering template requests from a recording.
+
+    Each request consumes the next recorded response. Requested fields are
+    answered with the latest recorded value of their tag, so a replay does
+    not need the same tiers or enabled entities as the recording. With a
+    speed, responses are held back until their recorded time, divided by the
+    speed, has passed since the first one.
+    """
+
+    def __init__(
+        self, recording: Recording, speed: float | None = None, **kwargs: Any
+    ) -> None:
+        """Initialize the client for a recording."""
+        kwargs.setdefault("extra_sensors", recording.extra_sensors)
+        super().__init__("replay", "replay", "replay", **kwargs)
+        self.set_device_data(recording.device_data)
+        self.recording = recording
+        self.speed = speed
+        self._position = 0
+        self._origin: tuple[float, float] | None = None
+        self._values: dict[str, str] = {}
+
+    @property
+    def finished(self) -> bool:
+        """Return True when all recorded responses have been replayed."""
+        return self._position >= len(self.recording.records)
+
+    async def initialize(self) -> None:
+        """Keep the station description of the recording."""
+
+    async def _async_request(self, method: str, endpoint: str) -> str:
+        """Answer a template request with the next recorded response."""
+        if self.finished:
+            raise RecordingEnded("The recording has ended.")
+        record = self.recording.records[self._position]
+        self._position += 1
+        await self._async_wait_until(record.time)
+        if record.error is not None:
+            raise BadRequest(record.error)
+
+        self._values.update(
+            zip(
+                TEMPLATE_TAG.findall(record.template),
+                record.response.strip().split(";"),
+            )
+        )
+        tags = TEMPLATE_TAG.findall(endpoint.removeprefix(self.base_url))
+        return ";".join(self._values.get(tag, "None") for tag in tags)
+
+    async def _async_wait_until(self, recorded: float) -> None:
+        if self.speed is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._origin is None:
+            self._origin = (loop.time(), recorded)
+        started, first = self._origin
+        delay = started + (recorded - first) / self.speed - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def async_replay(
+    coordinator: MeteobridgeDataUpdateCoordinator, client: MeteobridgeReplayClient
+) -> int:
+    """Feed every recorded observation to a coordinator, return the updates."""
+    updates = 0
+    while not client.finished:
+        try:
+            data = await client.update_observations()
+        except RecordingEnded:
+            break
+        except BadRequest as err:
+            coordinator.async_set_update_error(err)
+        else:
+            coordinator.async_set_updated_data(data)
+        updates += 1
+    return updates
@@ -0,0 +1,85 @@
+"""Weather adaptive poll interval for Meteobridge."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from pymeteobridgedata.data import ObservationDescription
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_GUST_RISE,
+    ADAPTIVE_GUST_RISE_RELATIVE,
+)
+
+
+class AdaptivePollScheduler:
+    """Shorten the poll interval during active weather, back off when stable."""
+
+    # Observation fields the scheduler reads, is_raining needs precip_rate.
+    source_fields = ("wind_gust", "lightning_strike_count", "precip_rate")
+
+    def __init__(self, min_interval: int, max_interval: int) -> None:
+        """Initialize the scheduler."""
+        self.min_interval = min(min_interval, max_interval)
+        self.max_interval = max_interval
+        self.interval: float = max_interval
+        self.polls = 0
+        self.active_polls = 0
+        self._elapsed = 0.0
+        self._last_gust: float | None = None
+        self._last_strike_count: float | None = None
+
+    def set_max_interval(self, max_interval: int) -> None:
+        """Change the slowest interval, as when the scan interval is changed."""
+        self.min_interval = min(self.min_interval, max_interval)
+        self.max_interval = max_interval
+        self.interval = min(self.interval, max_interval)
+
+    def is_active(self, data: ObservationDescription) -> bool:
+        """Return True if the weather is changing fast enough to poll quickly."""
+        gust = data.wind_gust
+        strike_count = data.lightning_strike_count
+        gust_rising = (
+            gust is not None
+            and self._last_gust is not None
+            and gust - self._last_gust
+            >= max(ADAPTIVE_GUST_RISE, self._last_gust * ADAPTIVE_GUST_RISE_RELATIVE)
+        )
+        lightning = (
+            strike_count is not None
+            and self._last_strike_count is not None
+            and strike_count != self._last_strike_count
+        )
+        self._last_gust = gust
+        self._last_strike_count = strike_count
+        return bool(data.is_raining) or gust_rising or lightning
+
+    def update(self, data: ObservationDescription) -> timedelta:
+        """Return the interval until the next poll, given the latest data."""
+        self.polls += 1
+        self._elapsed += self.interval
+        if self.is_active(data):
+            self.active_polls += 1
+            self.interval = self.min_interval
+        else:
+            self.interval = min(
+                self.max_interval, self.interval * ADAPTIVE_BACKOFF_FACTOR
+            )
+        return timedelta(seconds=self.interval)
+
+    @property
+    def requests_saved(self) -> int:
+        """Return polls avoided compared to always polling at the minimum."""
+        return max(0, int(self._elapsed / self.min_interval) - self.polls)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state."""
+        return {
+            "interval": round(self.interval, 1),
+            "min_interval": self.min_interval,
+            "max_interval": self.max_interval,
+            "polls": self.polls,
+            "active_polls": self.active_polls,
+            "requests_saved": self.requests_saved,
+        }
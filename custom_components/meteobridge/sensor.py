@@ -2,848 +2,399 @@
 from __future__ import annotations
 
 import logging
+from collections import ChainMap
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
-    SensorEntity,
+    RestoreSensor,
     SensorEntityDescription,
     SensorStateClass,
     SensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    ATTR_ATTRIBUTION,
     CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     DEGREE,
+    EntityCategory,
+    PERCENTAGE,
     UnitOfIrradiance,
     UnitOfTemperature,
+    UnitOfTime,
     UV_INDEX,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.typing import StateType
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTR_MEASSURE_TIME,
+    DEFAULT_ATTRIBUTION,
     DOMAIN,
+    MAX_EXTRA_SENSORS,
+    POLL_TIER_SLOW,
+    SIGNAL_NEW_CAPABILITIES,
     TRANSLATION_KEY_AQI_DESCRIPTION,
     TRANSLATION_KEY_BEAUFORT,
     TRANSLATION_KEY_TREND,
     TRANSLATION_KEY_UV_DESCRIPTION,
     TRANSLATION_KEY_WIND_CARDINAL,
 )
-from .entity import MeteobridgeEntity
+from .client import MeteobridgePollClient
+from .entity import (
+    MeteobridgeEntity,
+    MeteobridgePollTierMixin,
+    MeteobridgeWriteThrottleMixin,
+)
+from .metrics import measurement_age
 from .models import MeteobridgeEntryData
 
+if TYPE_CHECKING:
+    from .derived import MeteobridgeDerivedValues
+    from .scheduler import AdaptivePollScheduler
+
 
-@dataclass
-class MeteobridgeRequiredKeysMixin:
-    """Mixin for required keys."""
+@dataclass(frozen=True, kw_only=True)
+class MeteobridgeUnitMixin:
+    """Mixin for the unit and attribute of a sensor."""
 
-    unit_type: str
-    always_add: bool
-    attribute_field: str
+    # Key of the unit in the unit descriptions, when it depends on the units
+    # of the logger instead of native_unit_of_measurement.
+    unit_type: str = "none"
+    attribute_field: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, kw_only=True, slots=True)
 class MeteobridgeSensorEntityDescription(
-    SensorEntityDescription, MeteobridgeRequiredKeysMixin
+    SensorEntityDescription,
+    MeteobridgeUnitMixin,
+    MeteobridgeWriteThrottleMixin,
+    MeteobridgePollTierMixin,
 ):
     """Describes Meteobridge Sensor entity."""
 
 
-SENSOR_TYPES: tuple[MeteobridgeSensorEntityDescription, ...] = (
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature",
-        name="Air Temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="sea_level_pressure",
-        name="Sea Level Pressure",
-        device_class=SensorDeviceClass.ATMOSPHERIC_PRESSURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="pressure",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="station_pressure",
-        name="Station Pressure",
-        device_class=SensorDeviceClass.ATMOSPHERIC_PRESSURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="pressure",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity",
-        name="Relative Humidity",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="precip_rate",
-        name="Precipitation Rate",
-        icon="mdi:weather-pouring",
-        device_class=SensorDeviceClass.PRECIPITATION_INTENSITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="precipitation_rate",
-        always_add=True,
-        attribute_field=None,
-    ),
+# Arguments shared by the sensors of a kind.
+_MEASUREMENT = {"state_class": SensorStateClass.MEASUREMENT}
+_TEMPERATURE = {
+    "device_class": SensorDeviceClass.TEMPERATURE,
+    "native_unit_of_measurement": UnitOfTemperature.CELSIUS,
+    **_MEASUREMENT,
+}
+_HUMIDITY = {
+    "device_class": SensorDeviceClass.HUMIDITY,
+    "native_unit_of_measurement": PERCENTAGE,
+    **_MEASUREMENT,
+}
+_PRESSURE = {
+    "device_class": SensorDeviceClass.ATMOSPHERIC_PRESSURE,
+    "unit_type": "pressure",
+    **_MEASUREMENT,
+}
+_PRECIPITATION = {
+    "icon": "mdi:weather-rainy",
+    "device_class": SensorDeviceClass.PRECIPITATION,
+    "unit_type": "precipitation",
+}
+_WIND_SPEED = {
+    "device_class": SensorDeviceClass.WIND_SPEED,
+    "unit_type": "length",
+    **_MEASUREMENT,
+}
+_AIR_QUALITY = {"icon": "mdi:air-filter"}
+_PARTICULATE = {
+    **_AIR_QUALITY,
+    "native_unit_of_measurement": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
+}
+_TREND = {"icon": "mdi:trending-up", "translation_key": TRANSLATION_KEY_TREND}
+_SLOW = {"poll_tier": POLL_TIER_SLOW}
+
+# Sensors repeated for each channel: key prefix, name, kind and channels.
+CHANNEL_SENSORS = (
+    ("temperature_extra", "Extra Temperature", _TEMPERATURE, MAX_EXTRA_SENSORS),
+    ("relative_humidity_extra", "Extra Humidity", _HUMIDITY, MAX_EXTRA_SENSORS),
+    ("heat_index_extra", "Extra Heat Index", _TEMPERATURE, MAX_EXTRA_SENSORS),
+    ("temperature_leaf", "Leaf Temperature", _TEMPERATURE, 4),
+    ("humidity_leaf", "Leaf Humidity", _HUMIDITY, 4),
+    ("temperature_soil", "Soil Temperature", _TEMPERATURE, 4),
+    ("humidity_soil", "Soil Humidity", _HUMIDITY, 4),
+)
+_CHANNEL_TABLE = {
+    f"{prefix}_{channel}": (f"{name} {channel}", kind)
+    for prefix, name, kind, channels in CHANNEL_SENSORS
+    for channel in range(1, channels + 1)
+}
+# Channel sensors only read their own field, in the fast tier.
+CHANNEL_SENSOR_KEYS = frozenset(_CHANNEL_TABLE)
+
+# The name and the arguments of each sensor, by key, merged in order. The
+# descriptions are only created for the sensors an entry has.
+SENSOR_TABLE: dict[str, tuple[Any, ...]] = {
+    "air_temperature": ("Air Temperature", _TEMPERATURE),
+    "sea_level_pressure": ("Sea Level Pressure", _PRESSURE),
+    "station_pressure": ("Station Pressure", _PRESSURE),
+    "relative_humidity": ("Relative Humidity", _HUMIDITY),
+    "precip_rate": (
+        "Precipitation Rate",
+        _PRECIPITATION,
+        _MEASUREMENT,
+        {
+            "icon": "mdi:weather-pouring",
+            "device_class": SensorDeviceClass.PRECIPITATION_INTENSITY,
+            "unit_type": "precipitation_rate",
+        },
+    ),
+    "precip_accum_local_day": ("Precipitation Today", _PRECIPITATION, _MEASUREMENT),
+    "precip_accum_last24h": (
+        "Precipitation Last 24 hours",
+        _PRECIPITATION,
+        _MEASUREMENT,
+    ),
+    "precip_accum_month": ("Precipitation Current Month", _PRECIPITATION, _SLOW),
+    "precip_accum_year": ("Precipitation Current Year", _PRECIPITATION, _SLOW),
+    "wind_avg": ("Wind Speed", _WIND_SPEED, {"icon": "mdi:weather-windy-variant"}),
+    "wind_direction": (
+        "Wind Direction",
+        _MEASUREMENT,
+        {
+            "icon": "mdi:compass",
+            "native_unit_of_measurement": DEGREE,
+            "deadband": 5,
+            "deadband_modulus": 360,
+        },
+    ),
+    "wind_gust": ("Wind Gust", _WIND_SPEED, {"icon": "mdi:weather-windy"}),
+    "beaufort": (
+        "Beaufort",
+        _MEASUREMENT,
+        {"icon": "mdi:windsock", "native_unit_of_measurement": "Bft"},
+    ),
+    "solar_radiation": (
+        "Solar Radiation",
+        _MEASUREMENT,
+        {
+            "icon": "mdi:solar-power",
+            "device_class": SensorDeviceClass.IRRADIANCE,
+            "native_unit_of_measurement": UnitOfIrradiance.WATTS_PER_SQUARE_METER,
+            "deadband": 2,
+            "deadband_relative": 0.02,
+        },
+    ),
+    "uv": (
+        "UV Index",
+        _MEASUREMENT,
+        {"icon": "mdi:weather-sunny-alert", "native_unit_of_measurement": UV_INDEX},
+    ),
+    "lightning_strike_last_epoch": (
+        "Last Lightning Strike",
+        {"device_class": SensorDeviceClass.TIMESTAMP},
+    ),
+    "lightning_strike_last_distance": (
+        "Last Lightning Strike Distance",
+        _MEASUREMENT,
+        {"icon": "mdi:map-marker-distance", "unit_type": "distance"},
+    ),
+    "lightning_strike_count": (
+        "Lightning Strike Count",
+        _MEASUREMENT,
+        {"icon": "mdi:weather-lightning"},
+    ),
+    "feels_like": ("Feels Like Temperature", _TEMPERATURE),
+    "heat_index": ("Heat Index", _TEMPERATURE),
+    "wind_chill": ("Wind Chill", _TEMPERATURE),
+    "dew_point": ("Dewpoint", _TEMPERATURE),
+    "visibility": (
+        "Visibility",
+        _MEASUREMENT,
+        {
+            "icon": "mdi:eye",
+            "device_class": SensorDeviceClass.DISTANCE,
+            "unit_type": "distance",
+        },
+    ),
+    "temperature_trend": ("Temperature Trend", _TREND),
+    "pressure_trend": ("Pressure Trend", _TREND),
+    "uv_description": (
+        "UV Description",
+        {
+            "icon": "mdi:weather-sunny-alert",
+            "translation_key": TRANSLATION_KEY_UV_DESCRIPTION,
+        },
+    ),
+    "wind_cardinal": (
+        "Wind Cardinal",
+        {"icon": "mdi:compass", "translation_key": TRANSLATION_KEY_WIND_CARDINAL},
+    ),
+    "beaufort_description": (
+        "Beaufort Description",
+        {"icon": "mdi:windsock", "translation_key": TRANSLATION_KEY_BEAUFORT},
+    ),
+    "air_pm_10": (
+        "Air Quality PM10",
+        _PARTICULATE,
+        {"device_class": SensorDeviceClass.PM10},
+    ),
+    "air_pm_25": (
+        "Air Quality PM2.5",
+        _PARTICULATE,
+        {"device_class": SensorDeviceClass.PM25},
+    ),
+    "aqi": (
+        "Air Quality",
+        _AIR_QUALITY,
+        _SLOW,
+        {
+            "device_class": "meteobridge__",
+            "translation_key": TRANSLATION_KEY_AQI_DESCRIPTION,
+        },
+    ),
+    "aqi_level": (
+        "Air Quality Index",
+        _AIR_QUALITY,
+        _SLOW,
+        {"device_class": SensorDeviceClass.AQI},
+    ),
+    "air_pm_1": (
+        "Air Quality PM1",
+        _PARTICULATE,
+        {"device_class": SensorDeviceClass.PM1},
+    ),
+    "forecast": ("Station Forecast", _SLOW, {"icon": "mdi:crystal-ball"}),
+    "indoor_temperature": ("Indoor Temperature", _TEMPERATURE),
+    "indoor_humidity": ("Indoor Humidity", _HUMIDITY),
+    "air_density": (
+        "Air Density",
+        _MEASUREMENT,
+        {"icon": "mdi:weight", "unit_type": "density", "deadband_relative": 0.01},
+    ),
+    "wet_bulb": ("Wet Bulb Temperature", _TEMPERATURE),
+    "air_temperature_dmin": (
+        "Air Temperature Day Min",
+        _TEMPERATURE,
+        {"attribute_field": "air_temperature_dmintime"},
+    ),
+    "air_temperature_dmax": (
+        "Air Temperature Day Max",
+        _TEMPERATURE,
+        {"attribute_field": "air_temperature_dmaxtime"},
+    ),
+    "air_temperature_mmin": (
+        "Air Temperature Month Min",
+        _TEMPERATURE,
+        _SLOW,
+        {"attribute_field": "air_temperature_mmintime"},
+    ),
+    "air_temperature_mmax": (
+        "Air Temperature Month Max",
+        _TEMPERATURE,
+        _SLOW,
+        {"attribute_field": "air_temperature_mmaxtime"},
+    ),
+    "air_temperature_ymin": (
+        "Air Temperature Year Min",
+        _TEMPERATURE,
+        _SLOW,
+        {"attribute_field": "air_temperature_ymintime"},
+    ),
+    "air_temperature_ymax": (
+        "Air Temperature Year Max",
+        _TEMPERATURE,
+        _SLOW,
+        {"attribute_field": "air_temperature_ymaxtime"},
+    ),
+    **_CHANNEL_TABLE,
+}
+
+
+@cache
+def sensor_description(key: str) -> MeteobridgeSensorEntityDescription:
+    """Return the description of a sensor, shared by all entries."""
+    name, *arguments = SENSOR_TABLE[key]
+    return MeteobridgeSensorEntityDescription(
+        key=key, name=name, **ChainMap(*reversed(arguments))
+    )
+
+
+def sensor_descriptions(
+    keys: Iterable[str] | None = None,
+) -> list[MeteobridgeSensorEntityDescription]:
+    """Return the descriptions of the sensors in keys, or of all sensors."""
+    keys = SENSOR_TABLE.keys() if keys is None else set(keys)
+    return [sensor_description(key) for key in SENSOR_TABLE if key in keys]
+
+
+POLL_INTERVAL_DESCRIPTION = MeteobridgeSensorEntityDescription(
+    key="poll_interval",
+    name="Poll Interval",
+    icon="mdi:timer-sync-outline",
+    device_class=SensorDeviceClass.DURATION,
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    deadband=0,
+)
+
+REQUEST_LATENCY_DESCRIPTION = MeteobridgeSensorEntityDescription(
+    key="request_latency",
+    name="Request Latency",
+    icon="mdi:timer-outline",
+    device_class=SensorDeviceClass.DURATION,
+    native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    deadband=5,
+    deadband_relative=0.1,
+)
+
+MEASUREMENT_AGE_DESCRIPTION = MeteobridgeSensorEntityDescription(
+    key="measurement_age",
+    name="Measurement Age",
+    icon="mdi:clock-alert-outline",
+    device_class=SensorDeviceClass.DURATION,
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    entity_category=EntityCategory.DIAGNOSTIC,
+    entity_registry_enabled_default=False,
+    deadband=10,
+)
+
+DERIVED_SENSOR_TYPES: tuple[MeteobridgeSensorEntityDescription, ...] = (
     MeteobridgeSensorEntityDescription(
-        key="precip_accum_local_day",
-        name="Precipitation Today",
-        icon="mdi:weather-rainy",
-        device_class=SensorDeviceClass.PRECIPITATION,
+        key="wind_gust_max",
+        name="Wind Gust Max 10 minutes",
+        icon="mdi:weather-windy",
+        device_class=SensorDeviceClass.WIND_SPEED,
         state_class=SensorStateClass.MEASUREMENT,
-        unit_type="precipitation",
-        always_add=True,
-        attribute_field=None,
+        unit_type="length",
+        deadband=0,
     ),
     MeteobridgeSensorEntityDescription(
-        key="precip_accum_last24h",
-        name="Precipitation Last 24 hours",
+        key="rain_last_hour",
+        name="Precipitation Last Hour",
         icon="mdi:weather-rainy",
         device_class=SensorDeviceClass.PRECIPITATION,
         state_class=SensorStateClass.MEASUREMENT,
         unit_type="precipitation",
-        always_add=True,
-        attribute_field=None,
+        deadband=0,
     ),
     MeteobridgeSensorEntityDescription(
-        key="precip_accum_month",
-        name="Precipitation Current Month",
-        icon="mdi:weather-rainy",
-        device_class=SensorDeviceClass.PRECIPITATION,
-        unit_type="precipitation",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="precip_accum_year",
-        name="Precipitation Current Year",
-        icon="mdi:weather-rainy",
-        device_class=SensorDeviceClass.PRECIPITATION,
-        unit_type="precipitation",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="wind_avg",
-        name="Wind Speed",
-        icon="mdi:weather-windy-variant",
-        device_class=SensorDeviceClass.WIND_SPEED,
+        key="pressure_tendency",
+        name="Pressure Tendency 3 hours",
+        icon="mdi:gauge",
+        device_class=SensorDeviceClass.ATMOSPHERIC_PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
-        unit_type="length",
-        always_add=True,
-        attribute_field=None,
+        unit_type="pressure",
+        deadband=0,
     ),
     MeteobridgeSensorEntityDescription(
-        key="wind_direction",
-        name="Wind Direction",
+        key="wind_direction_mean",
+        name="Wind Direction Mean 10 minutes",
         icon="mdi:compass",
         native_unit_of_measurement=DEGREE,
         state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="wind_gust",
-        name="Wind Gust",
-        icon="mdi:weather-windy",
-        device_class=SensorDeviceClass.WIND_SPEED,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="length",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="beaufort",
-        name="Beaufort",
-        icon="mdi:windsock",
-        native_unit_of_measurement="Bft",
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="solar_radiation",
-        name="Solar Radiation",
-        icon="mdi:solar-power",
-        device_class=SensorDeviceClass.IRRADIANCE,
-        native_unit_of_measurement=UnitOfIrradiance.WATTS_PER_SQUARE_METER,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="uv",
-        name="UV Index",
-        icon="mdi:weather-sunny-alert",
-        native_unit_of_measurement=UV_INDEX,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="lightning_strike_last_epoch",
-        name="Last Lightning Strike",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="lightning_strike_last_distance",
-        name="Last Lightning Strike Distance",
-        icon="mdi:map-marker-distance",
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="distance",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="lightning_strike_count",
-        name="Lightning Strike Count",
-        icon="mdi:weather-lightning",
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="feels_like",
-        name="Feels Like Temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index",
-        name="Heat Index",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="wind_chill",
-        name="Wind Chill",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="dew_point",
-        name="Dewpoint",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="visibility",
-        name="Visibility",
-        icon="mdi:eye",
-        device_class=SensorDeviceClass.DISTANCE,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="distance",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_trend",
-        name="Temperature Trend",
-        icon="mdi:trending-up",
-        translation_key=TRANSLATION_KEY_TREND,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="pressure_trend",
-        name="Pressure Trend",
-        icon="mdi:trending-up",
-        translation_key=TRANSLATION_KEY_TREND,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="uv_description",
-        name="UV Description",
-        icon="mdi:weather-sunny-alert",
-        translation_key=TRANSLATION_KEY_UV_DESCRIPTION,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="wind_cardinal",
-        name="Wind Cardinal",
-        icon="mdi:compass",
-        translation_key=TRANSLATION_KEY_WIND_CARDINAL,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="beaufort_description",
-        name="Beaufort Description",
-        icon="mdi:windsock",
-        translation_key=TRANSLATION_KEY_BEAUFORT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_pm_10",
-        name="Air Quality PM10",
-        icon="mdi:air-filter",
-        device_class=SensorDeviceClass.PM10,
-        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_pm_25",
-        name="Air Quality PM2.5",
-        icon="mdi:air-filter",
-        device_class=SensorDeviceClass.PM25,
-        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="aqi",
-        name="Air Quality",
-        icon="mdi:air-filter",
-        device_class="meteobridge__",
-        translation_key=TRANSLATION_KEY_AQI_DESCRIPTION,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="aqi_level",
-        name="Air Quality Index",
-        icon="mdi:air-filter",
-        device_class=SensorDeviceClass.AQI,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_pm_1",
-        name="Air Quality PM1",
-        icon="mdi:air-filter",
-        device_class=SensorDeviceClass.PM1,
-        native_unit_of_measurement=CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="forecast",
-        name="Station Forecast",
-        icon="mdi:crystal-ball",
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="indoor_temperature",
-        name="Indoor Temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="indoor_humidity",
-        name="Indoor Humidity",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_density",
-        name="Air Density",
-        icon="mdi:weight",
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="density",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="wet_bulb",
-        name="Wet Bulb Temperature",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_dmin",
-        name="Air Temperature Day Min",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_dmintime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_dmax",
-        name="Air Temperature Day Max",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_dmaxtime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_mmin",
-        name="Air Temperature Month Min",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_mmintime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_mmax",
-        name="Air Temperature Month Max",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_mmaxtime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_ymin",
-        name="Air Temperature Year Min",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_ymintime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="air_temperature_ymax",
-        name="Air Temperature Year Max",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=True,
-        attribute_field="air_temperature_ymaxtime",
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_1",
-        name="Extra Temperature 1",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_1",
-        name="Extra Humidity 1",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_1",
-        name="Extra Heat Index 1",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_2",
-        name="Extra Temperature 2",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_2",
-        name="Extra Humidity 2",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_2",
-        name="Extra Heat Index 2",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_3",
-        name="Extra Temperature 3",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_3",
-        name="Extra Humidity 3",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_3",
-        name="Extra Heat Index 3",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_4",
-        name="Extra Temperature 4",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_4",
-        name="Extra Humidity 4",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_4",
-        name="Extra Heat Index 4",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_5",
-        name="Extra Temperature 5",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_5",
-        name="Extra Humidity 5",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_5",
-        name="Extra Heat Index 5",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_6",
-        name="Extra Temperature 6",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_6",
-        name="Extra Humidity 6",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_6",
-        name="Extra Heat Index 6",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_extra_7",
-        name="Extra Temperature 7",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="relative_humidity_extra_7",
-        name="Extra Humidity 7",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="heat_index_extra_7",
-        name="Extra Heat Index 7",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_leaf_1",
-        name="Leaf Temperature 1",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_leaf_1",
-        name="Leaf Humidity 1",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_leaf_2",
-        name="Leaf Temperature 2",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_leaf_2",
-        name="Leaf Humidity 2",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_leaf_3",
-        name="Leaf Temperature 3",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_leaf_3",
-        name="Leaf Humidity 3",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_leaf_4",
-        name="Leaf Temperature 4",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_leaf_4",
-        name="Leaf Humidity 4",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_soil_1",
-        name="Soil Temperature 1",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_soil_1",
-        name="Soil Humidity 1",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_soil_2",
-        name="Soil Temperature 2",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_soil_2",
-        name="Soil Humidity 2",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_soil_3",
-        name="Soil Temperature 3",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_soil_3",
-        name="Soil Humidity 3",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="temperature_soil_4",
-        name="Soil Temperature 4",
-        device_class=SensorDeviceClass.TEMPERATURE,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
-    ),
-    MeteobridgeSensorEntityDescription(
-        key="humidity_soil_4",
-        name="Soil Humidity 4",
-        native_unit_of_measurement="%",
-        device_class=SensorDeviceClass.HUMIDITY,
-        state_class=SensorStateClass.MEASUREMENT,
-        unit_type="none",
-        always_add=False,
-        attribute_field=None,
+        deadband=5,
+        deadband_modulus=360,
     ),
 )
 
@@ -860,11 +411,11 @@ async def async_setup_entry(
     device_data = entry_data.device_data
     unit_descriptions = entry_data.unit_descriptions
 
-    entities = []
-    for description in SENSOR_TYPES:
-        if description.always_add or (
-            getattr(coordinator.data, description.key) is not None
-        ):
+    @callback
+    def _async_add_sensors(keys: set[str]) -> None:
+        """Add sensors for observation fields the logger reports."""
+        entities = []
+        for description in sensor_descriptions(keys):
             entities.append(
                 MeteobridgeSensor(
                     meteobridgeapi,
@@ -880,11 +431,69 @@ async def async_setup_entry(
                 "Adding sensor entity %s",
                 description.name,
             )
+        async_add_entities(entities)
+
+    _async_add_sensors(entry_data.capabilities)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_NEW_CAPABILITIES.format(entry.entry_id), _async_add_sensors
+        )
+    )
+
+    if entry_data.scheduler is not None:
+        async_add_entities(
+            [
+                MeteobridgePollIntervalSensor(
+                    meteobridgeapi,
+                    coordinator,
+                    device_data,
+                    POLL_INTERVAL_DESCRIPTION,
+                    entry,
+                    unit_descriptions,
+                    entry_data.scheduler,
+                )
+            ]
+        )
+
+    diagnostic_sensors = [
+        MeteobridgeMeasurementAgeSensor(
+            meteobridgeapi,
+            coordinator,
+            device_data,
+            MEASUREMENT_AGE_DESCRIPTION,
+            entry,
+            unit_descriptions,
+        )
+    ]
+    if isinstance(meteobridgeapi, MeteobridgePollClient):
+        diagnostic_sensors.append(
+            MeteobridgeRequestLatencySensor(
+                meteobridgeapi,
+                coordinator,
+                device_data,
+                REQUEST_LATENCY_DESCRIPTION,
+                entry,
+                unit_descriptions,
+            )
+        )
+    async_add_entities(diagnostic_sensors)
 
-    async_add_entities(entities)
+    if entry_data.derived is not None:
+        async_add_entities(
+            MeteobridgeDerivedSensor(
+                meteobridgeapi,
+                coordinator,
+                device_data,
+                description,
+                entry,
+                unit_descriptions,
+                entry_data.derived,
+            )
+            for description in DERIVED_SENSOR_TYPES
+        )
 
 
-class MeteobridgeSensor(MeteobridgeEntity, SensorEntity):
+class MeteobridgeSensor(MeteobridgeEntity, RestoreSensor):
     """Implementation of a Meteobridge Sensor."""
 
     def __init__(
@@ -910,24 +519,153 @@ class MeteobridgeSensor(MeteobridgeEntity, SensorEntity):
                 self.entity_description.unit_type
             ]
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the cached state from the latest coordinator data."""
+        self._attr_native_value = self._current_value()
+        if self._attribute_slot is not None:
+            self._attr_extra_state_attributes = {
+                ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION,
+                ATTR_MEASSURE_TIME: self._current_attribute(),
+            }
+
+    async def _async_restore_state(self) -> bool:
+        """Restore the last value and measurement time of the previous run."""
+        last_sensor_data = await self.async_get_last_sensor_data()
+        # A value in another unit, after the unit system changed, is dropped.
+        if (
+            last_sensor_data is None
+            or last_sensor_data.native_value is None
+            or last_sensor_data.native_unit_of_measurement
+            != self.native_unit_of_measurement
+        ):
+            return False
+        self._attr_native_value = last_sensor_data.native_value
+        if self._attribute_slot is not None and (
+            last_state := await self.async_get_last_state()
+        ):
+            self._attr_extra_state_attributes = {
+                ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION,
+                ATTR_MEASSURE_TIME: last_state.attributes.get(ATTR_MEASSURE_TIME),
+            }
+        return True
+
+
+class MeteobridgePollIntervalSensor(MeteobridgeSensor):
+    """Diagnostic sensor showing the current adaptive poll interval."""
+
+    _uses_observation = False
+
+    def __init__(
+        self,
+        meteobridgeapi,
+        coordinator,
+        device_data,
+        description,
+        entries: ConfigEntry,
+        unit_descriptions,
+        scheduler: AdaptivePollScheduler,
+    ):
+        """Initialize the poll interval sensor."""
+        super().__init__(
+            meteobridgeapi,
+            coordinator,
+            device_data,
+            description,
+            entries,
+            unit_descriptions,
+        )
+        self.scheduler = scheduler
+        self._async_update_attrs()
+
+    def _current_value(self) -> float:
+        """Return the current poll interval."""
+        return round(self.scheduler.interval, 1)
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state from the scheduler."""
+        if getattr(self, "scheduler", None) is None:
+            return
+        self._attr_native_value = self._current_value()
+        self._attr_extra_state_attributes = {
+            ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION,
+            **self.scheduler.as_dict(),
+        }
+
+
+class MeteobridgeRequestLatencySensor(MeteobridgeSensor):
+    """Diagnostic sensor showing how long observation requests take."""
+
+    _uses_observation = False
+
+    def _current_value(self) -> float | None:
+        """Return the 90th percentile of the request timings."""
+        return self.meteobridgeapi.request_time.percentile(90)
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state from the request timings of the client."""
+        request_time = self.meteobridgeapi.request_time
+        self._attr_native_value = self._current_value()
+        self._attr_extra_state_attributes = {
+            ATTR_ATTRIBUTION: DEFAULT_ATTRIBUTION,
+            "p50": request_time.percentile(50),
+            "p99": request_time.percentile(99),
+            "requests": request_time.count,
+            "last_response_bytes": self.meteobridgeapi.last_response_bytes,
+        }
+
+
+class MeteobridgeMeasurementAgeSensor(MeteobridgeSensor):
+    """Diagnostic sensor showing the age of the newest measurement."""
+
+    _uses_observation = False
+
+    def _current_value(self) -> float | None:
+        """Return the age of the measurement in the latest data."""
+        return measurement_age(self.coordinator.data, dt_util.utcnow())
 
-        return (
-            getattr(self.coordinator.data, self.entity_description.key)
-            if self.coordinator.data
-            else None
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state from the measurement time of the latest data."""
+        self._attr_native_value = self._current_value()
+
+
+class MeteobridgeDerivedSensor(MeteobridgeSensor):
+    """Sensor showing a sliding window value derived from the observations."""
+
+    _uses_observation = False
+
+    def __init__(
+        self,
+        meteobridgeapi,
+        coordinator,
+        device_data,
+        description,
+        entries: ConfigEntry,
+        unit_descriptions,
+        derived: MeteobridgeDerivedValues,
+    ):
+        """Initialize the derived sensor."""
+        super().__init__(
+            meteobridgeapi,
+            coordinator,
+            device_data,
+            description,
+            entries,
+            unit_descriptions,
         )
+        self.derived = derived
+        self._async_update_attrs()
 
-    @property
-    def extra_state_attributes(self):
-        """Return the sensor state attributes."""
-        if self.entity_description.attribute_field is not None:
-            return {
-                **super().extra_state_attributes,
-                ATTR_MEASSURE_TIME: getattr(
-                    self.coordinator.data, self.entity_description.attribute_field
-                ),
-            }
-        return super().extra_state_attributes
+    def _current_value(self) -> float | None:
+        """Return the current derived value."""
+        return self.derived.value(self.entity_description.key)
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Update the state from the derived values."""
+        if getattr(self, "derived", None) is None:
+            return
+        self._attr_native_value = self._current_value()
@@ -0,0 +1,108 @@
+"""Shared HTTP sessions for Meteobridge loggers.
+
+Every logger host gets one keep-alive session with a small connection pool.
+The session is shared by all config entries and config flows talking to that
+host. When the last user releases it, it is closed after a short delay, so a
+reload picks up the same open connection instead of making a new one.
+"""
+from __future__ import annotations
+
+import logging
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DATA_SESSIONS,
+    SESSION_CLOSE_DELAY,
+    SESSION_CONNECTIONS_PER_HOST,
+    SESSION_KEEPALIVE_TIMEOUT,
+    SESSION_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MeteobridgeSessionPool:
+    """Keep-alive HTTP sessions, one per logger host."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the pool."""
+        self.hass = hass
+        self._sessions: dict[str, ClientSession] = {}
+        self._users: dict[str, set[str]] = {}
+        self._pending_close: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_acquire(self, host: str, user: str) -> ClientSession:
+        """Return the session for host, creating it if needed."""
+        if cancel := self._pending_close.pop(host, None):
+            cancel()
+
+        session = self._sessions.get(host)
+        if session is None or session.closed:
+            session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=SESSION_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+                ),
+                timeout=ClientTimeout(total=SESSION_TIMEOUT),
+                headers={"User-Agent": SERVER_SOFTWARE},
+            )
+            self._sessions[host] = session
+            _LOGGER.debug("Opened HTTP session for %s", host)
+
+        self._users.setdefault(host, set()).add(user)
+        return session
+
+    @callback
+    def async_release(self, host: str, user: str) -> None:
+        """Release the session for host, closing it when no one else uses it."""
+        users = self._users.get(host)
+        if users is None:
+            return
+        users.discard(user)
+        if users or host in self._pending_close:
+            return
+
+        @callback
+        def _async_close_later(_now) -> None:
+            self._pending_close.pop(host, None)
+            if not self._users.get(host):
+                self.hass.async_create_task(self._async_close(host))
+
+        self._pending_close[host] = async_call_later(
+            self.hass, SESSION_CLOSE_DELAY, _async_close_later
+        )
+
+    def in_use(self, host: str) -> bool:
+        """Return True if a session for host is open."""
+        session = self._sessions.get(host)
+        return session is not None and not session.closed
+
+    async def _async_close(self, host: str) -> None:
+        """Close the session for host."""
+        self._users.pop(host, None)
+        if session := self._sessions.pop(host, None):
+            await session.close()
+            _LOGGER.debug("Closed HTTP session for %s", host)
+
+    async def async_close_all(self, _event: Event | None = None) -> None:
+        """Close all sessions."""
+        for cancel in self._pending_close.values():
+            cancel()
+        self._pending_close.clear()
+        for host in list(self._sessions):
+            await self._async_close(host)
+
+
+@callback
+def async_get_session_pool(hass: HomeAssistant) -> MeteobridgeSessionPool:
+    """Return the session pool, creating it on first use."""
+    if (pool := hass.data.get(DATA_SESSIONS)) is None:
+        pool = hass.data[DATA_SESSIONS] = MeteobridgeSessionPool(hass)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, pool.async_close_all)
+    return pool
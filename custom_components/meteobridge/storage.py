@@ -0,0 +1,103 @@
+"""Persisted logger metadata for Meteobridge.
+
+The station description and the observation fields a logger has reported
+(its capabilities) are saved once known, and again when new fields appear.
+On the next start the entry is set up from this cache, and the logger is
+contacted in the background, so a slow or unreachable logger does not hold
+up Home Assistant.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from pymeteobridgedata.data import DataLoggerDescription, ObservationDescription
+
+from .const import DATA_STORE, STORAGE_KEY, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+
+@dataclasses.dataclass
+class CachedLogger:
+    """Metadata of a logger, as last saved."""
+
+    device_data: DataLoggerDescription
+    capabilities: frozenset[str]
+
+
+def available_keys(data: ObservationDescription | None) -> frozenset[str]:
+    """Return the observation fields that have a value."""
+    if data is None:
+        return frozenset()
+    return frozenset(
+        field.name
+        for field in dataclasses.fields(data)
+        if getattr(data, field.name) is not None
+    )
+
+
+class MeteobridgeMetadataStore:
+    """Logger metadata for all entries, keyed by the entry unique_id."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._loggers: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved metadata."""
+        if (stored := await self._store.async_load()) is not None:
+            self._loggers = stored.get("loggers", {})
+
+    @callback
+    def async_get(self, unique_id: str | None) -> CachedLogger | None:
+        """Return the cached metadata for a logger."""
+        if unique_id is None or (stored := self._loggers.get(unique_id)) is None:
+            return None
+        return CachedLogger(
+            device_data=DataLoggerDescription(**stored["device_data"]),
+            capabilities=frozenset(stored["capabilities"]),
+        )
+
+    @callback
+    def async_update(
+        self,
+        unique_id: str,
+        device_data: DataLoggerDescription,
+        capabilities: set[str] | frozenset[str],
+    ) -> None:
+        """Save the metadata of a logger, if it changed."""
+        stored = {
+            "device_data": dataclasses.asdict(device_data),
+            "capabilities": sorted(capabilities),
+        }
+        if self._loggers.get(unique_id) != stored:
+            self._loggers[unique_id] = stored
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, unique_id: str | None) -> None:
+        """Forget a logger."""
+        if self._loggers.pop(unique_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"loggers": self._loggers}
+
+
+async def async_get_metadata_store(hass: HomeAssistant) -> MeteobridgeMetadataStore:
+    """Return the loaded metadata store, loading it on first use."""
+    if (loading := hass.data.get(DATA_STORE)) is None:
+        loading = hass.data[DATA_STORE] = hass.async_create_task(
+            _async_load_store(hass)
+        )
+    return await asyncio.shield(loading)
+
+
+async def _async_load_store(hass: HomeAssistant) -> MeteobridgeMetadataStore:
+    store = MeteobridgeMetadataStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,23 @@
+"""Common helpers for the Meteobridge integration tests.
+
+The logger payloads and the Home Assistant instance are shared with the
+benchmarks, which must not depend on the tests.
+"""
+from benchmarks.harness import async_test_home_assistant, mock_config_entry
+from benchmarks.payloads import (
+    OBSERVATION_VALUES,
+    STATION_VALUES,
+    MockMeteobridge,
+    observation_payload,
+    station_payload,
+)
+
+__all__ = [
+    "OBSERVATION_VALUES",
+    "STATION_VALUES",
+    "MockMeteobridge",
+    "async_test_home_assistant",
+    "mock_config_entry",
+    "observation_payload",
+    "station_payload",
+]
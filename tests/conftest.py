@@ -0,0 +1,79 @@
+"""Fixtures for the Meteobridge integration tests."""
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Home Assistant loads http before webhook; importing webhook on its own
+# runs into a circular import.
+import homeassistant.components.persistent_notification  # noqa: F401
+import pytest
+from pymeteobridgedata import MeteobridgeApiClient
+
+from custom_components.meteobridge.coordinator import (
+    MeteobridgeDataUpdateCoordinator,
+)
+from custom_components.meteobridge.push import MeteobridgePushClient
+
+from .common import MockMeteobridge, async_test_home_assistant, station_payload
+
+
+@pytest.fixture
+def device_data():
+    """Return a minimal DataLoggerDescription stand-in."""
+    return SimpleNamespace(
+        key="00:11:22:33:44:55",
+        ip="192.168.1.10",
+        station="Davis Vantage Pro2",
+        platform="Meteobridge Pro",
+        swversion=5.7,
+    )
+
+
+@pytest.fixture
+def entry():
+    """Return a ConfigEntry stand-in."""
+    config_entry = MagicMock()
+    config_entry.unique_id = "00:11:22:33:44:55"
+    config_entry.entry_id = "entry_1"
+    return config_entry
+
+
+@pytest.fixture
+def coordinator():
+    """Return a coordinator holding observation data, without a running hass."""
+    data_coordinator = MeteobridgeDataUpdateCoordinator(
+        MagicMock(), logging.getLogger(__name__), name="meteobridge"
+    )
+    data_coordinator.data = SimpleNamespace()
+    return data_coordinator
+
+
+@pytest.fixture
+async def push_client(device_data):
+    """Return a push client that has been initialized from a station payload."""
+    client = MeteobridgePushClient(
+        "meteobridge", "secret", device_data.ip, extra_sensors=2
+    )
+    with patch.object(
+        MeteobridgeApiClient, "_async_request", AsyncMock(return_value=station_payload())
+    ):
+        await client.initialize()
+    yield client
+    await client.req.close()
+
+
+@pytest.fixture
+async def hass():
+    """Return a running Home Assistant instance."""
+    async with async_test_home_assistant() as hass:
+        yield hass
+
+
+@pytest.fixture
+def meteobridge():
+    """Patch all logger requests to a mock Meteobridge."""
+    mock = MockMeteobridge()
+    with patch.object(MeteobridgeApiClient, "_async_request", mock.async_request):
+        yield mock
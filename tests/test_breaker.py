@@ -0,0 +1,145 @@
+"""Tests for the circuit breaker of unreachable loggers."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from pymeteobridgedata import BadRequest
+
+from custom_components.meteobridge.breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    request_deadline,
+)
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .common import mock_config_entry
+
+MONOTONIC = "custom_components.meteobridge.breaker.time.monotonic"
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    return CircuitBreaker("test", 5, jitter=0, **kwargs)
+
+
+def test_request_deadline():
+    """A poll must end well before the next one, within sensible bounds."""
+    assert request_deadline(10) == 5
+    assert request_deadline(60) == 10
+    assert request_deadline(4) == 3
+
+
+def test_opens_after_consecutive_failures():
+    """The circuit opens after the threshold, and a success resets the count."""
+    breaker = _breaker(failure_threshold=3)
+    breaker.record_failure(BadRequest("down"))
+    breaker.record_failure(BadRequest("down"))
+    breaker.record_success()
+    breaker.record_failure(BadRequest("down"))
+    breaker.record_failure(BadRequest("down"))
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure(BadRequest("down"))
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+    assert breaker.last_error == "BadRequest: down"
+
+
+def test_backoff_doubles_up_to_maximum():
+    """Every failed probe doubles the backoff, up to the maximum."""
+    breaker = _breaker(failure_threshold=1, base_backoff=30, max_backoff=100)
+    backoffs = []
+    with patch(MONOTONIC) as monotonic:
+        monotonic.return_value = 0.0
+        for _ in range(4):
+            breaker.record_failure(TimeoutError())
+            backoffs.append(breaker.backoff)
+            monotonic.return_value += breaker.backoff
+            assert breaker.allow_request()
+            assert breaker.state == STATE_HALF_OPEN
+
+    assert backoffs == [30, 60, 100, 100]
+    assert breaker.probes == 4
+
+
+def test_jitter_stays_within_bounds():
+    """Jitter spreads the backoff around its nominal value."""
+    backoffs = set()
+    for _ in range(20):
+        breaker = CircuitBreaker("test", 5, failure_threshold=1, jitter=0.2)
+        breaker.record_failure(TimeoutError())
+        backoffs.add(breaker.backoff)
+    assert all(24 <= backoff <= 36 for backoff in backoffs)
+    assert len(backoffs) > 1
+
+
+def test_successful_probe_closes():
+    """A successful probe closes the circuit and resets the backoff."""
+    breaker = _breaker(failure_threshold=1)
+    with patch(MONOTONIC) as monotonic:
+        monotonic.return_value = 0.0
+        breaker.record_failure(TimeoutError())
+        monotonic.return_value = 100.0
+        assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.trips == 0
+
+
+async def test_unreachable_logger_left_alone(hass, meteobridge):
+    """After repeated failures polls back off, then a probe brings it back."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data.coordinator
+    breaker = entry_data.breaker
+
+    meteobridge.error = BadRequest("Connection refused")
+    for _ in range(3):
+        await coordinator.async_refresh()
+    assert breaker.state == STATE_OPEN
+    assert coordinator.update_interval < timedelta(seconds=60)
+    assert coordinator.update_interval >= timedelta(seconds=20)
+
+    meteobridge.requests.clear()
+    await coordinator.async_refresh()
+    assert meteobridge.requests == []
+    assert not coordinator.last_update_success
+
+    meteobridge.error = None
+    with patch(MONOTONIC, return_value=breaker._retry_at):
+        await coordinator.async_refresh()
+    assert meteobridge.requests[0].endswith(
+        "template=[epoch]&contenttype=text/plain;charset=iso-8859-1"
+    )
+    assert len(meteobridge.requests) == 2
+    assert coordinator.last_update_success
+    assert breaker.state == STATE_CLOSED
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["breaker"]["failures"] == 3
+    assert diagnostics["breaker"]["rejected"] == 1
+    assert diagnostics["entry"]["options"]["password"] == "**REDACTED**"
+
+
+async def test_slow_logger_times_out(hass, meteobridge):
+    """A poll that takes longer than the deadline fails."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    entry_data.breaker.deadline = 0.01
+
+    meteobridge.delay = 0.1
+    await entry_data.coordinator.async_refresh()
+
+    assert not entry_data.coordinator.last_update_success
+    assert entry_data.breaker.last_error.startswith("TimeoutError")
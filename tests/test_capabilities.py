@@ -0,0 +1,111 @@
+"""Tests for capability discovery and adding entities at runtime."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.meteobridge import sensor as sensor_module
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.sensor import CHANNEL_SENSOR_KEYS
+from custom_components.meteobridge.storage import async_get_metadata_store
+
+from .common import mock_config_entry
+
+DISTANCE_SENSOR = "sensor.meteobridge_last_lightning_strike_distance"
+
+
+async def _async_setup(hass):
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_fields_without_value_have_no_entity(hass, meteobridge):
+    """Fields the station does not report get no entity."""
+    await _async_setup(hass)
+    assert hass.states.get("sensor.meteobridge_air_temperature") is not None
+    assert hass.states.get(DISTANCE_SENSOR) is None
+    assert hass.states.get("sensor.meteobridge_air_quality_pm2_5") is None
+
+
+async def test_new_field_adds_entity(hass, meteobridge):
+    """A field that starts reporting gets an entity without a reload."""
+    entry = await _async_setup(hass)
+    meteobridge.observation["lightning_strike_last_distance"] = "12"
+
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get(DISTANCE_SENSOR).state == "12"
+    store = await async_get_metadata_store(hass)
+    assert "lightning_strike_last_distance" in store.async_get(
+        entry.unique_id
+    ).capabilities
+
+
+async def test_learned_fields_survive_restart(hass, meteobridge):
+    """Entities for learned fields are created at the next start."""
+    entry = await _async_setup(hass)
+    meteobridge.observation["lightning_strike_last_distance"] = "12"
+    await hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh()
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    meteobridge.observation.clear()
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(DISTANCE_SENSOR) is not None
+
+
+async def test_descriptions_only_for_reported_fields(hass, meteobridge):
+    """Channel sensor descriptions are only created for reported channels."""
+    with patch.object(
+        sensor_module, "sensor_description", wraps=sensor_module.sensor_description
+    ) as sensor_description:
+        entry = await _async_setup(hass)
+
+    created = {call.args[0] for call in sensor_description.call_args_list}
+    capabilities = hass.data[DOMAIN][entry.entry_id].capabilities
+    assert created & CHANNEL_SENSOR_KEYS <= capabilities
+    assert "temperature_soil_1" not in created
+    assert "air_temperature" in created
+
+
+async def test_entities_share_device_info(hass, meteobridge):
+    """All entities of an entry share one DeviceInfo."""
+    entry = await _async_setup(hass)
+    component = hass.data["sensor"]
+    temperature = component.get_entity("sensor.meteobridge_air_temperature")
+    humidity = component.get_entity("sensor.meteobridge_relative_humidity")
+    assert temperature.device_info is humidity.device_info
+    assert temperature.device_info is hass.data[DOMAIN][entry.entry_id].device_info
+
+
+async def test_unreported_entities_removed_after_upgrade(hass, meteobridge):
+    """Entities an earlier version created for unreported fields are removed."""
+    entity_registry = er.async_get(hass)
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # An entity of the time before capabilities, and a saved store lost.
+    orphan = entity_registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"lightning_strike_last_distance_{entry.unique_id}",
+        config_entry=entry,
+    )
+    store = await async_get_metadata_store(hass)
+    store.async_remove(entry.unique_id)
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entity_registry.async_get(orphan.entity_id) is None
+    assert entity_registry.async_get("sensor.meteobridge_air_temperature")
@@ -0,0 +1,289 @@
+"""Tests for the observation requests of the poll client."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from pymeteobridgedata import BadRequest, MeteobridgeApiClient
+
+from custom_components.meteobridge.binary_sensor import BINARY_SENSOR_TYPES
+from custom_components.meteobridge.client import (
+    MeteobridgePollClient,
+    needed_fields,
+    slow_tier_fields,
+)
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.sensor import sensor_descriptions
+
+from .common import mock_config_entry
+
+MONTH_TAG = "[rain0total-monthsum:None]"
+WIND_TAG = "[wind0wind-max1:None]"
+INDOOR_TAG = "[thb0temp-act:None]"
+INDOOR_TEMPERATURE = "sensor.meteobridge_indoor_temperature"
+
+
+class SlowLogger:
+    """Answers requests after the given delays, counting concurrent requests."""
+
+    def __init__(self, meteobridge, delays, errors=()) -> None:
+        """Initialize with a delay, and optionally an error, per request."""
+        self.meteobridge = meteobridge
+        self.delays = list(delays)
+        self.errors = list(errors)
+        self.running = 0
+        self.max_running = 0
+
+    async def async_request(self, method, endpoint):
+        """Answer the next request after its delay."""
+        delay = self.delays.pop(0)
+        error = self.errors.pop(0) if self.errors else None
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(delay)
+            if error is not None:
+                raise error
+            return await self.meteobridge.async_request(method, endpoint)
+        finally:
+            self.running -= 1
+
+
+@pytest.fixture
+async def client(meteobridge):
+    """Return an initialized poll client with the default slow tier."""
+    meteobridgeapi = MeteobridgePollClient(
+        "meteobridge",
+        "secret",
+        "192.168.1.10",
+        slow_fields=slow_tier_fields([*sensor_descriptions(), *BINARY_SENSOR_TYPES]),
+        slow_interval=300,
+    )
+    await meteobridgeapi.initialize()
+    meteobridge.requests.clear()
+    yield meteobridgeapi
+    await meteobridgeapi.req.close()
+
+
+def test_slow_tier_fields():
+    """Fields are slow only if no fast tier description reads them."""
+    slow = slow_tier_fields([*sensor_descriptions(), *BINARY_SENSOR_TYPES])
+
+    assert {
+        "precip_accum_month",
+        "precip_accum_year",
+        "forecast",
+        "air_pm_25_havg",
+        "air_temperature_ymin",
+        "air_temperature_ymintime",
+        "wind_sensor_lowbat",
+    } <= slow
+    assert "wind_gust" not in slow
+    assert "air_temperature_dmax" not in slow
+    assert "air_temperature_dmaxtime" not in slow
+
+
+async def test_slow_fields_requested_every_slow_interval(client, meteobridge):
+    """Between slow refreshes only fast fields are requested."""
+    with patch("custom_components.meteobridge.client.time.monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        first = await client.update_observations()
+        meteobridge.observation = {"precip_accum_month": "50.0", "wind_gust": "7.5"}
+
+        monotonic.return_value = 1100.0
+        second = await client.update_observations()
+        assert MONTH_TAG in meteobridge.requests[0]
+        assert MONTH_TAG not in meteobridge.requests[1]
+        assert WIND_TAG in meteobridge.requests[1]
+        assert len(meteobridge.requests[1]) < len(meteobridge.requests[0])
+        assert second.wind_gust != first.wind_gust
+        assert second.precip_accum_month == first.precip_accum_month
+        assert second.forecast == first.forecast
+
+        monotonic.return_value = 1300.0
+        third = await client.update_observations()
+        assert MONTH_TAG in meteobridge.requests[2]
+        assert third.precip_accum_month == 50.0
+
+    assert client.as_dict()["observation_requests"] == 3
+
+
+async def test_entry_polls_with_tiers(hass, meteobridge):
+    """A polled entry requests the slow tier fields only on the first poll."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+
+    meteobridge.requests.clear()
+    await coordinator.async_refresh()
+
+    assert MONTH_TAG not in meteobridge.requests[-1]
+    state = hass.states.get("sensor.meteobridge_precipitation_current_month")
+    assert float(state.state) == 45.6
+
+
+def test_needed_fields_follow_enabled_descriptions():
+    """Disabled descriptions drop fields no enabled description reads."""
+    descriptions = [*sensor_descriptions(), *BINARY_SENSOR_TYPES]
+    fields = needed_fields(
+        descriptions, {"indoor_temperature", "feels_like", "air_temperature_dmax"}
+    )
+
+    assert "indoor_temperature" not in fields
+    assert "air_temperature_dmax" not in fields
+    assert "air_temperature_dmaxtime" not in fields
+    # Still read by the other calculated fields.
+    assert {"wind_gust", "air_temperature", "utc_time"} <= fields
+    assert "indoor_temperature" in needed_fields(
+        descriptions, {"indoor_temperature"}, required=("indoor_temperature",)
+    )
+
+
+async def test_only_needed_fields_requested(client, meteobridge):
+    """Fields not needed are not requested and decode as None."""
+    client.set_needed_fields({"utc_time", "air_temperature", "precip_accum_month"})
+    meteobridge.observation = {"precip_accum_month": "50.0"}
+    data = await client.update_observations()
+
+    assert meteobridge.requests[-1].count("[") == 3
+    assert data.air_temperature == 12.3
+    assert data.precip_accum_month == 50.0
+    assert data.indoor_temperature is None
+
+    client.set_needed_fields({"utc_time", "air_temperature", "indoor_temperature"})
+    data = await client.update_observations()
+    assert MONTH_TAG not in meteobridge.requests[-1]
+    assert data.indoor_temperature == 21.5
+    assert data.precip_accum_month is None
+
+
+async def test_extra_sensor_fields_needed(meteobridge):
+    """The extra sensor request only has the channels in use."""
+    meteobridge.extra_sensors = 2
+    meteobridgeapi = MeteobridgePollClient(
+        "meteobridge", "secret", "192.168.1.10", extra_sensors=2
+    )
+    await meteobridgeapi.initialize()
+    meteobridgeapi.set_needed_fields(
+        needed_fields(sensor_descriptions(), set()) - {"temperature_extra_2"}
+    )
+    data = await meteobridgeapi.update_observations()
+    await meteobridgeapi.req.close()
+
+    assert "[th2temp-act:None]" not in meteobridge.requests[-1]
+    assert "[th2hum-act.0:None]" in meteobridge.requests[-1]
+    assert data.temperature_extra_1 == 11.5
+    assert data.temperature_extra_2 is None
+
+
+async def test_disabling_entity_narrows_request(hass, meteobridge):
+    """Disabling and enabling an entity rebuilds the request."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    entity_registry = er.async_get(hass)
+
+    entity_registry.async_update_entity(
+        INDOOR_TEMPERATURE, disabled_by=er.RegistryEntryDisabler.USER
+    )
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert INDOOR_TAG not in meteobridge.requests[-1]
+
+    entity_registry.async_update_entity(INDOOR_TEMPERATURE, disabled_by=None)
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    assert INDOOR_TAG in meteobridge.requests[-1]
+
+
+async def test_other_entries_do_not_rebuild_request(hass, meteobridge):
+    """Entities added by another entry leave the request of an entry alone."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    meteobridgeapi = hass.data[DOMAIN][entry.entry_id].meteobridgeapi
+
+    meteobridge.station = {"mac": "00:11:22:33:44:66"}
+    with patch.object(meteobridgeapi, "set_needed_fields") as set_needed_fields:
+        other = mock_config_entry(host="192.168.1.11", unique_id="00:11:22:33:44:66")
+        await hass.config_entries.async_add(other)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.meteobridge_air_temperature_2") is not None
+    set_needed_fields.assert_not_called()
+
+
+@pytest.fixture
+def hedging_client(client):
+    """Return a client with hedging on and 20 fast requests measured."""
+    client.hedge = True
+    for _ in range(20):
+        client.request_time.add(0.001)
+    with patch("custom_components.meteobridge.client.HEDGE_MIN_DELAY", 0.01):
+        yield client
+
+
+async def test_hedged_request_uses_first_answer(hedging_client, meteobridge):
+    """A slow request gets a second request, the faster answer is used."""
+    logger = SlowLogger(meteobridge, [1, 0])
+    with patch.object(MeteobridgeApiClient, "_async_request", logger.async_request):
+        async with asyncio.timeout(0.5):
+            data = await hedging_client.update_observations()
+
+    assert data.air_temperature == 12.3
+    assert logger.max_running == 2
+    # The losing request has been cancelled and has finished.
+    assert logger.running == 0
+    assert hedging_client.as_dict()["hedging"] == {
+        "enabled": True,
+        "requests": 1,
+        "hedged": 1,
+        "hedge_wins": 1,
+        "hedge_rate": 1.0,
+    }
+
+
+async def test_fast_request_not_hedged(hedging_client, meteobridge):
+    """A request answered within the hedge delay is not repeated."""
+    logger = SlowLogger(meteobridge, [0])
+    with patch.object(MeteobridgeApiClient, "_async_request", logger.async_request):
+        await hedging_client.update_observations()
+
+    assert logger.max_running == 1
+    assert hedging_client.hedged_requests == 0
+
+
+async def test_hedged_request_error(hedging_client, meteobridge):
+    """The other answer is used if one fails, and an error only if both fail."""
+    logger = SlowLogger(meteobridge, [0.05, 0], [None, BadRequest("Reset")])
+    with patch.object(MeteobridgeApiClient, "_async_request", logger.async_request):
+        data = await hedging_client.update_observations()
+    assert data.air_temperature == 12.3
+    assert hedging_client.hedge_wins == 0
+
+    hedging_client.hedged_requests = 0
+    logger = SlowLogger(
+        meteobridge, [0.05, 0], [BadRequest("Timeout"), BadRequest("Reset")]
+    )
+    with patch.object(
+        MeteobridgeApiClient, "_async_request", logger.async_request
+    ), pytest.raises(BadRequest, match="Timeout"):
+        await hedging_client.update_observations()
+
+
+async def test_hedging_needs_samples_and_budget(client, meteobridge):
+    """Requests are not hedged without enough samples, or beyond the budget."""
+    client.hedge = True
+    assert client.hedge_delay() is None
+
+    for _ in range(20):
+        client.request_time.add(0.5)
+    client.hedgeable_requests = 20
+    assert client.hedge_delay() == 0.5
+
+    client.hedged_requests = 2
+    assert client.hedge_delay() is None
@@ -0,0 +1,74 @@
+"""Tests for the compiled observation codec."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from pymeteobridgedata import BadRequest, MeteobridgeApiClient
+from pymeteobridgedata.const import FIELDS_OBSERVATION
+from pymeteobridgedata.conversion import Conversions
+
+from custom_components.meteobridge.codec import ObservationCodec
+
+from .common import MockMeteobridge, observation_payload
+
+PAYLOADS = [
+    {},
+    {
+        "air_temperature": "-4",
+        "precip_rate": "2.4",
+        "wind_avg": "12.5",
+        "wind_gust": "18.1",
+        "air_pm_25_havg": "35.2",
+        "trend_pressure": "0",
+        "lightning_strike_last_epoch": "1699999000",
+    },
+    {"relative_humidity": "None", "forecast": "None", "dew_point": "None"},
+]
+
+
+async def _async_library_and_codec(payload, extra_sensors, **client_options):
+    """Decode a payload with the library parser and with the codec."""
+    logger = MockMeteobridge(extra_sensors)
+    logger.observation = payload
+    client = MeteobridgeApiClient(
+        "meteobridge",
+        "secret",
+        "192.168.1.10",
+        extra_sensors=extra_sensors,
+        **client_options,
+    )
+    with patch.object(MeteobridgeApiClient, "_async_request", logger.async_request):
+        await client.initialize()
+        expected = await client.update_observations()
+    await client.req.close()
+
+    items = observation_payload(extra_sensors, **payload).split(";")
+    split = len(FIELDS_OBSERVATION)
+    codec = ObservationCodec(client.cnv)
+    return expected, codec.decode(items[:split], items[split:], client.device_data)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+@pytest.mark.parametrize(
+    "client_options",
+    [{}, {"units": "imperial"}, {"units": "imperial", "homeassistant": False}],
+)
+async def test_codec_matches_library(payload, client_options):
+    """The codec decodes the same values as the library parser."""
+    expected, decoded = await _async_library_and_codec(payload, 2, **client_options)
+    assert decoded == expected
+
+
+def test_codec_rejects_wrong_field_count():
+    """A response with missing fields is rejected."""
+    codec = ObservationCodec(Conversions("metric", True))
+    with pytest.raises(BadRequest):
+        codec.decode(["1700000000", "12.3"], [], None)
+
+
+async def test_codec_rejects_invalid_number(push_client):
+    """A value that is not a number is rejected instead of raising."""
+    items = observation_payload(air_temperature="--").split(";")
+    with pytest.raises(BadRequest):
+        push_client.codec.decode(items, [], push_client.device_data)
@@ -0,0 +1,98 @@
+"""Tests for the Meteobridge config flow."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.config_entries import SOURCE_REAUTH, SOURCE_USER, ConfigEntryState
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.data_entry_flow import FlowResultType
+from pymeteobridgedata import BadRequest, NotAuthorized
+
+from custom_components.meteobridge.const import DATA_PROBES, DOMAIN
+
+from .common import STATION_VALUES, mock_config_entry
+
+USER_INPUT = {
+    CONF_HOST: STATION_VALUES["ip"],
+    CONF_USERNAME: "meteobridge",
+    CONF_PASSWORD: "secret",
+}
+
+
+async def _async_submit(hass):
+    return await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}, data=USER_INPUT
+    )
+
+
+async def test_flow_hands_station_to_setup(hass, meteobridge):
+    """The new entry is set up without requesting the station again."""
+    result = await _async_submit(hass)
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    entry = result["result"]
+    assert entry.unique_id == STATION_VALUES["mac"]
+    assert entry.state is ConfigEntryState.LOADED
+    station_requests = [url for url in meteobridge.requests if "mbsystem-mac" in url]
+    assert len(station_requests) == 1
+    assert not hass.data[DATA_PROBES]
+    assert hass.states.get("sensor.meteobridge_air_temperature").state == "12.3"
+
+
+async def test_flow_probe_timeout(hass, meteobridge):
+    """A logger that does not answer in time cannot be added."""
+    meteobridge.delay = 0.05
+    with patch("custom_components.meteobridge.config_flow.FLOW_PROBE_TIMEOUT", 0.01):
+        result = await _async_submit(hass)
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "host_not_found"}
+    assert not hass.config_entries.async_entries(DOMAIN)
+
+
+async def test_flow_errors(hass, meteobridge):
+    """Request errors are shown on the form."""
+    meteobridge.error = NotAuthorized("Wrong password")
+    result = await _async_submit(hass)
+    assert result["errors"] == {"base": "invalid_credentials"}
+
+    meteobridge.error = BadRequest("No route to host")
+    result = await _async_submit(hass)
+    assert result["errors"] == {"base": "host_not_found"}
+    assert DATA_PROBES not in hass.data
+
+
+async def _async_start_reauth(hass, entry):
+    return await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": SOURCE_REAUTH, "entry_id": entry.entry_id},
+        data=dict(entry.data),
+    )
+
+
+async def test_reauth_updates_credentials(hass, meteobridge):
+    """New credentials are validated and used by the loaded entry."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    result = await _async_start_reauth(hass, entry)
+    assert result["step_id"] == "reauth_confirm"
+
+    meteobridge.error = NotAuthorized("Wrong password")
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "meteobridge", CONF_PASSWORD: "wrong"}
+    )
+    assert result["errors"] == {"base": "invalid_credentials"}
+
+    meteobridge.error = None
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_USERNAME: "meteobridge", CONF_PASSWORD: "changed"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert entry.options[CONF_PASSWORD] == "changed"
+    assert hass.data[DOMAIN][entry.entry_id].meteobridgeapi.password == "changed"
@@ -0,0 +1,83 @@
+"""Tests for the changed-only dispatch in MeteobridgeDataUpdateCoordinator."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def calls(coordinator):
+    """Register listeners for wind, rain and everything, and record calls."""
+    called: list[str] = []
+    coordinator.data = SimpleNamespace(wind_speed=1.0, wind_gust=2.0, rain_rate=0.0)
+    for name, context in (
+        ("wind", frozenset({"wind_speed", "wind_gust"})),
+        ("rain", frozenset({"rain_rate"})),
+        ("all", None),
+    ):
+        for key in context or ():
+            coordinator.slot(key)
+        coordinator.async_add_listener(
+            lambda name=name: called.append(name), context
+        )
+    coordinator.async_update_listeners()
+    called.clear()
+    return called
+
+
+def test_slots_are_stable(coordinator):
+    """Each field gets one slot, in the order they are requested."""
+    coordinator.data = SimpleNamespace(wind_speed=1.0, rain_rate=0.5)
+    assert coordinator.slot("wind_speed") == 0
+    assert coordinator.slot("rain_rate") == 1
+    assert coordinator.slot("wind_speed") == 0
+    assert coordinator.snapshot == (1.0, 0.5)
+
+
+def test_missing_field_projects_none(coordinator):
+    """Fields the data does not have are projected as None."""
+    coordinator.data = SimpleNamespace(wind_speed=1.0)
+    coordinator.slot("wind_speed")
+    coordinator.slot("temperature_extra_1")
+    assert coordinator.snapshot == (1.0, None)
+
+
+def test_only_changed_fields_notify(coordinator, calls):
+    """Listeners are only called if one of their fields changed."""
+    coordinator.async_update_listeners()
+    assert calls == ["all"]
+
+    coordinator.data.rain_rate = 1.2
+    coordinator.async_update_listeners()
+    assert sorted(calls) == ["all", "all", "rain"]
+
+
+def test_listener_called_once_per_update(coordinator, calls):
+    """A listener with several changed fields is called once."""
+    coordinator.data.wind_speed = 3.0
+    coordinator.data.wind_gust = 5.0
+    coordinator.async_update_listeners()
+    assert sorted(calls) == ["all", "wind"]
+
+
+def test_availability_change_notifies_all(coordinator, calls):
+    """All listeners are called when the coordinator becomes unavailable."""
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+    assert sorted(calls) == ["all", "rain", "wind"]
+
+    calls.clear()
+    coordinator.async_update_listeners()
+    assert calls == ["all"]
+
+
+def test_removed_listener_not_called(coordinator, calls):
+    """Removed listeners are dropped from the dispatch index."""
+    remove = coordinator.async_add_listener(
+        lambda: calls.append("extra"), frozenset({"rain_rate"})
+    )
+    remove()
+    coordinator.data.rain_rate = 2.0
+    coordinator.async_update_listeners()
+    assert sorted(calls) == ["all", "rain"]
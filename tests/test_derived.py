@@ -0,0 +1,142 @@
+"""Tests for the sliding window derived sensors."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.meteobridge.const import CONF_DERIVED_SENSORS, DOMAIN
+from custom_components.meteobridge.derived import (
+    MeteobridgeDerivedValues,
+    SlidingChange,
+    SlidingMax,
+    SlidingSum,
+    SlidingVectorMean,
+)
+
+from .common import mock_config_entry
+
+GUST_MAX = "sensor.meteobridge_wind_gust_max_10_minutes"
+
+
+def test_sliding_max_drops_old_maximum():
+    """The maximum falls back once the peak leaves the window."""
+    window = SlidingMax(600)
+    for timestamp, value in ((0, 5.0), (60, 9.0), (120, 4.0), (300, 6.0)):
+        window.add(timestamp, value)
+    assert window.value == 9.0
+
+    window.add(661, 3.0)
+    assert window.value == 6.0
+    window.add(901, 2.0)
+    assert window.value == 3.0
+
+
+def test_sliding_sum_keeps_running_total():
+    """The sum only counts samples inside the window."""
+    window = SlidingSum(3600)
+    window.add(0, 0.5)
+    window.add(1800, 1.0)
+    assert window.value == 1.5
+    window.add(3601, 0.2)
+    assert window.value == pytest.approx(1.2)
+
+
+def test_sliding_change_from_oldest_sample():
+    """The change is measured from the oldest sample in the window."""
+    window = SlidingChange(10800)
+    window.add(0, 1015.0)
+    window.add(3600, 1013.0)
+    window.add(10801, 1010.5)
+    assert window.value == pytest.approx(-2.5)
+
+
+def test_vector_mean_wraps_around_north():
+    """Directions either side of north average to north, not south."""
+    window = SlidingVectorMean(600)
+    window.add(0, 350)
+    window.add(60, 10)
+    assert min(window.value, 360 - window.value) == pytest.approx(0, abs=1e-6)
+    window.add(120, 90)
+    assert 0 < window.value < 90
+
+
+def test_vector_mean_of_opposite_directions():
+    """Opposite directions cancel out."""
+    window = SlidingVectorMean(600)
+    window.add(0, 0)
+    window.add(60, 180)
+    assert window.value is None
+
+
+def _observation(**values):
+    return SimpleNamespace(
+        **{
+            "wind_gust": None,
+            "sea_level_pressure": None,
+            "wind_direction": None,
+            "wind_avg": None,
+            "precip_accum_local_day": None,
+            **values,
+        }
+    )
+
+
+def test_rain_last_hour_across_midnight():
+    """The daily total resetting at midnight does not count as negative rain."""
+    derived = MeteobridgeDerivedValues()
+    derived.update(_observation(precip_accum_local_day=10.0), 0)
+    derived.update(_observation(precip_accum_local_day=10.4), 600)
+    derived.update(_observation(precip_accum_local_day=0.2), 1200)
+    assert derived.value("rain_last_hour") == 0.6
+
+
+def test_calm_wind_direction_ignored():
+    """The direction is not averaged while there is no wind."""
+    derived = MeteobridgeDerivedValues()
+    derived.update(_observation(wind_direction=90, wind_avg=2.0), 0)
+    derived.update(_observation(wind_direction=270, wind_avg=0.0), 60)
+    assert derived.value("wind_direction_mean") == 90
+
+
+async def test_derived_sensors_added_when_enabled(hass, meteobridge):
+    """The option adds the derived sensors, fed by each refresh."""
+    entry = mock_config_entry(**{CONF_DERIVED_SENSORS: True})
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    gust = hass.states.get("sensor.meteobridge_wind_gust").state
+    assert hass.states.get(GUST_MAX).state == gust
+
+    meteobridge.observation["wind_gust"] = "4.0"
+    await hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.meteobridge_wind_gust").state != gust
+    assert hass.states.get(GUST_MAX).state == gust
+    assert hass.states.get("sensor.meteobridge_pressure_tendency_3_hours") is not None
+
+
+async def test_unchanged_derived_value_not_written(hass, meteobridge):
+    """A derived value that did not change is not written again."""
+    entry = mock_config_entry(**{CONF_DERIVED_SENSORS: True})
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    written = hass.states.get(GUST_MAX).last_updated
+
+    meteobridge.observation["wind_gust"] = "4.0"
+    await hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(GUST_MAX).last_updated == written
+
+    meteobridge.observation["wind_gust"] = "9.0"
+    await hass.data[DOMAIN][entry.entry_id].coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(GUST_MAX).last_updated != written
+
+
+async def test_derived_sensors_off_by_default(hass, meteobridge):
+    """Without the option there are no derived sensors."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    assert hass.states.get(GUST_MAX) is None
+    assert hass.data[DOMAIN][entry.entry_id].derived is None
@@ -0,0 +1,102 @@
+"""Tests for the poll timing statistics and diagnostics."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from homeassistant.helpers import entity_registry as er
+from pymeteobridgedata import BadRequest
+
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.meteobridge.metrics import LatencyStats, measurement_age
+
+from .common import mock_config_entry
+
+REQUEST_LATENCY = "sensor.meteobridge_request_latency"
+MEASUREMENT_AGE = "sensor.meteobridge_measurement_age"
+
+
+def test_latency_percentiles_and_histogram():
+    """Percentiles come from the recent window, the histogram counts all."""
+    stats = LatencyStats(window=10)
+    for milliseconds in range(1, 21):
+        stats.add(milliseconds / 1000)
+
+    assert stats.count == 20
+    assert stats.percentile(50) == 15
+    assert stats.percentile(90) == 19
+    assert stats.percentile(99) == 20
+    result = stats.as_dict()
+    assert result["mean_ms"] == 10.5
+    assert result["histogram_ms"]["<=10"] == 10
+    assert result["histogram_ms"]["<=25"] == 10
+    assert sum(result["histogram_ms"].values()) == 20
+
+
+def test_empty_latency_stats():
+    """Statistics without samples have no percentiles."""
+    result = LatencyStats().as_dict()
+    assert result["count"] == 0
+    assert result["mean_ms"] is None
+    assert result["p90_ms"] is None
+
+
+def test_measurement_age():
+    """The age is measured from the utc_time of the observation."""
+    now = datetime(2023, 11, 14, 22, 15, tzinfo=timezone.utc)
+
+    class Observation:
+        utc_time = datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+    assert measurement_age(Observation(), now) == 100
+    assert measurement_age(None, now) is None
+
+
+async def test_poll_diagnostics(hass, meteobridge):
+    """Diagnostics report request, parse and dispatch timings and failures."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+
+    await coordinator.async_refresh()
+    meteobridge.error = BadRequest("Connection refused")
+    await coordinator.async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    client = diagnostics["client"]
+    assert client["request_time"]["count"] == 2
+    assert client["parse_time"]["count"] == 2
+    assert client["last_response_bytes"] > 0
+    assert diagnostics["coordinator"]["dispatch_time"]["count"] == 3
+    assert diagnostics["coordinator"]["measurement_age"] > 0
+    assert diagnostics["coordinator"]["last_update_success"] is False
+    assert diagnostics["breaker"]["errors"] == {"BadRequest": 1}
+    assert diagnostics["entry"]["options"]["password"] == "**REDACTED**"
+
+
+async def test_diagnostic_sensors(hass, meteobridge):
+    """The latency and age sensors are disabled until the user enables them."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    entity_registry = er.async_get(hass)
+    for entity_id in (REQUEST_LATENCY, MEASUREMENT_AGE):
+        assert entity_registry.async_get(entity_id).disabled
+        assert hass.states.get(entity_id) is None
+        entity_registry.async_update_entity(entity_id, disabled_by=None)
+
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    await entry_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+    client = entry_data.meteobridgeapi
+
+    latency = hass.states.get(REQUEST_LATENCY)
+    assert float(latency.state) >= 0
+    assert latency.attributes["requests"] == client.request_time.count
+    assert latency.attributes["last_response_bytes"] == client.last_response_bytes
+    assert float(hass.states.get(MEASUREMENT_AGE).state) > 0
@@ -0,0 +1,206 @@
+"""Tests for the state write throttling in MeteobridgeEntity."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.meteobridge import entity as entity_module
+from custom_components.meteobridge.binary_sensor import (
+    MeteobridgeBinarySensor,
+    MeteobridgeBinarySensorEntityDescription,
+)
+from custom_components.meteobridge.const import DEFAULT_HEARTBEAT_INTERVAL
+from custom_components.meteobridge.sensor import (
+    MeteobridgeSensor,
+    MeteobridgeSensorEntityDescription,
+)
+
+
+class Clock:
+    """Controllable replacement for time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Patch the monotonic clock used by the entity."""
+    fake = Clock()
+    with patch.object(entity_module.time, "monotonic", fake):
+        yield fake
+
+
+def _sensor(coordinator, device_data, entry, **throttle):
+    description = MeteobridgeSensorEntityDescription(
+        key="wind_direction",
+        name="Wind Direction",
+        unit_type="none",
+        attribute_field=throttle.pop("attribute_field", None),
+        **throttle,
+    )
+    return MeteobridgeSensor(
+        None, coordinator, device_data, description, entry, {"none": None}
+    )
+
+
+def _feed(sensor, coordinator, clock, value, advance=60):
+    clock.now += advance
+    coordinator.data.wind_direction = value
+    coordinator.async_update_listeners()
+    return sensor._should_write_state()
+
+
+def test_unthrottled_always_writes(coordinator, device_data, entry, clock):
+    """Descriptions without throttling write on every update."""
+    sensor = _sensor(coordinator, device_data, entry)
+    assert [_feed(sensor, coordinator, clock, v, 1) for v in (1, 1, 2)] == [
+        True,
+        True,
+        True,
+    ]
+
+
+def test_absolute_deadband(coordinator, device_data, entry, clock):
+    """Changes within the deadband are compared to the last written value."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5)
+    assert _feed(sensor, coordinator, clock, 100)
+    assert not _feed(sensor, coordinator, clock, 103)
+    assert _feed(sensor, coordinator, clock, 106)
+    assert not _feed(sensor, coordinator, clock, 106)
+    assert _feed(sensor, coordinator, clock, 90)
+
+
+def test_circular_deadband(coordinator, device_data, entry, clock):
+    """Angles wrap around north when a modulus is set."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5, deadband_modulus=360)
+    assert _feed(sensor, coordinator, clock, 359)
+    assert not _feed(sensor, coordinator, clock, 2)
+    assert _feed(sensor, coordinator, clock, 10)
+
+    linear = _sensor(coordinator, device_data, entry, deadband=5)
+    assert _feed(linear, coordinator, clock, 359)
+    assert _feed(linear, coordinator, clock, 2)
+
+
+def test_relative_deadband(coordinator, device_data, entry, clock):
+    """The relative deadband scales with the last written value."""
+    sensor = _sensor(coordinator, device_data, entry, deadband_relative=0.02)
+    assert _feed(sensor, coordinator, clock, 500.0)
+    assert not _feed(sensor, coordinator, clock, 509.0)
+    assert _feed(sensor, coordinator, clock, 511.0)
+
+
+def test_min_write_interval(coordinator, device_data, entry, clock):
+    """Changes are held back until the minimum interval has passed."""
+    sensor = _sensor(coordinator, device_data, entry, min_write_interval=300)
+    assert _feed(sensor, coordinator, clock, 1)
+    assert not _feed(sensor, coordinator, clock, 2, advance=100)
+    assert not _feed(sensor, coordinator, clock, 3, advance=100)
+    assert _feed(sensor, coordinator, clock, 3, advance=100)
+    assert not _feed(sensor, coordinator, clock, 3, advance=400)
+
+
+def test_heartbeat(coordinator, device_data, entry, clock):
+    """The heartbeat writes even when the value stays inside the deadband."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5)
+    assert _feed(sensor, coordinator, clock, 100)
+    almost_heartbeat = DEFAULT_HEARTBEAT_INTERVAL - 1
+    assert not _feed(sensor, coordinator, clock, 101, advance=almost_heartbeat)
+    assert _feed(sensor, coordinator, clock, 101, advance=1)
+
+    custom = _sensor(coordinator, device_data, entry, deadband=5, heartbeat_interval=60)
+    assert _feed(custom, coordinator, clock, 100)
+    assert _feed(custom, coordinator, clock, 100, advance=60)
+
+
+def test_availability_change_bypasses_throttle(coordinator, device_data, entry, clock):
+    """A change in availability is always written."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5, min_write_interval=300)
+    assert _feed(sensor, coordinator, clock, 100)
+    coordinator.last_update_success = False
+    assert _feed(sensor, coordinator, clock, 100, advance=1)
+    coordinator.last_update_success = True
+    assert _feed(sensor, coordinator, clock, 100, advance=1)
+
+
+def test_attribute_change_bypasses_throttle(coordinator, device_data, entry, clock):
+    """A new measure time is always written."""
+    sensor = _sensor(
+        coordinator,
+        device_data,
+        entry,
+        deadband=5,
+        attribute_field="wind_direction_time",
+    )
+    coordinator.data.wind_direction_time = "10:00"
+    assert _feed(sensor, coordinator, clock, 100)
+    coordinator.data.wind_direction_time = "10:01"
+    assert _feed(sensor, coordinator, clock, 101)
+    assert not _feed(sensor, coordinator, clock, 102)
+
+
+def test_non_numeric_values(coordinator, device_data, entry, clock):
+    """Strings and None are only compared for equality."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5)
+    assert _feed(sensor, coordinator, clock, "N")
+    assert not _feed(sensor, coordinator, clock, "N")
+    assert _feed(sensor, coordinator, clock, "NNE")
+    assert _feed(sensor, coordinator, clock, None)
+    assert _feed(sensor, coordinator, clock, 3)
+
+
+def test_bool_values_ignore_deadband(coordinator, device_data, entry, clock):
+    """Binary sensor values are never treated as numbers."""
+    description = MeteobridgeBinarySensorEntityDescription(
+        key="is_raining", name="Is Raining", deadband=5
+    )
+    sensor = MeteobridgeBinarySensor(None, coordinator, device_data, description, entry)
+    coordinator.data.is_raining = False
+    coordinator.async_update_listeners()
+    assert sensor._should_write_state()
+    coordinator.data.is_raining = True
+    coordinator.async_update_listeners()
+    clock.now += 1
+    assert sensor._should_write_state()
+
+
+def test_urgent_value_bypasses_min_write_interval(
+    coordinator, device_data, entry, clock
+):
+    """A low battery is written at once, its recovery waits for the interval."""
+    description = MeteobridgeBinarySensorEntityDescription(
+        key="th_sensor_lowbat",
+        name="TH sensor battery status",
+        min_write_interval=300,
+        urgent_values=frozenset({True}),
+    )
+    sensor = MeteobridgeBinarySensor(None, coordinator, device_data, description, entry)
+    coordinator.data.th_sensor_lowbat = False
+    coordinator.async_update_listeners()
+    assert sensor._should_write_state()
+
+    for value, written in ((True, True), (False, False), (True, False)):
+        clock.now += 10
+        coordinator.data.th_sensor_lowbat = value
+        coordinator.async_update_listeners()
+        assert sensor._should_write_state() is written
+
+    clock.now += 300
+    coordinator.data.th_sensor_lowbat = False
+    coordinator.async_update_listeners()
+    assert sensor._should_write_state()
+
+
+async def test_added_to_hass_seeds_last_write(coordinator, device_data, entry, clock):
+    """The first update after startup is throttled against the initial state."""
+    sensor = _sensor(coordinator, device_data, entry, deadband=5)
+    coordinator.data.wind_direction = 100
+    coordinator.async_update_listeners()
+    with patch.object(entity_module.CoordinatorEntity, "async_added_to_hass"):
+        await sensor.async_added_to_hass()
+    assert not _feed(sensor, coordinator, clock, 102)
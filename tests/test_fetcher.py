@@ -0,0 +1,85 @@
+"""Tests for coalescing observation requests."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.meteobridge import fetcher as fetcher_module
+from custom_components.meteobridge.fetcher import SingleFlightFetcher
+
+
+class SlowLogger:
+    """Fetch function that blocks until released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.calls
+
+
+async def test_concurrent_fetches_share_one_request():
+    """Callers arriving while a fetch runs wait for it."""
+    logger = SlowLogger()
+    fetcher = SingleFlightFetcher(logger, cache_ttl=0)
+    waiters = [asyncio.ensure_future(fetcher.async_fetch()) for _ in range(3)]
+    await asyncio.sleep(0)
+    logger.release.set()
+
+    assert await asyncio.gather(*waiters) == [1, 1, 1]
+    assert logger.calls == 1
+    assert fetcher.coalesced == 2
+
+
+async def test_recent_result_reused():
+    """A result younger than the TTL is returned without fetching."""
+    logger = SlowLogger()
+    logger.release.set()
+    fetcher = SingleFlightFetcher(logger, cache_ttl=5)
+    now = 1000.0
+    with patch.object(fetcher_module.time, "monotonic", lambda: now):
+        assert await fetcher.async_fetch() == 1
+        now += 4.9
+        assert await fetcher.async_fetch() == 1
+        now += 0.1
+        assert await fetcher.async_fetch() == 2
+    assert fetcher.cache_hits == 1
+
+
+async def test_errors_shared_and_not_cached():
+    """A failed fetch fails all waiters, and the next call fetches again."""
+    logger = SlowLogger()
+    logger.error = ValueError("Timeout")
+    fetcher = SingleFlightFetcher(logger, cache_ttl=5)
+    waiters = [asyncio.ensure_future(fetcher.async_fetch()) for _ in range(2)]
+    await asyncio.sleep(0)
+    logger.release.set()
+    for waiter in waiters:
+        with pytest.raises(ValueError):
+            await waiter
+
+    logger.error = None
+    assert await fetcher.async_fetch() == 2
+
+
+async def test_cancelled_caller_does_not_cancel_fetch():
+    """Other callers still get the result if one of them is cancelled."""
+    logger = SlowLogger()
+    fetcher = SingleFlightFetcher(logger, cache_ttl=0)
+    first = asyncio.ensure_future(fetcher.async_fetch())
+    second = asyncio.ensure_future(fetcher.async_fetch())
+    await asyncio.sleep(0)
+    first.cancel()
+    logger.release.set()
+
+    assert await second == 1
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,117 @@
+"""Tests for spreading the polls of all entries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.coordinator import (
+    MeteobridgeDataUpdateCoordinator,
+)
+from custom_components.meteobridge.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.meteobridge.fleet import MeteobridgeFleet, async_get_fleet
+
+from .common import mock_config_entry
+
+CALL_AT = "custom_components.meteobridge.coordinator.event.async_call_at"
+
+
+def _coordinator(interval: float = 60) -> SimpleNamespace:
+    return SimpleNamespace(phase=None, update_interval=timedelta(seconds=interval))
+
+
+def test_phases_spread_evenly():
+    """Phases are an even share of the interval, reassigned on removal."""
+    fleet = MeteobridgeFleet()
+    coordinators = {f"entry_{index}": _coordinator() for index in range(4)}
+    unregister = {
+        entry_id: fleet.async_register(entry_id, coordinator)
+        for entry_id, coordinator in coordinators.items()
+    }
+    assert [c.phase for c in coordinators.values()] == [0, 0.25, 0.5, 0.75]
+    assert fleet.as_dict()["offsets"] == {
+        "entry_0": 0,
+        "entry_1": 15,
+        "entry_2": 30,
+        "entry_3": 45,
+    }
+
+    unregister["entry_1"]()
+    assert coordinators["entry_1"].phase is None
+    assert fleet.offset("entry_1") is None
+    assert [coordinators[f"entry_{index}"].phase for index in (0, 2, 3)] == [
+        0,
+        1 / 3,
+        2 / 3,
+    ]
+
+
+async def test_concurrent_fetches_limited():
+    """No more than max_concurrent fetches run at once, the others queue."""
+    fleet = MeteobridgeFleet(max_concurrent=2)
+    release = asyncio.Event()
+
+    async def _fetch() -> None:
+        async with fleet.async_fetch_slot():
+            await release.wait()
+
+    tasks = [asyncio.create_task(_fetch()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert fleet.running == 2
+    assert fleet.queued == 3
+    release.set()
+    await asyncio.gather(*tasks)
+    assert fleet.running == 0
+    assert fleet.peak_running == 2
+    assert fleet.queue_time.count == 5
+
+
+async def test_refresh_scheduled_at_phase(hass):
+    """A coordinator with a phase refreshes at its point of the interval."""
+    coordinator = MeteobridgeDataUpdateCoordinator(
+        hass,
+        logging.getLogger(__name__),
+        name=DOMAIN,
+        update_interval=timedelta(seconds=60),
+    )
+    coordinator.phase = 0.25
+    with patch.object(hass.loop, "time", return_value=1000.3), patch(
+        CALL_AT
+    ) as call_at:
+        coordinator._schedule_refresh()
+        assert call_at.call_args[0][2] == 1035
+
+        coordinator.phase = 0.75
+        coordinator._schedule_refresh()
+        assert call_at.call_args[0][2] == 1065
+
+        # Retries after a failure keep the interval of the backoff.
+        coordinator.last_update_success = False
+        coordinator._schedule_refresh()
+        assert call_at.call_args[0][2] == pytest.approx(1060 + coordinator._microsecond)
+    coordinator._async_unsub_refresh()
+
+
+async def test_entries_join_the_fleet(hass, meteobridge):
+    """Polled entries get a phase, reported in the diagnostics."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert coordinator.phase == 0
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    assert diagnostics["coordinator"]["phase_offset"] == 0
+    assert diagnostics["fleet"]["entries"] == 1
+    assert diagnostics["fleet"]["queue_time"]["count"] >= 1
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert async_get_fleet(hass).as_dict()["entries"] == 0
@@ -0,0 +1,80 @@
+"""Tests for the in-memory observation history."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.history import (
+    SAMPLE_SIZE,
+    MeteobridgeHistory,
+    RingBuffer,
+)
+
+from .common import mock_config_entry
+
+
+@dataclass
+class Observation:
+    """Small stand-in for ObservationDescription."""
+
+    wind_gust: float | None = None
+    lightning_strike_count: int | None = None
+    is_raining: bool | None = None
+    wind_cardinal: str | None = None
+
+
+def test_ring_buffer_overwrites_oldest():
+    """A full buffer drops the oldest sample."""
+    buffer = RingBuffer(3)
+    for timestamp in range(5):
+        buffer.append(timestamp, timestamp * 10)
+
+    assert len(buffer) == 3
+    assert list(buffer.samples()) == [(2, 20), (3, 30), (4, 40)]
+    assert list(buffer.samples(since=3)) == [(3, 30), (4, 40)]
+    assert buffer.latest() == (4, 40)
+
+
+def test_ring_buffer_empty():
+    """An empty buffer has no samples."""
+    buffer = RingBuffer(3)
+    assert buffer.latest() is None
+    assert list(buffer.samples()) == []
+
+
+def test_history_records_numeric_fields():
+    """Only int and float values are kept, not bools or strings."""
+    history = MeteobridgeHistory(capacity=10, memory_budget=10_000)
+    history.record(Observation(5.5, 2, True, "N"), 100.0)
+
+    assert sorted(history.buffers) == ["lightning_strike_count", "wind_gust"]
+    assert history.get("wind_gust").latest() == (100.0, 5.5)
+    assert history.get("is_raining") is None
+
+
+def test_history_respects_memory_budget():
+    """Keys beyond the memory budget are not kept."""
+    history = MeteobridgeHistory(capacity=10, memory_budget=10 * SAMPLE_SIZE)
+    history.record(Observation(5.5, 2), 100.0)
+
+    assert list(history.buffers) == ["wind_gust"]
+    assert history.nbytes == 10 * SAMPLE_SIZE
+    assert history.as_dict()["skipped_keys"] == ["lightning_strike_count"]
+
+
+async def test_entry_records_each_new_observation(hass, meteobridge):
+    """Every refresh adds one sample, and cached results are not added twice."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    history = entry_data.history
+    assert history.get("air_temperature").latest()[1] == 12.3
+
+    meteobridge.observation["air_temperature"] = "13.0"
+    await entry_data.coordinator.async_refresh()
+    entry_data.coordinator.async_set_updated_data(entry_data.coordinator.data)
+    assert [value for _, value in history.get("air_temperature").samples()] == [
+        12.3,
+        13.0,
+    ]
@@ -0,0 +1,36 @@
+"""Test which modules the integration imports up front."""
+from benchmarks.imports import CASES, PACKAGE, imported_modules
+
+# Only imported when the option using them is enabled.
+OPTIONAL = tuple(
+    f"{PACKAGE}.{name}" for name in ("derived", "push", "replay", "scheduler")
+)
+
+
+def _loaded(modules: dict[str, int], prefixes: tuple[str, ...]) -> list[str]:
+    return [name for name in modules if name.startswith(prefixes)]
+
+
+def test_config_flow_imports() -> None:
+    """Test showing the config flow does not load the client or the platforms."""
+    modules = imported_modules(CASES["config_flow"])
+
+    assert not _loaded(
+        modules,
+        (
+            "pymeteobridgedata",
+            "homeassistant.components.webhook",
+            f"{PACKAGE}.entry_setup",
+            f"{PACKAGE}.sensor",
+            f"{PACKAGE}.binary_sensor",
+            *OPTIONAL,
+        ),
+    )
+
+
+def test_setup_imports() -> None:
+    """Test setting up a polled entry does not load optional features."""
+    modules = imported_modules(CASES["setup"])
+
+    assert f"{PACKAGE}.entry_setup" in modules
+    assert not _loaded(modules, ("homeassistant.components.webhook", *OPTIONAL))
@@ -0,0 +1,97 @@
+"""Tests for setting up the Meteobridge integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.config_entries import SOURCE_REAUTH, ConfigEntryState
+from homeassistant.const import CONF_WEBHOOK_ID
+from pymeteobridgedata import NotAuthorized
+
+from custom_components.meteobridge.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_INGESTION_MODE,
+    DOMAIN,
+    INGESTION_MODE_PUSH,
+)
+
+from .common import mock_config_entry
+
+
+async def test_setup_poll_mode(hass, meteobridge):
+    """The entry loads, creates entities and polls at the scan interval."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    state = hass.states.get("sensor.meteobridge_air_temperature")
+    assert state.state == "12.3"
+    assert hass.states.get("binary_sensor.meteobridge_is_raining").state == "off"
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert coordinator.update_interval == timedelta(seconds=60)
+    assert "webhook" not in hass.config.components
+
+
+async def test_setup_push_mode(hass, meteobridge):
+    """Push mode registers a webhook and disables polling."""
+    entry = mock_config_entry(**{CONF_INGESTION_MODE: INGESTION_MODE_PUSH})
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert "webhook" in hass.config.components
+    webhook_id = entry.data[CONF_WEBHOOK_ID]
+    assert webhook_id in hass.data["webhook"]
+    assert hass.data[DOMAIN][entry.entry_id].coordinator.update_interval is None
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    assert webhook_id not in hass.data["webhook"]
+
+
+async def test_setup_adaptive_polling(hass, meteobridge):
+    """Adaptive polling adjusts the interval and adds a diagnostic sensor."""
+    meteobridge.observation["precip_rate"] = "2.5"
+    entry = mock_config_entry(**{CONF_ADAPTIVE_POLLING: True})
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert coordinator.update_interval == timedelta(seconds=10)
+    assert hass.states.get("sensor.meteobridge_poll_interval").state == "10"
+
+
+def _reauth_flows(hass, entry) -> list:
+    return [
+        flow
+        for flow in hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+        if flow["context"]["source"] == SOURCE_REAUTH
+        and flow["context"]["entry_id"] == entry.entry_id
+    ]
+
+
+async def test_refused_credentials_start_reauth(hass, meteobridge):
+    """A logger refusing the credentials asks for new ones."""
+    meteobridge.error = NotAuthorized("Wrong password")
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+    assert _reauth_flows(hass, entry)
+
+
+async def test_refused_credentials_after_warm_start_start_reauth(hass, meteobridge):
+    """The background refresh after a cached start also asks for new credentials."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    meteobridge.error = NotAuthorized("Wrong password")
+    await hass.config_entries.async_setup(entry.entry_id)
+    await asyncio.gather(*entry._background_tasks)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert _reauth_flows(hass, entry)
@@ -0,0 +1,147 @@
+"""Tests for Meteobridge push ingestion."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.setup import async_setup_component
+from pymeteobridgedata import BadRequest, MeteobridgeApiClient
+from pymeteobridgedata.const import FIELDS_OBSERVATION
+
+from custom_components.meteobridge.const import (
+    CONF_EXTRA_SENSORS,
+    CONF_INGESTION_MODE,
+    DOMAIN,
+    INGESTION_MODE_PUSH,
+    PUSH_QUERY_PARAMETER,
+)
+from custom_components.meteobridge.push import build_push_template
+
+from .common import mock_config_entry, observation_payload
+
+AIR_TEMPERATURE = "sensor.meteobridge_air_temperature"
+
+
+def test_build_push_template():
+    """The template lists every observation field, then the extra sensors."""
+    template = build_push_template(1)
+    fields = template.split(";")
+    assert len(fields) == len(FIELDS_OBSERVATION) + 3
+    assert fields[0] == "[epoch]"
+    assert fields[1] == "[th0temp-act:None]"
+    assert fields[-3:] == [
+        "[th1temp-act:None]",
+        "[th1hum-act.0:None]",
+        "[th1heatindex-act.1:None]",
+    ]
+
+
+async def test_decode_push(push_client):
+    """Pushed data decodes like a polled response, without any request."""
+    request = AsyncMock()
+    with patch.object(MeteobridgeApiClient, "_async_request", request):
+        data = await push_client.decode_push(
+            observation_payload(extra_sensors=2, temperature_extra_2="4.5")
+        )
+
+    request.assert_not_called()
+    assert data.key == "00:11:22:33:44:55"
+    assert data.air_temperature == 12.3
+    assert data.wind_direction == 225
+    assert data.wind_cardinal == "sw"
+    assert data.forecast == "Mostly cloudy"
+    assert data.temperature_extra_2 == 4.5
+    assert data.relative_humidity_extra_1 == 51
+
+
+async def test_decode_push_wrong_field_count(push_client):
+    """A template that does not match the configuration is rejected."""
+    with pytest.raises(BadRequest):
+        await push_client.decode_push(observation_payload(extra_sensors=0))
+
+
+@pytest.fixture
+async def push_entry(hass, meteobridge):
+    """Load an entry in push mode, behind a proxy on the local host."""
+    assert await async_setup_component(
+        hass,
+        "http",
+        {"http": {"use_x_forwarded_for": True, "trusted_proxies": ["127.0.0.1"]}},
+    )
+    entry = mock_config_entry(
+        **{CONF_INGESTION_MODE: INGESTION_MODE_PUSH, CONF_EXTRA_SENSORS: 2}
+    )
+    meteobridge.extra_sensors = 2
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture
+async def http_client(hass, push_entry):
+    """Return a client for the web server of Home Assistant."""
+    client = TestClient(TestServer(hass.http.app))
+    await client.start_server()
+    yield client
+    await client.close()
+
+
+def _webhook_path(entry) -> str:
+    return f"/api/webhook/{entry.data[CONF_WEBHOOK_ID]}"
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+async def test_webhook_updates_entities(hass, push_entry, http_client, method):
+    """Data pushed to the webhook over HTTP updates the entities."""
+    payload = observation_payload(extra_sensors=2, air_temperature="15.1")
+    if method == "GET":
+        response = await http_client.get(
+            _webhook_path(push_entry), params={PUSH_QUERY_PARAMETER: payload}
+        )
+    else:
+        response = await http_client.post(_webhook_path(push_entry), data=payload)
+    await hass.async_block_till_done()
+
+    assert response.status == 200
+    assert hass.states.get(AIR_TEMPERATURE).state == "15.1"
+
+
+async def test_webhook_rejects_invalid_push(hass, push_entry, http_client):
+    """Invalid pushes are answered with 400 and do not change the entities."""
+    response = await http_client.get(
+        _webhook_path(push_entry), params={PUSH_QUERY_PARAMETER: "1;2;3"}
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == 400
+    assert hass.states.get(AIR_TEMPERATURE).state == "12.3"
+
+
+async def test_webhook_is_local_only(hass, push_entry, http_client):
+    """Data pushed from outside the local network is ignored."""
+    payload = observation_payload(extra_sensors=2, air_temperature="15.1")
+    response = await http_client.get(
+        _webhook_path(push_entry),
+        params={PUSH_QUERY_PARAMETER: payload},
+        headers={"X-Forwarded-For": "203.0.113.7"},
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == 200
+    assert hass.states.get(AIR_TEMPERATURE).state == "12.3"
+
+
+async def test_refresh_after_push_polls_logger(
+    hass, push_entry, meteobridge, http_client
+):
+    """A refresh of the coordinator still polls the logger after a push."""
+    await http_client.post(
+        _webhook_path(push_entry), data=observation_payload(extra_sensors=2)
+    )
+    await hass.async_block_till_done()
+    meteobridge.requests.clear()
+
+    await hass.data[DOMAIN][push_entry.entry_id].coordinator.async_refresh()
+    assert meteobridge.requests
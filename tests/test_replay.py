@@ -0,0 +1,147 @@
+"""Tests for recording and replaying raw logger responses."""
+from __future__ import annotations
+
+import json
+
+import pytest
+from pymeteobridgedata import BadRequest
+
+from custom_components.meteobridge.const import DOMAIN, RECORDING_DIRECTORY
+from custom_components.meteobridge.replay import (
+    MeteobridgeReplayClient,
+    RecordingEnded,
+    async_replay,
+    load_recording,
+)
+
+from .common import mock_config_entry
+
+
+async def _async_record(hass, meteobridge, observations, **options):
+    """Record one poll per observation, then unload the entry."""
+    entry = mock_config_entry(record_responses=True, **options)
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    for observation in observations:
+        meteobridge.observation = observation
+        await coordinator.async_refresh()
+    meteobridge.error = BadRequest("Connection refused")
+    await coordinator.async_refresh()
+    meteobridge.error = None
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.config.path(RECORDING_DIRECTORY, f"{entry.entry_id}.jsonl")
+
+
+async def test_record_responses(hass, meteobridge):
+    """Responses and errors are appended to the recording, without credentials."""
+    path = await _async_record(hass, meteobridge, [{"air_temperature": "21.5"}])
+
+    with open(path, encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file]
+    assert lines[0]["device"]["key"] == "00:11:22:33:44:55"
+    assert "secret" not in json.dumps(lines)
+    # Templates are written once, before the first response to them. The
+    # first refresh also requests the slow tier fields.
+    assert lines[1] == {"d": 0, "q": lines[1]["q"]}
+    assert lines[1]["q"].startswith("[epoch]")
+    assert lines[3]["d"] == 1
+    responses = [line for line in lines[1:] if "d" not in line]
+    assert [(line["q"], "r" in line, "e" in line) for line in responses] == [
+        (0, True, False),
+        (1, True, False),
+        (1, False, True),
+    ]
+    assert lines[-1]["e"] == "BadRequest: Connection refused"
+
+
+async def test_recording_disabled_by_default(hass, meteobridge):
+    """Nothing is recorded unless the option is enabled."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id].recorder is None
+    assert hass.data[DOMAIN][entry.entry_id].meteobridgeapi.recorder is None
+
+
+async def test_recording_size_limit(hass, meteobridge):
+    """A recording stops growing at its maximum size."""
+    entry = mock_config_entry(record_responses=True)
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    recorder = hass.data[DOMAIN][entry.entry_id].recorder
+    recorder.max_bytes = 1000
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    for _ in range(5):
+        await coordinator.async_refresh()
+    await recorder.async_flush()
+
+    assert recorder.full
+    assert recorder.dropped > 0
+    recorder.record("[epoch]", "1700000000")
+    assert recorder.as_dict()["records"] == recorder.records
+
+
+async def test_replay_feeds_coordinator(hass, meteobridge):
+    """A replay reproduces the recorded observations and failures, offline."""
+    path = await _async_record(
+        hass,
+        meteobridge,
+        [{"air_temperature": "21.5"}, {"air_temperature": "22.0"}],
+        extra_sensors=1,
+    )
+    recording = load_recording(path)
+    assert recording.extra_sensors == 1
+
+    entry = mock_config_entry(extra_sensors=1)
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    # Let the background refresh of the cached entry finish.
+    await coordinator.async_refresh()
+    meteobridge.requests.clear()
+    temperatures = []
+    failures = []
+    coordinator.async_add_listener(
+        lambda: temperatures.append(coordinator.data.air_temperature)
+        if coordinator.last_update_success
+        else failures.append(coordinator.last_exception)
+    )
+
+    client = MeteobridgeReplayClient(recording)
+    assert await async_replay(coordinator, client) == 4
+    await client.req.close()
+
+    assert meteobridge.requests == []
+    assert temperatures == [12.3, 21.5, 22.0]
+    assert str(failures[0]) == "BadRequest: Connection refused"
+    assert client.finished
+    with pytest.raises(RecordingEnded):
+        await client.update_observations()
+
+
+async def test_replay_speed(hass, meteobridge):
+    """With a speed, responses are paced by their recorded times."""
+    path = await _async_record(hass, meteobridge, [{}])
+    recording = load_recording(path)
+    for index, record in enumerate(recording.records):
+        record.time = 1000 + index * 10
+    client = MeteobridgeReplayClient(recording, speed=1000)
+    loop = hass.loop
+
+    start = loop.time()
+    await client.update_observations()
+    await client.update_observations()
+    assert loop.time() - start >= 0.01
+    await client.req.close()
+
+
+def test_load_recording_without_station(tmp_path):
+    """A file without a station description is not a recording."""
+    path = tmp_path / "recording.jsonl"
+    path.write_text(
+        '{"d":0,"q":"[epoch]"}\n{"t":1,"q":0,"r":"1"}\n', encoding="utf-8"
+    )
+    with pytest.raises(ValueError):
+        load_recording(str(path))
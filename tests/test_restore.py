@@ -0,0 +1,80 @@
+"""Tests for restoring the last known states at startup."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.sensor import SensorExtraStoredData
+from homeassistant.const import STATE_OFF, STATE_UNKNOWN
+from homeassistant.core import State
+from homeassistant.helpers import restore_state
+from homeassistant.util import dt as dt_util
+
+from .common import mock_config_entry
+
+AIR_TEMPERATURE = "sensor.meteobridge_air_temperature"
+DAY_MAX = "sensor.meteobridge_air_temperature_day_max"
+RAIN_LOWBAT = "binary_sensor.meteobridge_rain_sensor_battery_status"
+
+
+async def _async_warm_start(hass, meteobridge, entry) -> None:
+    """Set up an entry from cache, while the logger is slow to answer."""
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    meteobridge.delay = 0.05
+    meteobridge.observation = {"air_temperature": "14.0", "air_temperature_dmax": "15"}
+    await hass.config_entries.async_setup(entry.entry_id)
+
+
+async def test_restored_until_first_update(hass, meteobridge):
+    """After a warm start, the last states are shown, marked stale."""
+    entry = mock_config_entry()
+    await _async_warm_start(hass, meteobridge, entry)
+
+    state = hass.states.get(AIR_TEMPERATURE)
+    assert state.state == "12.3"
+    assert state.attributes["stale"] is True
+    day_max = hass.states.get(DAY_MAX)
+    assert day_max.state == "13.0"
+    assert day_max.attributes["meassure_time"] is not None
+    assert hass.states.get(RAIN_LOWBAT).state == STATE_OFF
+    assert hass.states.get(RAIN_LOWBAT).attributes["stale"] is True
+
+    await asyncio.gather(*entry._background_tasks)
+    await hass.async_block_till_done()
+    state = hass.states.get(AIR_TEMPERATURE)
+    assert state.state == "14.0"
+    assert "stale" not in state.attributes
+    assert hass.states.get(DAY_MAX).state == "15"
+    assert "stale" not in hass.states.get(RAIN_LOWBAT).attributes
+
+
+async def test_cold_start_not_stale(hass, meteobridge):
+    """Entities set up after a first refresh show live data right away."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    assert "stale" not in hass.states.get(AIR_TEMPERATURE).attributes
+
+
+async def test_other_unit_not_restored(hass, meteobridge):
+    """A value stored in another unit is not shown as if it were current."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    restore_state.async_get(hass).last_states[AIR_TEMPERATURE] = (
+        restore_state.StoredState(
+            State(AIR_TEMPERATURE, "54.1"),
+            SensorExtraStoredData(54.1, "°F"),
+            dt_util.utcnow(),
+        )
+    )
+
+    meteobridge.delay = 0.05
+    await hass.config_entries.async_setup(entry.entry_id)
+    assert hass.states.get(AIR_TEMPERATURE).state == STATE_UNKNOWN
+    await asyncio.gather(*entry._background_tasks)
@@ -0,0 +1,76 @@
+"""Tests for the weather adaptive poll scheduler."""
+from __future__ import annotations
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from custom_components.meteobridge.scheduler import AdaptivePollScheduler
+
+
+def _data(is_raining=False, wind_gust=2.0, lightning_strike_count=0):
+    return SimpleNamespace(
+        is_raining=is_raining,
+        wind_gust=wind_gust,
+        lightning_strike_count=lightning_strike_count,
+    )
+
+
+def test_backs_off_to_maximum_when_stable():
+    """Stable readings back off toward the configured interval."""
+    scheduler = AdaptivePollScheduler(10, 60)
+    scheduler.update(_data(is_raining=True))
+    assert scheduler.interval == 10
+
+    intervals = [scheduler.update(_data()).total_seconds() for _ in range(6)]
+    assert intervals == [15, 22.5, 33.75, 50.625, 60, 60]
+
+
+def test_rain_polls_at_minimum():
+    """Rain keeps the interval at the minimum."""
+    scheduler = AdaptivePollScheduler(10, 60)
+    assert scheduler.update(_data(is_raining=True)) == timedelta(seconds=10)
+    assert scheduler.update(_data(is_raining=True)) == timedelta(seconds=10)
+    assert scheduler.active_polls == 2
+
+
+def test_rising_gust_polls_at_minimum():
+    """A gust rising by more than the threshold counts as active weather."""
+    scheduler = AdaptivePollScheduler(10, 60)
+    scheduler.update(_data(wind_gust=5.0))
+    assert scheduler.update(_data(wind_gust=5.5)).total_seconds() == 60
+    assert scheduler.update(_data(wind_gust=7.0)).total_seconds() == 10
+    assert scheduler.update(_data(wind_gust=6.0)).total_seconds() == 15
+
+
+def test_lightning_polls_at_minimum():
+    """A changing strike count counts as active weather."""
+    scheduler = AdaptivePollScheduler(10, 60)
+    scheduler.update(_data(lightning_strike_count=3))
+    assert scheduler.update(_data(lightning_strike_count=4)).total_seconds() == 10
+    assert scheduler.update(_data(lightning_strike_count=4)).total_seconds() == 15
+
+
+def test_statistics():
+    """Requests saved are counted against always polling at the minimum."""
+    scheduler = AdaptivePollScheduler(10, 60)
+    for _ in range(3):
+        scheduler.update(_data())
+    stats = scheduler.as_dict()
+    assert stats["polls"] == 3
+    assert stats["active_polls"] == 0
+    assert stats["requests_saved"] == 15
+    assert stats["interval"] == 60
+
+
+def test_minimum_never_exceeds_maximum():
+    """A maximum below the minimum polls at the maximum."""
+    scheduler = AdaptivePollScheduler(30, 20)
+    assert scheduler.update(_data(is_raining=True)).total_seconds() == 20
+
+
+def test_set_max_interval_clamps_interval():
+    """Lowering the scan interval takes effect on the current interval."""
+    scheduler = AdaptivePollScheduler(10, 120)
+    scheduler.set_max_interval(30)
+    assert scheduler.interval == 30
+    assert scheduler.update(_data()).total_seconds() == 30
@@ -0,0 +1,74 @@
+"""Tests for the shared Meteobridge HTTP sessions."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from custom_components.meteobridge import session as session_module
+from custom_components.meteobridge.const import DATA_SESSIONS
+from custom_components.meteobridge.session import async_get_session_pool
+
+from .common import mock_config_entry
+
+
+async def _close_pending(hass) -> None:
+    """Let a session scheduled for closing close."""
+    await asyncio.sleep(0.01)
+    await hass.async_block_till_done()
+
+
+async def test_session_shared_per_host(hass):
+    """Users of the same host share a session."""
+    pool = async_get_session_pool(hass)
+    first = pool.async_acquire("192.168.1.10", "entry_1")
+    assert pool.async_acquire("192.168.1.10", "flow_1") is first
+    assert pool.async_acquire("192.168.1.11", "entry_2") is not first
+    await pool.async_close_all()
+
+
+async def test_session_closed_after_last_release(hass):
+    """The session stays open until the last user has released it."""
+    pool = async_get_session_pool(hass)
+    with patch.object(session_module, "SESSION_CLOSE_DELAY", 0):
+        session = pool.async_acquire("192.168.1.10", "entry_1")
+        pool.async_acquire("192.168.1.10", "entry_2")
+        pool.async_release("192.168.1.10", "entry_1")
+        await _close_pending(hass)
+        assert not session.closed
+
+        pool.async_release("192.168.1.10", "entry_2")
+        await _close_pending(hass)
+        assert session.closed
+        assert not pool.in_use("192.168.1.10")
+
+
+async def test_session_reused_when_acquired_again(hass):
+    """Acquiring again before the close delay keeps the session."""
+    pool = async_get_session_pool(hass)
+    session = pool.async_acquire("192.168.1.10", "entry_1")
+    pool.async_release("192.168.1.10", "entry_1")
+    assert pool.async_acquire("192.168.1.10", "entry_1") is session
+    await _close_pending(hass)
+    assert not session.closed
+    await pool.async_close_all()
+    assert session.closed
+
+
+async def test_entry_reload_reuses_session(hass, meteobridge):
+    """A reload keeps the session, an unload releases it."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    pool = hass.data[DATA_SESSIONS]
+    session = pool.async_acquire(entry.data["host"], "test")
+    pool.async_release(entry.data["host"], "test")
+
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert pool.async_acquire(entry.data["host"], "test") is session
+    pool.async_release(entry.data["host"], "test")
+
+    with patch.object(session_module, "SESSION_CLOSE_DELAY", 0):
+        await hass.config_entries.async_unload(entry.entry_id)
+        await _close_pending(hass)
+    assert session.closed
@@ -0,0 +1,99 @@
+"""Tests for the warm start from persisted logger metadata."""
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from pymeteobridgedata import BadRequest
+
+from custom_components.meteobridge.const import DOMAIN
+from custom_components.meteobridge.storage import async_get_metadata_store
+
+from .common import STATION_VALUES, mock_config_entry
+
+
+async def _async_setup_and_unload(hass, entry) -> None:
+    """Set up an entry once, so its metadata is cached, and unload it."""
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _async_wait_first_refresh(hass, entry) -> None:
+    """Wait for the first refresh, which runs as a background task."""
+    await asyncio.gather(*entry._background_tasks)
+    await hass.async_block_till_done()
+
+
+async def test_metadata_saved_after_setup(hass, meteobridge):
+    """A successful setup caches the station and its observation fields."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    store = await async_get_metadata_store(hass)
+    cached = store.async_get(entry.unique_id)
+    assert cached.device_data.station == STATION_VALUES["station"]
+    assert "air_temperature" in cached.capabilities
+    assert "temperature_soil_1" not in cached.capabilities
+
+
+async def test_warm_start_with_unreachable_logger(hass, meteobridge):
+    """A cached entry loads with its entities while the logger is down."""
+    entry = mock_config_entry()
+    await _async_setup_and_unload(hass, entry)
+
+    meteobridge.error = BadRequest("Timeout")
+    await hass.config_entries.async_setup(entry.entry_id)
+    await _async_wait_first_refresh(hass, entry)
+
+    assert entry.state is ConfigEntryState.LOADED
+    state = hass.states.get("sensor.meteobridge_air_temperature")
+    assert state.state == STATE_UNAVAILABLE
+
+    meteobridge.error = None
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.meteobridge_air_temperature").state == "12.3"
+
+
+async def test_warm_start_does_not_wait_for_logger(hass, meteobridge):
+    """Setup from cache makes no requests before the entities are added."""
+    entry = mock_config_entry()
+    await _async_setup_and_unload(hass, entry)
+
+    meteobridge.requests.clear()
+    await hass.config_entries.async_setup(entry.entry_id)
+    assert entry.state is ConfigEntryState.LOADED
+    await _async_wait_first_refresh(hass, entry)
+    # The background refresh validates the station, then polls.
+    assert len(meteobridge.requests) == 2
+    assert hass.states.get("sensor.meteobridge_air_temperature").state == "12.3"
+
+
+async def test_warm_start_detects_other_logger(hass, meteobridge):
+    """Data from a different logger at the same address is not used."""
+    entry = mock_config_entry()
+    await _async_setup_and_unload(hass, entry)
+
+    meteobridge.station["mac"] = "00:11:22:33:44:66"
+    await hass.config_entries.async_setup(entry.entry_id)
+    await _async_wait_first_refresh(hass, entry)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert not coordinator.last_update_success
+    assert "00:11:22:33:44:66" in str(coordinator.last_exception)
+
+
+async def test_metadata_removed_with_entry(hass, meteobridge):
+    """Removing the entry forgets the cached metadata."""
+    entry = mock_config_entry()
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    store = await async_get_metadata_store(hass)
+    assert store.async_get(entry.unique_id) is None
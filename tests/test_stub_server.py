@@ -0,0 +1,83 @@
+"""Tests for the benchmark stand-in logger."""
+from __future__ import annotations
+
+import time
+
+from aiohttp import ClientSession
+from pymeteobridgedata import MeteobridgeApiClient
+
+from benchmarks.fleet import bench_fleet
+from benchmarks.stub_server import MeteobridgeStubServer
+
+from .common import STATION_VALUES
+
+
+async def test_stub_server_serves_api_client():
+    """The regular API client can read a station from the stub server."""
+    server = MeteobridgeStubServer(mac="02:00:00:00:00:01", extra_sensors=1)
+    await server.start()
+    try:
+        async with ClientSession() as session:
+            client = MeteobridgeApiClient(
+                "meteobridge", "secret", server.host, extra_sensors=1, session=session
+            )
+            await client.initialize()
+            server.set_observation("air_temperature", "-3.5")
+            data = await client.update_observations()
+    finally:
+        await server.stop()
+
+    assert client.device_data.key == "02:00:00:00:00:01"
+    assert data.air_temperature == -3.5
+    assert data.temperature_extra_1 == 11.5
+    assert data.temperature_soil_1 is None
+    assert server.requests == 3
+    assert server.connections == 1
+
+
+async def test_stub_server_latency_errors_and_noise():
+    """A stub can answer late, fail requests and vary its values."""
+    server = MeteobridgeStubServer(latency=0.05, error_rate=0.5, noise=1.0, seed=1)
+    await server.start()
+    temperatures = set()
+    failed = 0
+    try:
+        async with ClientSession() as session:
+            for _ in range(10):
+                start = time.perf_counter()
+                async with session.get(
+                    f"http://{server.host}/cgi-bin/template.cgi",
+                    params={"template": "[th0temp-act:None];[mbsystem-mac:None]"},
+                ) as response:
+                    assert time.perf_counter() - start >= 0.05
+                    if response.status != 200:
+                        failed += 1
+                        continue
+                    temperature, mac = (await response.text()).split(";")
+                temperatures.add(temperature)
+                assert mac == STATION_VALUES["mac"]
+    finally:
+        await server.stop()
+
+    assert 0 < failed < 10
+    assert server.errors == failed
+    assert len(temperatures) > 1
+    assert all(abs(float(value) - 12.3) <= 1.0 for value in temperatures)
+
+
+async def test_fleet_harness():
+    """The harness polls a small fleet and reports the load."""
+    options = {
+        "extra_sensors": [0, 7],
+        "latency": 0.0,
+        "jitter": 0.01,
+        "error_rate": 0.0,
+        "noise": 0.5,
+    }
+    result = await bench_fleet(2, 1.5, 1, options)
+
+    assert result["entries_loaded"] == 2
+    assert result["polls"] > 0
+    assert result["state_writes_per_s"] > 0
+    assert result["loop_lag"]["count"] > 0
+    assert result["logger_requests"] >= result["polls"]